@@ -0,0 +1,105 @@
+"""
+Compare drawing every built-in icon from a bitmap rasterized with `ConvertToScaledBitmap` (as
+happens whenever an icon is needed at a new size, e.g. after a zoom or DPI change), from an
+already cached bitmap, and from cached vector paths (`RibbonIcon.vector`), at increasing
+heights. Also reports how much bitmap memory the rasterized icons would keep cached - the
+vector path keeps none.
+
+Run with `python benchmarks/bench_icons.py` (use `xvfb-run` on a headless machine).
+"""
+
+import time
+import argparse
+import wx
+from wx_ribbon import icons
+from wx_ribbon.icons.base import RibbonIcon, RB_ICONSTYLE_LIGHT
+
+
+def get_icons():
+    """
+    Get every RibbonIcon registered as an `icons.RB_ICON_...` constant.
+    """
+    return [
+        getattr(icons, name) for name in dir(icons)
+        if name.startswith("RB_ICON_") and isinstance(getattr(icons, name), RibbonIcon)
+    ]
+
+
+def time_draw(draw, height, repeats):
+    """
+    Get the mean time (in ms) taken to draw every icon once with `draw(gc, icon, height)`,
+    onto a bitmap big enough for one icon.
+    """
+    bmp = wx.Bitmap.FromRGBA(height, height, 0, 0, 0, 0)
+    dc = wx.MemoryDC(bmp)
+    gc = wx.GraphicsContext.Create(dc)
+    start = time.perf_counter()
+    for i in range(repeats):
+        for icon in get_icons():
+            draw(gc, icon, height)
+    elapsed = (time.perf_counter() - start) / repeats * 1000
+    del gc
+    dc.SelectObject(wx.NullBitmap)
+
+    return elapsed
+
+
+def draw_rasterized(gc, icon, height):
+    """
+    Rasterize an icon from scratch and draw the bitmap.
+    """
+    gc.DrawBitmap(icon.Rasterize(height=height), 0, 0, height, height)
+
+
+def draw_cached(gc, icon, height):
+    """
+    Draw an icon from its cached bitmap.
+    """
+    icon.vector = False
+    icon.Draw(gc, 0, 0, height=height, style=RB_ICONSTYLE_LIGHT)
+
+
+def draw_vector(gc, icon, height):
+    """
+    Draw an icon from its cached paths.
+    """
+    icon.vector = True
+    icon.Draw(gc, 0, 0, height=height, style=RB_ICONSTYLE_LIGHT)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--heights", type=int, nargs="+", default=[16, 28, 48, 96, 192])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    app = wx.App()
+    # parse and rasterize everything once up front, so only drawing is timed below
+    for icon in get_icons():
+        icon.GetPaths(RB_ICONSTYLE_LIGHT)
+        for height in args.heights:
+            icon.GetBitmap(height=height)
+    # report icons which can't be drawn as paths (they fall back to bitmaps)
+    fallback = [icon.name for icon in get_icons() if icon.GetPaths(RB_ICONSTYLE_LIGHT) is None]
+    if fallback:
+        print(f"Drawn from bitmaps, as they can't be drawn as paths: {', '.join(fallback)}")
+    print(
+        f"{'height':>8} {'rasterize':>12} {'cached':>12} {'vector':>12} {'bitmap memory':>15}"
+    )
+    for height in args.heights:
+        results = [
+            time_draw(draw, height, args.repeats)
+            for draw in (draw_rasterized, draw_cached, draw_vector)
+        ]
+        nbytes = sum(
+            RibbonIcon.GetBitmapBytes(icon.GetBitmap(height=height)) for icon in get_icons()
+        )
+        print(
+            f"{height:>8} {results[0]:>10.2f}ms {results[1]:>10.2f}ms {results[2]:>10.2f}ms "
+            f"{nbytes / 1024:>13.0f}KB"
+        )
+    app.Destroy()
+
+
+if __name__ == "__main__":
+    main()
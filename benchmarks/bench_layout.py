@@ -0,0 +1,86 @@
+"""
+Compare the time taken to lay out a FrameRibbon with the default sizer layout against the
+flat layout engine (`RB_LAYOUT_FLAT`), at increasing numbers of controls.
+
+Run with `python benchmarks/bench_layout.py` (use `xvfb-run` on a headless machine).
+"""
+
+import time
+import argparse
+import wx
+from wx_ribbon import FrameRibbon, icons
+from wx_ribbon.layout import RB_LAYOUT_SIZERS, RB_LAYOUT_FLAT
+
+
+def make_ribbon(frame, layout, n, per_section=20):
+    """
+    Make a ribbon with `n` buttons, split into sections of `per_section` buttons.
+    """
+    ribbon = FrameRibbon(frame, layout=layout)
+    frame.sizer.Add(ribbon, flag=wx.EXPAND)
+    for i in range(n):
+        section = f"section{i // per_section}"
+        ribbon.AddButton(
+            section=section,
+            name=f"button{i}",
+            label=f"Button {i}",
+            icon=icons.RB_ICON_ADD,
+        )
+
+    return ribbon
+
+
+def time_layout(ribbon, repeats, invalidate):
+    """
+    Get the mean time (in ms) taken to lay out a ribbon and everything in it.
+
+    If `invalidate` is True, every control's size is forgotten before each pass, as if all of
+    them had changed (e.g. after a theme or DPI change), so nothing can be reused from the
+    last pass. Otherwise the layout can reuse whatever it has cached.
+    """
+    windows = list(ribbon.sections.values()) + list(ribbon.buttons.values())
+    start = time.perf_counter()
+    for i in range(repeats):
+        if invalidate:
+            for window in windows:
+                window.InvalidateBestSize()
+            ribbon.InvalidateLayout()
+        ribbon.Layout()
+        # the ribbon's size hasn't changed, so wx won't lay out each section's sizer unless
+        # asked - do so, as a real resize would
+        if ribbon.flatLayout is None:
+            for section in ribbon.sections.values():
+                section.Layout()
+
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 500, 1000, 2000])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    app = wx.App()
+    print(f"{'controls':>10} {'sizers':>12} {'flat':>12} {'flat (cached)':>15}")
+    for n in args.counts:
+        results = []
+        for layout, invalidate in (
+            (RB_LAYOUT_SIZERS, True),
+            (RB_LAYOUT_FLAT, True),
+            (RB_LAYOUT_FLAT, False),
+        ):
+            frame = wx.Frame(None, size=(1920, 200))
+            frame.sizer = wx.BoxSizer(wx.VERTICAL)
+            frame.SetSizer(frame.sizer)
+            ribbon = make_ribbon(frame, layout, n)
+            # do one layout up front so caches are populated
+            ribbon.Layout()
+            results.append(time_layout(ribbon, args.repeats, invalidate))
+            frame.Destroy()
+        print(f"{n:>10} {results[0]:>10.2f}ms {results[1]:>10.2f}ms {results[2]:>13.2f}ms")
+    app.Destroy()
+
+
+if __name__ == "__main__":
+    main()
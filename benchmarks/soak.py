@@ -0,0 +1,199 @@
+"""
+Soak test for leaks: repeatedly builds and destroys frames with a FrameRibbon (sections,
+dropdowns, galleries and switch ctrls with dependants), and switches a ribbon between themes
+thousands of times. Tracks Python heap use (tracemalloc), live wx windows, ribbons tracked by
+the theme manager and the number of bitmaps cached by icons, and exits with a non-zero code if
+any of them grow by more than the given thresholds.
+
+Run with `python benchmarks/soak.py` (use `xvfb-run python benchmarks/soak.py` on a headless
+machine).
+"""
+
+import sys
+import argparse
+import tracemalloc
+import wx
+from wx_ribbon import FrameRibbon, themes, icons
+from wx_ribbon.icons.base import RibbonIcon
+
+
+def get_icons():
+    """
+    Get every RibbonIcon registered as an `icons.RB_ICON_...` constant.
+    """
+    return [
+        getattr(icons, name) for name in dir(icons)
+        if name.startswith("RB_ICON_") and isinstance(getattr(icons, name), RibbonIcon)
+    ]
+
+
+def count_windows():
+    """
+    Count all live wx windows, including children.
+    """
+    def count(window):
+        return 1 + sum(count(child) for child in window.GetChildren())
+
+    return sum(count(window) for window in wx.GetTopLevelWindows())
+
+
+def count_cached_bitmaps():
+    """
+    Count all bitmaps cached by ribbon icons (in any of their caches).
+    """
+    total = 0
+    for icon in get_icons():
+        total += sum(len(cache) for cache in icon._cache.values())
+        total += len(icon._masks) + len(icon._tints) + len(icon._states) + len(icon._badges)
+        total += sum(len(frames) for frames in icon._frames.values())
+
+    return total
+
+
+def measure():
+    """
+    Get the current value of everything being tracked.
+    """
+    return {
+        'heap': tracemalloc.get_traced_memory()[0],
+        'windows': count_windows(),
+        'ribbons': len(themes.RibbonThemeManager.GetRibbons()),
+        'bitmaps': count_cached_bitmaps(),
+    }
+
+
+def settle(app):
+    """
+    Process pending events and idle time, so that destroyed windows are actually deleted.
+    """
+    app.ProcessPendingEvents()
+    wx.Yield()
+
+
+def build_frame(n_sections=4, n_buttons=8):
+    """
+    Make a frame with a populated ribbon.
+    """
+    frame = wx.Frame(None, size=(1280, 200))
+    frame.sizer = wx.BoxSizer(wx.VERTICAL)
+    frame.SetSizer(frame.sizer)
+    ribbon = FrameRibbon(frame)
+    frame.sizer.Add(ribbon, flag=wx.EXPAND)
+    all_icons = get_icons()
+    with ribbon.Batch():
+        for s in range(n_sections):
+            section = f"section{s}"
+            ribbon.AddSection(section, label=f"Section {s}", icon=all_icons[s % len(all_icons)])
+            # switch with dependants
+            switch = ribbon.AddSwitchCtrl(
+                section=section, name=f"{section}_switch", labels=("A", "B", "C")
+            )
+            for b in range(n_buttons):
+                btn = ribbon.AddButton(
+                    section=section,
+                    name=f"{section}_button{b}",
+                    label=f"Button {b}",
+                    icon=all_icons[b % len(all_icons)],
+                    callback=lambda evt: None,
+                )
+                switch.AddDependant(btn, b % 3, action="show" if b % 2 else "enable")
+            # dropdown with a menu made on demand
+            ribbon.AddDropdownButton(
+                section=section,
+                name=f"{section}_dropdown",
+                label="More",
+                icon=icons.RB_ICON_MORE,
+                menu=lambda parent, evt: wx.Menu(),
+            )
+            # gallery
+            ribbon.AddGallery(
+                section=section,
+                name=f"{section}_gallery",
+                items=all_icons,
+                columns=4,
+            )
+            ribbon.AddSeparator()
+    # cycle switches through their modes
+    for s in range(n_sections):
+        switch = ribbon.buttons[f"section{s}_switch"]
+        for mode in range(switch.GetModeCount()):
+            switch.SetMode(mode, silent=True)
+
+    return frame, ribbon
+
+
+def report(label, start, end):
+    """
+    Print how much each tracked value has grown by.
+    """
+    print(f"{label}:")
+    for key in start:
+        print(f"    {key:>8}: {start[key]:>12} -> {end[key]:>12} ({end[key] - start[key]:+})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cycles", type=int, default=200, help="frames to build & destroy")
+    parser.add_argument("--theme-switches", type=int, default=2000, help="theme changes to make")
+    parser.add_argument("--warmup", type=int, default=10, help="cycles before measuring")
+    parser.add_argument("--max-heap-growth", type=int, default=2 * 1024 * 1024, help="bytes")
+    parser.add_argument("--max-window-growth", type=int, default=0)
+    parser.add_argument("--max-bitmap-growth", type=int, default=0)
+    args = parser.parse_args()
+
+    app = wx.App()
+    tracemalloc.start(25)
+    failures = []
+
+    def check(label, start, end):
+        report(label, start, end)
+        limits = {
+            'heap': args.max_heap_growth,
+            'windows': args.max_window_growth,
+            'ribbons': 0,
+            'bitmaps': args.max_bitmap_growth,
+        }
+        for key, limit in limits.items():
+            if end[key] - start[key] > limit:
+                failures.append(f"{label}: {key} grew by {end[key] - start[key]} (limit {limit})")
+
+    # warm up, so caches are populated before measuring
+    for i in range(args.warmup):
+        frame, ribbon = build_frame()
+        frame.Destroy()
+        settle(app)
+    # build and destroy frames
+    start = measure()
+    before = tracemalloc.take_snapshot()
+    for i in range(args.cycles):
+        frame, ribbon = build_frame()
+        frame.Destroy()
+        settle(app)
+    check(f"Build/destroy x{args.cycles}", start, measure())
+    # switch themes on one ribbon
+    frame, ribbon = build_frame()
+    frame.Show()
+    settle(app)
+    start = measure()
+    for i in range(args.theme_switches):
+        theme = themes.RB_THEME_DARK if i % 2 == 0 else themes.RB_THEME_LIGHT
+        themes.RibbonThemeManager.SetTheme(theme)
+    settle(app)
+    check(f"Theme switch x{args.theme_switches}", start, measure())
+    frame.Destroy()
+    settle(app)
+    # on failure, show where the most memory was allocated
+    if failures:
+        print("\nLargest heap growth by line:")
+        after = tracemalloc.take_snapshot()
+        for stat in after.compare_to(before, "lineno")[:10]:
+            print(f"    {stat}")
+        print("\nFAILED:")
+        for failure in failures:
+            print(f"    {failure}")
+        sys.exit(1)
+    print("\nPASSED")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import pytest
+
+pytest.importorskip("wx")
+
+from wx_ribbon.macros import LoadMacro, SaveMacro
+
+
+def test_round_trip(tmp_path):
+    file = tmp_path / "macro.jsonl"
+    steps = [
+        {'t': 0.0, 'name': "new"},
+        {'t': 0.5, 'name': "mode", 'mode': 1},
+        {'t': 1.25, 'item': "Save As", 'menu': "save"},
+        {'t': 2.0, 'item': "Quit", 'menu': None},
+        {'t': 3.0, 'id': 5010},
+    ]
+    SaveMacro(steps, file)
+    assert LoadMacro(file) == steps
+
+
+def test_one_step_per_line(tmp_path):
+    file = tmp_path / "macro.jsonl"
+    SaveMacro([{'t': 0, 'name': "a"}, {'t': 1, 'name': "b"}], file)
+    assert len(file.read_text().splitlines()) == 2
+
+
+def test_load_skips_blank_lines(tmp_path):
+    file = tmp_path / "macro.jsonl"
+    file.write_text('{"t": 0, "name": "a"}\n\n{"t": 1, "name": "b"}\n\n')
+    assert LoadMacro(file) == [{'t': 0, 'name': "a"}, {'t': 1, 'name': "b"}]
+
+
+def test_empty(tmp_path):
+    file = tmp_path / "macro.jsonl"
+    SaveMacro([], file)
+    assert LoadMacro(file) == []
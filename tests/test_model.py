@@ -0,0 +1,146 @@
+import pytest
+
+pytest.importorskip("wx")
+
+from wx_ribbon.model import RibbonModel, RibbonItemModel
+
+
+def make_model():
+    """
+    Make a model with one section of three buttons and a second section with a switch.
+    """
+    model = RibbonModel()
+    model.AddSection("file", label="File")
+    for name in ("a", "b", "c"):
+        model.AddItem("file", "button", name, label=name.upper())
+    model.AddItem("run", "switch", "mode", labels=("Run", "Debug"), mode=0)
+
+    return model
+
+
+def test_diff_unchanged():
+    model = make_model()
+    assert model.Diff(model.Copy()) == []
+
+
+def test_copy_is_independent():
+    model = make_model()
+    copy = model.Copy()
+    copy.GetItem("a").label = "Changed"
+    copy.GetSection("file").items.pop()
+    assert model.GetItem("a").label == "A"
+    assert [item.name for item in model.GetSection("file").items] == ["a", "b", "c"]
+
+
+def test_diff_property_change():
+    old = make_model()
+    new = old.Copy()
+    new.GetItem("b").enabled = False
+    new.GetItem("mode").mode = 1
+    new.GetSection("file").label = "Files"
+    assert old.Diff(new) == [
+        ("setSection", "file", "label", "Files"),
+        ("setItem", "b", "enabled", False),
+        ("setItem", "mode", "mode", 1),
+    ]
+
+
+def test_diff_append():
+    old = make_model()
+    new = old.Copy()
+    item = new.AddItem("file", "button", "d", label="D")
+    assert old.Diff(new) == [("addItem", "file", item)]
+
+
+def test_diff_insert():
+    old = make_model()
+    new = old.Copy()
+    # insert a new button between a and b
+    item = RibbonItemModel("button", "x", label="X")
+    new.GetSection("file").items.insert(1, item)
+    # everything after the insert is remade after it
+    assert old.Diff(new) == [
+        ("removeItem", "b"),
+        ("removeItem", "c"),
+        ("addItem", "file", item),
+        ("addItem", "file", new.GetItem("b")),
+        ("addItem", "file", new.GetItem("c")),
+    ]
+
+
+def test_diff_remove():
+    old = make_model()
+    new = old.Copy()
+    new.GetSection("file").items.pop(1)
+    # items either side of the removed one stay where they are
+    assert old.Diff(new) == [("removeItem", "b")]
+
+
+def test_diff_reorder():
+    old = make_model()
+    new = old.Copy()
+    items = new.GetSection("file").items
+    items[1], items[2] = items[2], items[1]
+    assert old.Diff(new) == [
+        ("removeItem", "b"),
+        ("removeItem", "c"),
+        ("addItem", "file", new.GetItem("c")),
+        ("addItem", "file", new.GetItem("b")),
+    ]
+
+
+def test_diff_changed_options():
+    old = make_model()
+    new = old.Copy()
+    # options can't be changed on a live control, so it's remade
+    new.GetItem("c").options['style'] = 0
+    assert old.Diff(new) == [
+        ("removeItem", "c"),
+        ("addItem", "file", new.GetItem("c")),
+    ]
+
+
+def test_diff_sections():
+    old = make_model()
+    new = old.Copy()
+    # remove the first section, add one on the end
+    new.sections.pop(0)
+    section = new.AddSection("view", label="View")
+    assert old.Diff(new) == [
+        ("removeSection", "file"),
+        ("addSection", section),
+    ]
+
+
+def test_diff_reorder_sections():
+    old = make_model()
+    new = old.Copy()
+    new.sections.reverse()
+    # sections which move are remade along with their items
+    assert old.Diff(new) == [
+        ("removeSection", "file"),
+        ("removeSection", "run"),
+        ("addSection", new.GetSection("run")),
+        ("addItem", "run", new.GetItem("mode")),
+        ("addSection", new.GetSection("file")),
+        ("addItem", "file", new.GetItem("a")),
+        ("addItem", "file", new.GetItem("b")),
+        ("addItem", "file", new.GetItem("c")),
+    ]
+
+
+def test_diff_removes_items_before_sections():
+    old = make_model()
+    new = old.Copy()
+    new.sections.pop(1)
+    new.GetSection("file").items.pop(1)
+    # controls are removed before sections, as their names may be reused
+    assert old.Diff(new) == [
+        ("removeItem", "b"),
+        ("removeSection", "run"),
+    ]
+
+
+def test_unknown_kind():
+    with pytest.raises(ValueError):
+        RibbonItemModel("slider", "x")
@@ -0,0 +1,77 @@
+import json
+import pytest
+
+pytest.importorskip("wx")
+
+from wx_ribbon.profile import RibbonUsageProfile
+
+
+def test_round_trip(tmp_path):
+    file = tmp_path / "usage.json"
+    profile = RibbonUsageProfile(file=file)
+    profile.controls = {'new': 3, 'open': 1}
+    profile.sections = {'file': 4}
+    profile.icons = {
+        ("file new", 28, "light", None, True): 3,
+        ("file open", 12, "dark", "hlprimary", False): 1,
+    }
+    profile.Save()
+    loaded = RibbonUsageProfile.Load(file)
+    assert loaded.file == file
+    assert loaded.controls == profile.controls
+    assert loaded.sections == profile.sections
+    assert loaded.icons == profile.icons
+
+
+def test_save_keeps_most_used(tmp_path):
+    file = tmp_path / "usage.json"
+    profile = RibbonUsageProfile(file=file)
+    profile.maxEntries = 2
+    profile.icons = {}
+    for i, count in enumerate((5, 1, 3)):
+        profile.icons[(f"icon {i}", 28, "light", None, True)] = count
+    profile.Save()
+    loaded = RibbonUsageProfile.Load(file)
+    assert loaded.icons == {
+        ("icon 0", 28, "light", None, True): 5,
+        ("icon 2", 28, "light", None, True): 3,
+    }
+
+
+def test_load_missing(tmp_path):
+    file = tmp_path / "usage.json"
+    profile = RibbonUsageProfile.Load(file)
+    assert profile.file == file
+    assert profile.controls == profile.sections == profile.icons == {}
+
+
+def test_load_version_1(tmp_path):
+    file = tmp_path / "usage.json"
+    file.write_text(json.dumps({
+        'version': 1,
+        'controls': {'new': 2},
+        'sections': {'file': 2},
+        'icons': [{'name': "file new", 'height': 28, 'style': 0, 'count': 2}],
+    }))
+    profile = RibbonUsageProfile.Load(file)
+    # counts carry over, icons are recorded again
+    assert profile.controls == {'new': 2}
+    assert profile.sections == {'file': 2}
+    assert profile.icons == {}
+    # saving upgrades the file
+    profile.Save()
+    assert json.loads(file.read_text())['version'] == RibbonUsageProfile.version
+
+
+def test_load_unknown_version(tmp_path):
+    file = tmp_path / "usage.json"
+    file.write_text(json.dumps({'version': 99, 'controls': {'new': 2}}))
+    profile = RibbonUsageProfile.Load(file)
+    assert profile.controls == {}
+
+
+def test_load_corrupt(tmp_path):
+    file = tmp_path / "usage.json"
+    file.write_text("{not json")
+    profile = RibbonUsageProfile.Load(file)
+    assert profile.controls == profile.sections == profile.icons == {}
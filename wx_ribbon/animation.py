@@ -0,0 +1,88 @@
+import weakref
+import wx
+
+
+__all__ = [
+    "RibbonAnimator",
+]
+
+
+class RibbonAnimator:
+    """
+    Drives every animated control in the app (e.g. busy buttons) from one shared timer, so
+    however many controls are animating there's only one timer, and each tick only updates the
+    controls which are animating and visible. All animations advance in step.
+
+    Controls register themselves via `Start` and must have a `SetAnimationFrame` method, which
+    receives the bitmap for the current frame. Controls are held weakly, so a destroyed control
+    just drops out.
+    """
+    # ms between frames
+    interval = 80
+    # shared timer (created the first time something animates)
+    timer = None
+    # frames for each animating control
+    controls = weakref.WeakKeyDictionary()
+    # number of ticks so far
+    tick = 0
+
+    @classmethod
+    def Start(cls, ctrl, frames):
+        """
+        Start animating a control (or change the frames it's animating).
+
+        Parameters
+        ----------
+        ctrl : wx.Window
+            Control to animate, must have a `SetAnimationFrame` method
+        frames : list[wx.Bitmap]
+            Frames to cycle through
+        """
+        cls.controls[ctrl] = frames
+        # show the current frame straight away
+        ctrl.SetAnimationFrame(frames[cls.tick % len(frames)])
+        # start timer if needed
+        if cls.timer is None:
+            cls.timer = wx.Timer()
+            cls.timer.Bind(wx.EVT_TIMER, cls.onTimer)
+        if not cls.timer.IsRunning():
+            cls.timer.Start(cls.interval)
+
+    @classmethod
+    def Stop(cls, ctrl):
+        """
+        Stop animating a control (it stays on whatever frame it's on).
+
+        Parameters
+        ----------
+        ctrl : wx.Window
+            Control to stop animating
+        """
+        cls.controls.pop(ctrl, None)
+        # stop timer if nothing's animating
+        if not cls.controls and cls.timer is not None:
+            cls.timer.Stop()
+
+    @classmethod
+    def IsAnimating(cls, ctrl):
+        """
+        Is the given control currently animating?
+        """
+        return ctrl in cls.controls
+
+    @classmethod
+    def onTimer(cls, evt=None):
+        cls.tick += 1
+        for ctrl, frames in list(cls.controls.items()):
+            # forget controls which have been destroyed
+            if not ctrl:
+                cls.controls.pop(ctrl, None)
+                continue
+            # skip controls which can't be seen
+            if not ctrl.IsShownOnScreen():
+                continue
+            # show next frame
+            ctrl.SetAnimationFrame(frames[cls.tick % len(frames)])
+        # stop timer if nothing's left
+        if not cls.controls:
+            cls.timer.Stop()
@@ -1,8 +1,10 @@
 import wx
 import sys
+import inspect
 import logging
-from wx_ribbon import ribbon, themes, icons
-from wx_ribbon.themes.base import RibbonThemeMixin
+import collections
+from wx_ribbon import ribbon, themes, icons, tasks, animation
+from wx_ribbon.themes.base import BaseRibbonTheme, RibbonThemeMixin
 
 
 class FrameRibbonButtonMeta:
@@ -14,14 +16,17 @@ class FrameRibbonButtonMeta:
         def _createButton(self, name, *args, **kwargs):
             # create the button
             btn = cls(self, *args, **kwargs)
-            # store references
+            # store references (forgetting the name of any control this replaces)
+            self.ribbon.controlNames.pop(self.ribbon.buttons.get(name), None)
             self.buttons[name] = self.ribbon.buttons[name] = btn
+            self.ribbon.controlNames[btn] = name
             # add button to sizer
             flags = wx.EXPAND
             if sys.platform == "darwin":
                 # add top padding on Mac
                 flags |= wx.TOP
             self.sizer.Add(btn, border=12, flag=flags)
+            self.ribbon.InvalidateLayout()
 
             return btn
         
@@ -49,6 +54,56 @@ class FrameRibbonButtonMeta:
             f"Assigned method {fcn_name} (creates a {cls.__name__}) to FrameRibbonSection"
         )
 
+    def GetRibbon(self):
+        """
+        Get the FrameRibbon this control belongs to.
+
+        Returns
+        -------
+        wx_ribbon.FrameRibbon or None
+            The ribbon containing this control, or None if it isn't in a ribbon
+        """
+        parent = self.GetParent()
+        while parent is not None and not isinstance(parent, ribbon.FrameRibbon):
+            parent = parent.GetParent()
+
+        return parent
+
+    def RequestBitmap(self, window, make, apply, placeholder, ready=False):
+        """
+        Give a window the bitmap(s) for its icon via the ribbon (see 
+        `FrameRibbon.RequestBitmap`), so that progressive ribbons can show a placeholder until 
+        they're rendered. If this control isn't in a ribbon, they're made and given now.
+        """
+        parent = self.GetRibbon()
+        if parent is None:
+            apply(make())
+        else:
+            parent.RequestBitmap(window, make, apply, placeholder, ready=ready)
+
+    def BindCommand(self, window, callback, binder=wx.EVT_BUTTON):
+        """
+        Call a function when the given window emits a command, routed through the ribbon's 
+        command dispatcher rather than binding the window directly.
+
+        Parameters
+        ----------
+        window : wx.Window
+            Window emitting the command (usually this control or one of its children)
+        callback : function
+            Function to call
+        binder : wx.PyEventBinder
+            Event to bind if this control isn't in a ribbon, and so can't use its dispatcher
+        """
+        parent = self.GetRibbon()
+        if parent is None:
+            # run coroutine functions in the background
+            if inspect.iscoroutinefunction(callback):
+                callback = tasks.RibbonTask(callback)
+            window.Bind(binder, callback)
+        else:
+            parent.RegisterWindowCommand(window, callback)
+
 
 class FrameRibbonButton(wx.Button, FrameRibbonButtonMeta, RibbonThemeMixin):
     """
@@ -62,13 +117,36 @@ class FrameRibbonButton(wx.Button, FrameRibbonButtonMeta, RibbonThemeMixin):
         Label to display on this button
     icon : str
         Stem of icon to use for this button
-    tooltip : str
-        Tooltip to display on hover
+    tooltip : str or function
+        Tooltip to display on hover. Can be a function (taking no arguments) which returns the 
+        tooltip, for tooltips which are costly to build. Either way, the tooltip is only made 
+        when the button is first hovered over.
     callback : function
-        Function to call when this button is clicked
+        Function to call when this button is clicked. To run it without blocking the UI, pass 
+        a `tasks.RibbonTask` (or an `async def` function) - the button will show as busy 
+        until it finishes.
     style : int
         Combination of wx button styles to apply
+    id : int
+        ID of this button. Give a menu item or accelerator the same ID (and bind it via 
+        `FrameRibbon.BindCommands`) to have it call the same callback.
+    tint : str or None
+        If given, draw the icon in this single color instead of its own colors. Can be a hex 
+        code or the name of a theme palette entry (e.g. "hlprimary"), so it updates with the 
+        theme.
     """
+    # palette entries used by ApplyTheme
+    themeKeys = {"text", "crust", "icons"}
+    # is a callback currently running in the background?
+    busy = False
+    _enableAfterBusy = False
+    # has the native tooltip been made from the current tooltip?
+    _tooltipMade = False
+    # badge drawn over the icon (see SetBadge)
+    badge = None
+    # icon to spin while busy (None to not animate)
+    busyIcon = icons.RB_ICON_REFRESH
+
     def __init__(
             self, 
             parent, 
@@ -76,33 +154,80 @@ class FrameRibbonButton(wx.Button, FrameRibbonButtonMeta, RibbonThemeMixin):
             icon=None, 
             tooltip="", 
             callback=None, 
-            style=wx.BU_NOTEXT
+            style=wx.BU_NOTEXT,
+            id=wx.ID_ANY,
+            tint=None
         ):
         # figure out width
         w = -1
         if style | wx.BU_NOTEXT == style:
             w = 40
         # initialize
-        wx.Button.__init__(self, parent, style=wx.BORDER_NONE | style, size=(w, 44))
+        wx.Button.__init__(self, parent, id=id, style=wx.BORDER_NONE | style, size=(w, 44))
         self.SetMinSize((w, 44))
         # set label
         self.SetLabelText(label)
-        # set tooltip
-        if tooltip and style | wx.BU_NOTEXT == style:
-            # if there's no label, include it in the tooltip
-            tooltip = f"{label}: {tooltip}"
+        # store tooltip (it's made on first hover)
         self.SetToolTip(tooltip)
         # set icon
+        self.tint = tint
+        if tint in BaseRibbonTheme.palette:
+            # update icon when the tint's palette entry changes
+            self.themeKeys = self.themeKeys | {tint}
         self.SetIcon(icon)
         # inherit theme
         self.InheritTheme()
         # if given, bind callback
         if callback is not None:
-            self.Bind(wx.EVT_BUTTON, callback)
+            self.BindCommand(self, callback)
+        elif id == wx.ID_ANY and self.GetRibbon() is not None:
+            # make sure a reused ID doesn't pick up a callback from a destroyed button
+            self.GetRibbon().UnregisterCommand(self.GetId())
         # setup hover behaviour
         self.Bind(wx.EVT_ENTER_WINDOW, self.onHover)
         self.Bind(wx.EVT_LEAVE_WINDOW, self.onHover)
     
+    def SetToolTip(self, tooltip):
+        """
+        Set the tooltip for this button. It isn't made until the button is hovered over (or 
+        straight away, if the button already has a tooltip).
+
+        Parameters
+        ----------
+        tooltip : str or function or wx.ToolTip
+            Tooltip to show, or a function (taking no arguments) which returns it. A wx.ToolTip 
+            is set straight away, as it is.
+        """
+        # a ready made tooltip doesn't need deferring, so give it to wx as it is
+        if isinstance(tooltip, wx.ToolTip):
+            self.tooltip = None
+            self._tooltipMade = True
+            wx.Button.SetToolTip(self, tooltip)
+            return
+        self.tooltip = tooltip
+        self._tooltipMade = False
+        # if a tooltip has already been made, replace it now so it's never out of date
+        if self.GetToolTip() is not None:
+            self.MakeToolTip()
+
+    def MakeToolTip(self):
+        """
+        Make the native tooltip for this button from its tooltip (calling it, if it's a 
+        function). Called automatically when the button is first hovered over.
+        """
+        tooltip = self.tooltip
+        if callable(tooltip):
+            tooltip = tooltip()
+        if tooltip and self.GetWindowStyleFlag() & wx.BU_NOTEXT:
+            # if there's no label, include it in the tooltip
+            tooltip = f"{self.GetLabelText()}: {tooltip}"
+        # set tooltip (if there is one)
+        if tooltip:
+            wx.Button.SetToolTip(self, tooltip)
+        elif self.GetToolTip() is not None:
+            self.UnsetToolTip()
+        self._tooltipMade = True
+
     def SetIcon(self, icon):
         """
         Set the icon for this button (will update with theme).
@@ -113,21 +238,223 @@ class FrameRibbonButton(wx.Button, FrameRibbonButtonMeta, RibbonThemeMixin):
             RibbonIcon object containing both light and dark versions of this icon.
         """
         self.icon = icon
-    
+
+    def GetIconBitmap(self, height=28):
+        """
+        Get a bitmap of this button's icon in the current theme (tinted, if this button has a 
+        tint).
+
+        Parameters
+        ----------
+        height : int
+            Number of pixels tall to render the icon as
+        """
+        if self.tint is not None:
+            return self.icon.GetTintedBitmap(height=height, color=self.tint, theme=self.theme)
+
+        return self.icon.GetBitmap(height=height, style=self.theme.icons)
+
+    def GetStateBitmaps(self, height=28):
+        """
+        Get bitmaps of this button's icon for each state (normal, disabled, hover, pressed) in 
+        the current theme.
+
+        Parameters
+        ----------
+        height : int
+            Number of pixels tall to render the icon as
+        """
+        return self.icon.GetStateBitmaps(
+            height=height, theme=self.theme, tint=self.tint, badge=self.badge
+        )
+
+    def SetBadge(self, badge):
+        """
+        Show a badge over this button's icon, e.g. a notification count, a status dot or a 
+        marker icon. Badged icons are cached, so a badge which changes often (e.g. a count) 
+        only draws each value once, and setting the badge it already has does nothing.
+
+        Parameters
+        ----------
+        badge : int, str, wx_ribbon.icons.RibbonIcon or None
+            Badge to show (see `RibbonIcon.GetBadgedBitmap`), or None to remove it
+        """
+        # do nothing if not changing
+        if badge == self.badge:
+            return
+        self.badge = badge
+        # update icon when the badge's palette entries change
+        if badge is not None:
+            self.themeKeys = self.themeKeys | {"hltertiary", "hltext"}
+        # update icon (or, if batching changes, once the batch is done)
+        if self.icon is not None and self.theme is not None:
+            batch = self.GetThemeBatch()
+            if batch is None:
+                self.RequestStateBitmaps()
+            else:
+                batch[self] = None
+
+    def GetBadge(self):
+        """
+        Get the badge shown over this button's icon (or None if there isn't one).
+        """
+        return self.badge
+
+    def RequestStateBitmaps(self):
+        """
+        Request the bitmaps for this button's icon (in its current theme, tint and badge) via 
+        `RequestBitmap`, so they're made along with the rest of the ribbon's icons - showing a 
+        placeholder until then, if the ribbon is progressive.
+        """
+        self.RequestBitmap(
+            self,
+            make=lambda: self.GetStateBitmaps(height=28),
+            apply=self.SetStateBitmaps,
+            placeholder=dict.fromkeys(
+                (
+                    icons.RB_ICONSTATE_NORMAL,
+                    icons.RB_ICONSTATE_DISABLED,
+                    icons.RB_ICONSTATE_HOVER,
+                    icons.RB_ICONSTATE_PRESSED,
+                ),
+                icons.RibbonIcon.GetPlaceholder(height=28, color=self.theme.overlay),
+            ),
+            ready=self.icon.HasStateBitmaps(
+                height=28, theme=self.theme, tint=self.tint, badge=self.badge
+            ),
+        )
+
+    def SetStateBitmaps(self, bitmaps):
+        """
+        Give this button a bitmap for each state, so that enabling/disabling, hovering or 
+        pressing it just swaps which bitmap is shown.
+
+        Parameters
+        ----------
+        bitmaps : dict
+            Bitmaps keyed by icons.RB_ICONSTATE_... constants
+        """
+        self.SetBitmap(bitmaps[icons.RB_ICONSTATE_NORMAL])
+        self.SetBitmapDisabled(bitmaps[icons.RB_ICONSTATE_DISABLED])
+        self.SetBitmapCurrent(bitmaps[icons.RB_ICONSTATE_HOVER])
+        self.SetBitmapPressed(bitmaps[icons.RB_ICONSTATE_PRESSED])
+
+    def ReleaseBitmaps(self):
+        """
+        Drop this button's icon bitmaps until its theme is next applied.
+        """
+        # an invalid bitmap removes every state's bitmap from a wx.Button
+        if self.icon is not None:
+            self.SetBitmap(wx.NullBitmap)
+
+    def Prewarm(self, theme):
+        """
+        Prepare this button's icon for the given theme, so applying it later is instant.
+
+        Parameters
+        ----------
+        theme : wx_ribbon.themes.base.BaseRibbonTheme
+            Theme to prepare for
+        """
+        if self.icon is not None:
+            self.icon.GetStateBitmaps(height=28, theme=theme, tint=self.tint, badge=self.badge)
+
+    def GetShownIcons(self):
+        """
+        Get the icons this button shows, as they're shown (used by usage profiles).
+
+        Returns
+        -------
+        list[tuple]
+            (icon, height, tint, states) for each icon, where `states` is whether bitmaps are 
+            made for each control state
+        """
+        if self.icon is None:
+            return []
+
+        return [(self.icon, 28, self.tint, True)]
+
+    def SetBusy(self, busy=True, disable=True):
+        """
+        Show this button as busy (e.g. while its callback is running in the background).
+
+        Parameters
+        ----------
+        busy : bool
+            True to show as busy, False to go back to normal
+        disable : bool
+            Whether to also disable the button while busy, so that clicks are ignored
+        """
+        # do nothing if not changing
+        if busy == self.busy:
+            return
+        self.busy = busy
+        if busy:
+            # show wait cursor
+            self.SetCursor(wx.Cursor(wx.CURSOR_ARROWWAIT))
+            # disable if requested, remembering whether to re-enable
+            self._enableAfterBusy = disable and self.IsEnabled()
+            if self._enableAfterBusy:
+                self.Enable(False)
+            # spin busy icon
+            self.StartBusyAnimation()
+        else:
+            # go back to normal cursor
+            self.SetCursor(wx.NullCursor)
+            # re-enable if disabled by SetBusy
+            if self._enableAfterBusy:
+                self.Enable(True)
+            self._enableAfterBusy = False
+            # go back to normal icon
+            if animation.RibbonAnimator.IsAnimating(self):
+                animation.RibbonAnimator.Stop(self)
+                self.RequestStateBitmaps()
+
+    def StartBusyAnimation(self):
+        """
+        Show this button's busy icon spinning in place of its icon, until it's no longer busy. 
+        All busy buttons are animated by one shared timer (see `animation.RibbonAnimator`).
+        """
+        # only animate buttons with an icon to replace
+        if self.busyIcon is None or self.icon is None or self.theme is None:
+            return
+        animation.RibbonAnimator.Start(
+            self, self.busyIcon.GetAnimationFrames(height=28, style=self.theme.icons)
+        )
+
+    def SetAnimationFrame(self, bmp):
+        """
+        Show one frame of an animation as this button's icon, in every state (so it's shown 
+        even while disabled). Called by `animation.RibbonAnimator`.
+
+        Parameters
+        ----------
+        bmp : wx.Bitmap
+            Frame to show
+        """
+        self.SetBitmap(bmp)
+        self.SetBitmapDisabled(bmp)
+        self.SetBitmapCurrent(bmp)
+        self.SetBitmapPressed(bmp)
+
     def ApplyTheme(self):
         RibbonThemeMixin.ApplyTheme(self)
         # also update icon
         if self.icon is not None:
-            self.SetBitmap(
-                self.icon.GetBitmap(height=28, style=self.theme.icons)
-            )
+            self.RequestStateBitmaps()
             self.SetBitmapMargins(8, 8)
+            # if busy, carry on animating with frames for the new theme
+            if animation.RibbonAnimator.IsAnimating(self):
+                self.StartBusyAnimation()
 
         self.Update()
         self.Refresh()
 
     def onHover(self, evt):
         if evt.EventType == wx.EVT_ENTER_WINDOW.typeId:
+            # make tooltip on first hover
+            if not self._tooltipMade:
+                self.MakeToolTip()
             # on hover, lighten background
             self.SetBackgroundColour(self.theme.mantle)
         else:
@@ -136,6 +463,9 @@ class FrameRibbonButton(wx.Button, FrameRibbonButtonMeta, RibbonThemeMixin):
 
 
 class FrameRibbonDropdownButton(wx.Panel, FrameRibbonButtonMeta, RibbonThemeMixin):
+    # palette entries used by ApplyTheme
+    themeKeys = {"text", "crust"}
+
     def __init__(self, parent, label, icon=None, callback=None, menu=None, style=wx.BU_LEFT):
         wx.Panel.__init__(self, parent)
         # setup sizer
@@ -160,7 +490,7 @@ class FrameRibbonDropdownButton(wx.Panel, FrameRibbonButtonMeta, RibbonThemeMixi
         )
         self.sizer.Add(self.drop, border=0, flag=wx.EXPAND | wx.ALL)
         # bind menu
-        self.drop.Bind(wx.EVT_BUTTON, self.onMenu)
+        self.BindCommand(self.drop, self.onMenu)
         self.menu = menu
         # inherit theme
         self.InheritTheme()
@@ -179,6 +509,23 @@ class FrameRibbonDropdownButton(wx.Panel, FrameRibbonButtonMeta, RibbonThemeMixi
             RibbonIcon object containing both light and dark versions of this icon.
         """
         self.button.SetIcon(icon)
+
+    def SetLabelText(self, text):
+        """
+        Set the label of this button.
+
+        Parameters
+        ----------
+        text : str
+            Label to show
+        """
+        self.button.SetLabelText(text)
+
+    def GetLabelText(self):
+        """
+        Get the label of this button.
+        """
+        return self.button.GetLabelText()
     
     def ApplyTheme(self):
         # make sure button has a theme
@@ -208,52 +555,88 @@ class FrameRibbonDropdownButton(wx.Panel, FrameRibbonButtonMeta, RibbonThemeMixi
         # skip if there's no menu
         if menu is None:
             return
-        # if menu is created live, create it
+        parent = self.GetRibbon()
+        # if menu is created live, create it (timing it, if the ribbon has a watchdog)
         if callable(menu):
-            menu = menu(self, evt)
-        # show menu
-        self.PopupMenu(menu)
+            if parent is None or parent.watchdog is None:
+                menu = menu(self, evt)
+            else:
+                with parent.Timed(f"{parent.GetControlName(self)}:menu"):
+                    menu = menu(self, evt)
+        # show menu (not counting time spent waiting for the user)
+        if parent is None or parent.watchdog is None:
+            self.PopupMenu(menu)
+        else:
+            with parent.Untimed():
+                self.PopupMenu(menu)
 
 
-EVT_RIBBON_SWITCH = wx.PyEventBinder(wx.IdManager.ReserveId())
+EVT_RIBBON_SWITCH = ribbon.EVT_RIBBON_SWITCH
 
 
 class FrameRibbonSwitchCtrl(wx.Panel, FrameRibbonButtonMeta, RibbonThemeMixin):
     """
-    A switch with two modes. Use `AddDependency` to make presentation of other buttons
-    conditional on this control's state.
+    A segmented switch with two or more modes. Click a mode's label to switch to it, click the 
+    icon (or use the arrow keys) to cycle through modes. Use `AddDependant` to make 
+    presentation of other buttons conditional on this control's state.
+
+    Parameters
+    ----------
+    parent : FrameRibbonSection
+        Section containing this switch
+    labels : tuple[str]
+        Label for each mode, there will be as many modes as labels
+    startMode : int
+        Index of the mode to start in
+    callback : function
+        Function to call when the mode changes, receives an EVT_RIBBON_SWITCH event whose 
+        GetInt() is the new mode and GetString() its label
+    style : int
+        Combination of wx.HORIZONTAL/wx.VERTICAL, wx.BU_LEFT/wx.BU_RIGHT/wx.BU_TOP/wx.BU_BOTTOM 
+        (label alignment) and wx.BU_NOTEXT (hide labels)
+    modeIcons : list[wx_ribbon.icons.RibbonIcon] or None
+        Icon to show for each mode. Leave as None to use the built-in switch icons for two 
+        modes, or no icon for more than two.
     """
+    # palette entries used by ApplyTheme
+    themeKeys = {"text", "crust", "base", "icons"}
+
     def __init__(
             self, parent, 
             labels=("", ""),
             startMode=0,
             callback=None,
-            style=wx.HORIZONTAL
+            style=wx.HORIZONTAL,
+            modeIcons=None
     ):
         wx.Panel.__init__(self, parent)
         self.parent = parent
+        self.style = style
+        self.mode = None
+        nModes = len(labels)
         # use style tag to get text alignment and control orientation
         alignh = style & (wx.BU_LEFT | wx.BU_RIGHT)
         alignv = style & (wx.BU_TOP | wx.BU_BOTTOM)
-        alignEach = [alignh | alignv, alignh | alignv]
+        alignEach = [alignh | alignv] * nModes
         orientation = style & (wx.HORIZONTAL | wx.VERTICAL)
         # if orientation is horizontal and no h alignment set, wrap text around button
-        if orientation == wx.HORIZONTAL and not alignh:
+        if orientation == wx.HORIZONTAL and not alignh and nModes == 2:
             alignEach = [wx.BU_RIGHT | alignv, wx.BU_LEFT | alignv]
         # setup sizers
         self.sizer = wx.BoxSizer(wx.HORIZONTAL)
         self.SetSizer(self.sizer)
         self.btnSizer = wx.BoxSizer(orientation)
-        # setup depends dict
+        # setup depends list (and the same depends, indexed by mode)
         self.depends = []
+        self._dependsByMode = {}
         # make icon
         self.icon = wx.Button(self, style=wx.BORDER_NONE | wx.BU_NOTEXT | wx.BU_EXACTFIT)
-        self.icon.Bind(wx.EVT_BUTTON, self.onModeToggle)
+        self.BindCommand(self.icon, self.onModeToggle)
         self.icon.Bind(wx.EVT_ENTER_WINDOW, self.onHover)
         self.icon.Bind(wx.EVT_LEAVE_WINDOW, self.onHover)
         # make switcher buttons
         self.btns = []
-        for i in range(2):
+        for i in range(nModes):
             btn = wx.Button(
                 self, label=labels[i], size=(-1, 16),
                 style=wx.BORDER_NONE | wx.BU_EXACTFIT | alignEach[i]
@@ -261,15 +644,15 @@ class FrameRibbonSwitchCtrl(wx.Panel, FrameRibbonButtonMeta, RibbonThemeMixin):
             if style & wx.BU_NOTEXT:
                 btn.Hide()
             self.btnSizer.Add(btn, proportion=orientation == wx.VERTICAL, flag=wx.EXPAND)
-            btn.Bind(wx.EVT_BUTTON, self.onModeSwitch)
+            self.BindCommand(btn, self.onModeSwitch)
             btn.Bind(wx.EVT_ENTER_WINDOW, self.onHover)
             btn.Bind(wx.EVT_LEAVE_WINDOW, self.onHover)
             self.btns.append(btn)
         # arrange icon/buttons according to style
         self.sizer.Add(self.btnSizer, proportion=1, border=3, flag=wx.EXPAND | wx.ALL)
         params = {'border': 6, 'flag': wx.EXPAND | wx.ALL}
-        if orientation == wx.HORIZONTAL:
-            # if horizontal, always put icon in the middle
+        if orientation == wx.HORIZONTAL and nModes == 2:
+            # if horizontal with two modes, put icon in the middle
             self.btnSizer.Insert(1, self.icon, **params)
         elif alignh == wx.BU_LEFT:
             # if left, put icon on left
@@ -278,17 +661,26 @@ class FrameRibbonSwitchCtrl(wx.Panel, FrameRibbonButtonMeta, RibbonThemeMixin):
             # if right, put icon on right
             self.sizer.Insert(1, self.icon, **params)
         # make icons
-        if orientation == wx.HORIZONTAL:
-            self.icons = [icons.RB_ICON_SWITCH_LEFT, icons.RB_ICON_SWITCH_RIGHT]
-        else:
-            self.icons = [icons.RB_ICON_SWITCH_TOP, icons.RB_ICON_SWITCH_BOTTOM]
+        if modeIcons is None and nModes == 2:
+            if orientation == wx.HORIZONTAL:
+                modeIcons = [icons.RB_ICON_SWITCH_LEFT, icons.RB_ICON_SWITCH_RIGHT]
+            else:
+                modeIcons = [icons.RB_ICON_SWITCH_TOP, icons.RB_ICON_SWITCH_BOTTOM]
+        self.icons = modeIcons
+        if modeIcons is None:
+            self.icon.Hide()
+        # bitmaps & colors for each mode, fetched once per theme
+        self._bitmaps = []
+        self._colors = {}
         # inherit theme
         self.InheritTheme()
         # set starting mode
         self.SetMode(startMode, silent=True)
         # bind callback
         if callback is not None:
-            self.Bind(EVT_RIBBON_SWITCH, callback)
+            self.BindCommand(self, callback, binder=EVT_RIBBON_SWITCH)
+        # cycle modes with the arrow keys
+        self.Bind(wx.EVT_CHAR_HOOK, self.onKey)
 
         self.Layout()
     
@@ -300,58 +692,202 @@ class FrameRibbonSwitchCtrl(wx.Panel, FrameRibbonButtonMeta, RibbonThemeMixin):
             btn.SetBackgroundColour(self.theme.crust)
         # update background of switch
         self.icon.SetBackgroundColour(self.theme.crust)
+        # get colors for active & inactive labels
+        self._colors = {
+            True: wx.Colour(self.theme.text),
+            False: wx.Colour(self.theme.MakeDisabled(self.theme.text)),
+        }
+        # restyle all modes
+        for mode in range(len(self.btns)):
+            self.StyleMode(mode)
+        # get icon for each mode
+        self._bitmaps = []
+        if self.icons is not None:
+            theme = self.theme
+            # placeholder for each mode, until icons are rendered
+            placeholder = dict.fromkeys(
+                (icons.RB_ICONSTATE_NORMAL, icons.RB_ICONSTATE_DISABLED),
+                icons.RibbonIcon.GetPlaceholder(height=28, color=theme.overlay),
+            )
+            self.RequestBitmap(
+                self.icon,
+                make=lambda: [
+                    icon.GetStateBitmaps(height=28, theme=theme) for icon in self.icons
+                ],
+                apply=self.SetModeBitmaps,
+                placeholder=[placeholder] * len(self.icons),
+                ready=all(icon.HasStateBitmaps(height=28, theme=theme) for icon in self.icons),
+            )
 
         self.Update()
         self.Refresh()
-    
+
+    def ReleaseBitmaps(self):
+        """
+        Drop this switch's mode icons until its theme is next applied.
+        """
+        self._bitmaps = []
+        self.icon.SetBitmap(wx.NullBitmap)
+
+    def Prewarm(self, theme):
+        """
+        Prepare this switch's icons for the given theme, so applying it later is instant.
+
+        Parameters
+        ----------
+        theme : wx_ribbon.themes.base.BaseRibbonTheme
+            Theme to prepare for
+        """
+        for icon in self.icons or ():
+            icon.GetStateBitmaps(height=28, theme=theme)
+
+    def GetShownIcons(self):
+        """
+        Get the icons this switch shows, as they're shown (used by usage profiles).
+
+        Returns
+        -------
+        list[tuple]
+            (icon, height, tint, states) for each mode's icon
+        """
+        return [(icon, 28, None, True) for icon in self.icons or ()]
+
+    def SetModeBitmaps(self, bitmaps):
+        """
+        Set the icon bitmaps for each mode, restyling the icon for the current mode.
+
+        Parameters
+        ----------
+        bitmaps : list[dict]
+            For each mode, bitmaps keyed by icons.RB_ICONSTATE_... constants
+        """
+        self._bitmaps = bitmaps
+        if self.mode is not None:
+            self.StyleMode(self.mode)
+
+    def GetMode(self):
+        """
+        Get the index of the current mode.
+        """
+        return self.mode
+
+    def GetModeCount(self):
+        """
+        Get the number of modes this switch has.
+        """
+        return len(self.btns)
+
+    def StyleMode(self, mode):
+        """
+        Style the label (and, if it's the current mode, the icon) for the given mode.
+
+        Parameters
+        ----------
+        mode : int
+            Mode to style
+        """
+        # do nothing if not themed yet
+        if not self._colors:
+            return
+        # color label according to whether mode is current
+        self.btns[mode].SetForegroundColour(self._colors[mode == self.mode])
+        # set icon if mode is current
+        if mode == self.mode and self._bitmaps:
+            bitmaps = self._bitmaps[mode]
+            self.icon.SetBitmap(bitmaps[icons.RB_ICONSTATE_NORMAL])
+            self.icon.SetBitmapDisabled(bitmaps[icons.RB_ICONSTATE_DISABLED])
+
     def SetMode(self, mode, silent=False):
+        """
+        Switch to the given mode. Only the old and new modes are restyled, and only their 
+        dependants are updated, so this takes the same time regardless of the number of modes.
+
+        Parameters
+        ----------
+        mode : int
+            Index of the mode to switch to
+        silent : bool
+            If True, don't emit an EVT_RIBBON_SWITCH event
+        """
+        # check mode before changing anything, so a bad mode can't leave the switch half-updated
+        if not isinstance(mode, int) or not 0 <= mode < self.GetModeCount():
+            raise ValueError(
+                f"Mode must be an index between 0 and {self.GetModeCount() - 1}, not {mode!r}."
+            )
         # set mode
-        self.mode = mode
-        # iterate through switch buttons
-        for btnMode, btn in enumerate(self.btns):
-            # if it's the correct button...
-            if btnMode == mode:
-                # style accordingly
-                btn.SetForegroundColour(self.theme.text)
-            else:
-                btn.SetForegroundColour(self.theme.MakeDisabled(self.theme.text))
-        # set icon
-        self.icon.SetBitmap(self.icons[mode].GetBitmap(height=28, style=self.theme.icons))
-
-        # handle depends
-        for depend in self.depends:
-            # get linked ctrl
-            ctrl = depend['ctrl']
-            # show/enable according to mode
-            if depend['action'] == "show":
-                ctrl.Show(mode == depend['mode'])
-            if depend['action'] == "enable":
-                ctrl.Enable(mode == depend['mode'])
+        oldMode, self.mode = self.mode, mode
+        # restyle old and new modes
+        if oldMode is not None and oldMode != mode:
+            self.StyleMode(oldMode)
+        self.StyleMode(mode)
+        # handle depends of old and new modes, noting which have been shown/hidden
+        changed = []
+        for depend in self._dependsByMode.get(oldMode, []) + self._dependsByMode.get(mode, []):
+            if self.ApplyDependant(depend) and depend['ctrl'] not in changed:
+                changed.append(depend['ctrl'])
+        relayout = bool(changed)
         # emit event
         if not silent:
-            evt = wx.CommandEvent(EVT_RIBBON_SWITCH.typeId)
+            evt = wx.CommandEvent(EVT_RIBBON_SWITCH.typeId, self.GetId())
+            evt.SetEventObject(self)
             evt.SetInt(mode)
             evt.SetString(self.btns[mode].GetLabel())
             wx.PostEvent(self, evt)
         # refresh
         self.Refresh()
         self.Update()
-        self.GetTopLevelParent().Layout()
+        # relayout if dependants have been shown/hidden
+        if relayout and self.GetRibbon() is not None:
+            # only forget the sizes of the dependants which changed, keep everything else cached
+            for ctrl in changed:
+                self.GetRibbon().InvalidateLayout(ctrl)
+            self.GetRibbon().Layout()
+        # relayout frame (unless batching, in which case the batch will do it)
+        if relayout and (self.GetRibbon() is None or not self.GetRibbon().IsBatching()):
+            self.GetTopLevelParent().Layout()
+
+    def ApplyDependant(self, depend):
+        """
+        Show/enable a dependant according to the current mode.
+
+        Parameters
+        ----------
+        depend : dict
+            Dependant, as stored in `self.depends`
+
+        Returns
+        -------
+        bool
+            True if a control was shown or hidden (meaning layout needs recalculating)
+        """
+        # get linked ctrl
+        ctrl = depend['ctrl']
+        # show/enable according to mode
+        if depend['action'] == "show":
+            return ctrl.Show(self.mode == depend['mode'])
+        if depend['action'] == "enable":
+            ctrl.Enable(self.mode == depend['mode'])
+
+        return False
 
     def onModeSwitch(self, evt):
         evtBtn = evt.GetEventObject()
-        # iterate through switch buttons
-        for mode, btn in enumerate(self.btns):
-            # if button matches this event...
-            if btn is evtBtn:
-                # change mode
-                self.SetMode(mode)
-
-    def onModeToggle(self, evt=None):
-        if self.mode == 0:
-            self.SetMode(1)
+        # change to the mode whose button matches this event
+        if evtBtn in self.btns:
+            self.SetMode(self.btns.index(evtBtn))
+
+    def onModeToggle(self, evt=None, step=1):
+        # go to the next mode, wrapping around at the end
+        self.SetMode((self.mode + step) % len(self.btns))
+
+    def onKey(self, evt):
+        key = evt.GetKeyCode()
+        if key in (wx.WXK_RIGHT, wx.WXK_DOWN):
+            self.onModeToggle(step=1)
+        elif key in (wx.WXK_LEFT, wx.WXK_UP):
+            self.onModeToggle(step=-1)
         else:
-            self.SetMode(0)
+            evt.Skip()
 
     def onHover(self, evt):
         if evt.EventType == wx.EVT_ENTER_WINDOW.typeId:
@@ -374,22 +910,491 @@ class FrameRibbonSwitchCtrl(wx.Panel, FrameRibbonButtonMeta, RibbonThemeMixin):
         ----------
         ctrl : wx.Window
             Control to act upon
-        mode : str
+        mode : int
             The mode in which to show/enable the linked ctrl
         action : str
             One of:
             - "show" Show the control
             - "enable" Enable the control
         """
-        self.depends.append(
-            {
-                'mode': mode,  # when in mode...
-                'action': action,  # then...
-                'ctrl': ctrl,  # to...
-            }
-        )
+        depend = {
+            'mode': mode,  # when in mode...
+            'action': action,  # then...
+            'ctrl': ctrl,  # to...
+        }
+        self.depends.append(depend)
+        self._dependsByMode.setdefault(mode, []).append(depend)
         # do action once now
-        if action == "show":
-            ctrl.Show(self.mode == mode)
-        if action == "enable":
-            ctrl.Enable(self.mode == mode)
\ No newline at end of file
+        self.ApplyDependant(depend)
+
+    def ClearDependants(self):
+        """
+        Disconnect all controls added via AddDependant (leaving them as they currently are).
+        """
+        self.depends = []
+        self._dependsByMode = {}
+
+
+EVT_RIBBON_GALLERY = ribbon.EVT_RIBBON_GALLERY
+
+
+class _GalleryCanvas(wx.VScrolledWindow):
+    """
+    Scrollable grid of gallery items which only draws (and renders icons for) the rows in view.
+    Should not need to be used outside of FrameRibbonGallery.
+
+    Parameters
+    ----------
+    parent : wx.Window
+        Window containing this canvas
+    gallery : FrameRibbonGallery
+        Gallery whose items to show
+    cellSize : tuple[int]
+        Size of each item's cell
+    iconHeight : int
+        Height to draw each item's icon at
+    labels : bool
+        Whether to draw each item's label beneath its icon
+    """
+    def __init__(
+            self, 
+            parent, 
+            gallery, 
+            cellSize=(40, 44), 
+            iconHeight=28, 
+            labels=False, 
+            size=wx.DefaultSize
+    ):
+        wx.VScrolledWindow.__init__(self, parent, size=size)
+        self.gallery = gallery
+        self.cellSize = wx.Size(cellSize)
+        self.iconHeight = iconHeight
+        self.labels = labels
+        # index of the item currently under the mouse
+        self.hover = None
+        # number of columns which fit in the current width
+        self.columns = 1
+        # setup painting
+        self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
+        self.Bind(wx.EVT_PAINT, self.onPaint)
+        self.Bind(wx.EVT_SIZE, self.onSize)
+        # setup mouse behaviour
+        self.Bind(wx.EVT_MOTION, self.onHover)
+        self.Bind(wx.EVT_LEAVE_WINDOW, self.onHover)
+        self.Bind(wx.EVT_LEFT_UP, self.onClick)
+        # set row count
+        self.UpdateRows()
+
+    def OnGetRowHeight(self, row):
+        return self.cellSize.height
+
+    def UpdateRows(self):
+        """
+        Recalculate the number of rows from the number of items and the current width.
+        """
+        self.columns = max(1, self.GetClientSize().width // self.cellSize.width)
+        self.SetRowCount(-(-self.gallery.GetCount() // self.columns))
+        self.Refresh()
+
+    def GetItemAt(self, pos):
+        """
+        Get the index of the item at the given position (or None if there isn't one).
+        """
+        row = self.VirtualHitTest(pos[1])
+        col = pos[0] // self.cellSize.width
+        if row == wx.NOT_FOUND or col >= self.columns:
+            return None
+        index = row * self.columns + col
+        if index >= self.gallery.GetCount():
+            return None
+
+        return index
+
+    def GetItemRect(self, index):
+        """
+        Get the rectangle (relative to the visible area) of the item at the given index.
+        """
+        row, col = divmod(index, self.columns)
+        row -= self.GetVisibleRowsBegin()
+
+        return wx.Rect(
+            col * self.cellSize.width, row * self.cellSize.height, 
+            self.cellSize.width, self.cellSize.height
+        )
+
+    def ScrollToItem(self, index):
+        """
+        Scroll so that the item at the given index is in view.
+        """
+        row = index // self.columns
+        if not self.IsRowVisible(row):
+            self.ScrollToRow(row)
+
+    def GetVisibleItems(self):
+        """
+        Get the indices of the items in the visible rows.
+        """
+        start = self.GetVisibleRowsBegin() * self.columns
+        stop = min(self.GetVisibleRowsEnd() * self.columns, self.gallery.GetCount())
+
+        return range(start, stop)
+
+    def RefreshItem(self, index):
+        """
+        Redraw just the item at the given index.
+        """
+        if index is not None:
+            self.RefreshRect(self.GetItemRect(index))
+
+    def onSize(self, evt):
+        self.UpdateRows()
+        evt.Skip()
+
+    def onPaint(self, evt):
+        dc = wx.AutoBufferedPaintDC(self)
+        theme = self.gallery.theme
+        # clear background
+        dc.SetBackground(wx.Brush(wx.Colour(theme.crust)))
+        dc.Clear()
+        dc.SetFont(self.GetFont())
+        dc.SetTextForeground(wx.Colour(theme.text))
+        # draw only the items in visible rows
+        vectors = []
+        for index in self.GetVisibleItems():
+            self.DrawItem(dc, index, self.GetItemRect(index), vectors=vectors)
+        # draw vector icons last, through a graphics context made only if there are any (so 
+        # its drawing isn't interleaved with the DC's)
+        if vectors:
+            gc = wx.GraphicsContext.Create(dc)
+            for icon, x, y in vectors:
+                icon.Draw(gc, x, y, height=self.iconHeight, style=theme.icons)
+            del gc
+
+    def DrawItem(self, dc, index, rect, vectors=None):
+        """
+        Draw the item at the given index into the given rectangle. If `vectors` is given, 
+        icons which can be drawn as vectors (see `RibbonIcon.vector`) aren't drawn, but added 
+        to it as (icon, x, y) to be drawn afterwards.
+        """
+        theme = self.gallery.theme
+        label, icon = self.gallery.GetItem(index)
+        # draw highlight for hovered/selected item
+        if index == self.gallery.selection:
+            dc.SetPen(wx.Pen(wx.Colour(theme.hlprimary), 2))
+            dc.SetBrush(wx.Brush(wx.Colour(theme.mantle)))
+            dc.DrawRectangle(rect.Deflate(2, 2))
+        elif index == self.hover:
+            dc.SetPen(wx.TRANSPARENT_PEN)
+            dc.SetBrush(wx.Brush(wx.Colour(theme.mantle)))
+            dc.DrawRectangle(rect.Deflate(2, 2))
+        # work out where icon and label go
+        labelHeight = 0
+        if self.labels and label:
+            label = wx.Control.Ellipsize(label, dc, wx.ELLIPSIZE_END, rect.width - 4)
+            labelHeight = dc.GetTextExtent(label)[1]
+        y = rect.y + (rect.height - self.iconHeight - labelHeight) // 2
+        # draw icon
+        x = rect.x + (rect.width - self.iconHeight) // 2
+        if vectors is not None and icon is not None and icon.CanDrawVector(theme.icons):
+            vectors.append((icon, x, y))
+        else:
+            bmp = self.gallery.GetItemBitmap(index, self.iconHeight)
+            if bmp is not None:
+                dc.DrawBitmap(bmp, x, y, useMask=True)
+        # draw label
+        if labelHeight:
+            x = rect.x + (rect.width - dc.GetTextExtent(label)[0]) // 2
+            dc.DrawText(label, x, y + self.iconHeight)
+
+    def onHover(self, evt):
+        # get item under mouse
+        index = None
+        if evt.EventType != wx.EVT_LEAVE_WINDOW.typeId:
+            index = self.GetItemAt(evt.GetPosition())
+        # do nothing if it hasn't changed
+        if index == self.hover:
+            return
+        # redraw only the old and new hovered items
+        old, self.hover = self.hover, index
+        self.RefreshItem(old)
+        self.RefreshItem(index)
+        # show label as tooltip
+        if index is None:
+            self.UnsetToolTip()
+        else:
+            self.SetToolTip(self.gallery.GetItem(index)[0])
+
+    def onClick(self, evt):
+        index = self.GetItemAt(evt.GetPosition())
+        if index is not None:
+            self.gallery.SetSelection(index)
+
+
+class FrameRibbonGallery(wx.Panel, FrameRibbonButtonMeta, RibbonThemeMixin):
+    """
+    A scrollable strip of items (e.g. templates or styles), with a button to pop out a grid of 
+    all of them. Only items in view are drawn and their icons are rendered on demand, so 
+    thousands of items cost no more than a few.
+
+    Parameters
+    ----------
+    parent : FrameRibbonSection
+        Section containing this gallery
+    items : sequence
+        Items to show, each either a RibbonIcon or a (label, RibbonIcon) pair. The sequence is 
+        never copied, so any object supporting `len` and indexing can be used to supply items 
+        lazily.
+    columns : int
+        Number of items visible at once in the strip
+    selection : int or None
+        Index of the item selected to begin with
+    callback : function
+        Function to call when an item is selected. Receives an EVT_RIBBON_GALLERY event, whose 
+        GetInt() is the index of the item and GetString() its label.
+    cacheSize : int
+        Maximum number of rendered icons to keep, older ones are re-rendered when next in view
+    """
+    # palette entries used by ApplyTheme
+    themeKeys = {"text", "crust", "mantle", "hlprimary", "icons"}
+
+    def __init__(
+            self, 
+            parent, 
+            items=(), 
+            columns=6, 
+            selection=None, 
+            callback=None, 
+            cacheSize=256
+    ):
+        wx.Panel.__init__(self, parent)
+        self.items = items
+        self.selection = selection
+        self.cacheSize = cacheSize
+        # rendered icons, least recently used first
+        self._bitmaps = collections.OrderedDict()
+        # popup grid (made when first opened)
+        self.popup = None
+        # setup sizer
+        self.sizer = wx.BoxSizer(wx.HORIZONTAL)
+        self.SetSizer(self.sizer)
+        # make strip
+        self.strip = _GalleryCanvas(self, gallery=self, size=(40 * columns, 44))
+        self.strip.ShowScrollbars(wx.SHOW_SB_NEVER, wx.SHOW_SB_NEVER)
+        self.sizer.Add(self.strip, proportion=1, flag=wx.EXPAND)
+        # make scroll & expand buttons
+        self.ctrlSizer = wx.BoxSizer(wx.VERTICAL)
+        self.sizer.Add(self.ctrlSizer, flag=wx.EXPAND)
+        self.ctrls = []
+        for label, fcn in (
+            ("▴", self.onScrollUp),
+            ("▾", self.onScrollDown),
+            ("⋯", self.onMore),
+        ):
+            btn = wx.Button(self, label=label, style=wx.BU_EXACTFIT | wx.BORDER_NONE)
+            self.ctrlSizer.Add(btn, proportion=1, flag=wx.EXPAND)
+            self.BindCommand(btn, fcn)
+            self.ctrls.append(btn)
+        # inherit theme
+        self.InheritTheme()
+        # bind callback
+        if callback is not None:
+            self.BindCommand(self, callback, binder=EVT_RIBBON_GALLERY)
+        # show starting selection
+        if selection is not None:
+            self.strip.ScrollToItem(selection)
+    
+    def ReleaseBitmaps(self):
+        """
+        Discard this gallery's rendered icons while it's hidden, they're rendered again as 
+        they come back into view.
+
+        Returns
+        -------
+        int
+            Approximate number of bytes freed (these bitmaps belong to the gallery alone)
+        """
+        nbytes = sum(icons.RibbonIcon.GetBitmapBytes(bmp) for bmp in self._bitmaps.values())
+        self._bitmaps.clear()
+
+        return nbytes
+
+    def Prewarm(self, theme):
+        """
+        Render the icons for the items currently in view for the given theme, so applying it 
+        later doesn't have to render them.
+
+        Parameters
+        ----------
+        theme : wx_ribbon.themes.base.BaseRibbonTheme
+            Theme to prepare for
+        """
+        for canvas in self.GetCanvases():
+            for index in canvas.GetVisibleItems():
+                self.GetItemBitmap(index, canvas.iconHeight, style=theme.icons)
+
+    def ApplyTheme(self):
+        # rendered icons are kept by style, so any prepared for this theme are used as-is
+        RibbonThemeMixin.ApplyTheme(self)
+        # update background of buttons
+        for btn in self.ctrls:
+            btn.SetBackgroundColour(self.theme.crust)
+            btn.SetForegroundColour(self.theme.text)
+        # redraw items
+        self.strip.Refresh()
+
+        self.Update()
+        self.Refresh()
+
+    def SetItems(self, items, selection=None):
+        """
+        Set the items shown in this gallery.
+
+        Parameters
+        ----------
+        items : sequence
+            Items to show, each either a RibbonIcon or a (label, RibbonIcon) pair
+        selection : int or None
+            Index of the item to select
+        """
+        self.items = items
+        self.selection = selection
+        self._bitmaps.clear()
+        self.strip.UpdateRows()
+
+    def GetCount(self):
+        """
+        Get the number of items in this gallery.
+        """
+        return len(self.items)
+
+    def GetItem(self, index):
+        """
+        Get the label and icon of the item at the given index.
+
+        Returns
+        -------
+        tuple
+            (label, icon) for the item, where icon is a RibbonIcon or None
+        """
+        item = self.items[index]
+        if isinstance(item, (tuple, list)):
+            return item[0], item[1]
+
+        return item.name or "", item
+
+    def GetItemBitmap(self, index, height, style=None):
+        """
+        Get a bitmap of the icon for the item at the given index, rendering it if needed.
+
+        Parameters
+        ----------
+        index : int
+            Index of the item
+        height : int
+            Height of the icon in pixels
+        style : int or None
+            Icon style to render, or None to use the current theme's
+
+        Returns
+        -------
+        wx.Bitmap or None
+            Bitmap of the item's icon, or None if it has no icon
+        """
+        label, icon = self.GetItem(index)
+        if icon is None:
+            return None
+        if style is None:
+            style = self.theme.icons
+        # if the icon has already been rendered elsewhere, use that
+        if icon.IsCached(height, style):
+            return icon.GetBitmap(height=height, style=style)
+        # use our own rendered icon if we have one
+        key = (icon, height, style)
+        if key in self._bitmaps:
+            self._bitmaps.move_to_end(key)
+            return self._bitmaps[key]
+        # otherwise, render it and drop the least recently used icons to make space
+        bmp = self._bitmaps[key] = icon.Rasterize(height=height, style=style)
+        while len(self._bitmaps) > self.cacheSize:
+            self._bitmaps.popitem(last=False)
+
+        return bmp
+
+    def SetSelection(self, index, silent=False):
+        """
+        Select an item in this gallery.
+
+        Parameters
+        ----------
+        index : int or None
+            Index of the item to select, or None to select nothing
+        silent : bool
+            If True, don't emit an EVT_RIBBON_GALLERY event
+        """
+        old, self.selection = self.selection, index
+        # redraw only the old and new selected items
+        for canvas in self.GetCanvases():
+            canvas.RefreshItem(old)
+            canvas.RefreshItem(index)
+        # close popup
+        if self.popup:
+            self.popup.Dismiss()
+        # do nothing further if nothing's selected
+        if index is None:
+            return
+        # scroll strip to selection
+        self.strip.ScrollToItem(index)
+        # emit event
+        if not silent:
+            evt = wx.CommandEvent(EVT_RIBBON_GALLERY.typeId, self.GetId())
+            evt.SetEventObject(self)
+            evt.SetInt(index)
+            evt.SetString(self.GetItem(index)[0])
+            wx.PostEvent(self, evt)
+
+    def GetSelection(self):
+        """
+        Get the index of the selected item (or None if nothing is selected).
+        """
+        return self.selection
+
+    def GetCanvases(self):
+        """
+        Get the canvases currently showing this gallery's items (the strip and, if open, the 
+        popup grid).
+        """
+        canvases = [self.strip]
+        if self.popup:
+            canvases.append(self.popup.grid)
+
+        return canvases
+
+    def onScrollUp(self, evt=None):
+        self.strip.ScrollRows(-1)
+
+    def onScrollDown(self, evt=None):
+        self.strip.ScrollRows(1)
+
+    def onMore(self, evt=None):
+        # remove previous popup
+        if self.popup:
+            self.popup.Destroy()
+        # make popup
+        self.popup = wx.PopupTransientWindow(self, flags=wx.BORDER_SIMPLE)
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        self.popup.SetSizer(sizer)
+        # make grid with the same number of columns as the strip
+        columns = self.strip.columns
+        rows = min(6, max(1, -(-self.GetCount() // columns)))
+        self.popup.grid = _GalleryCanvas(
+            self.popup, gallery=self, cellSize=(72, 72), iconHeight=40, labels=True, 
+            size=(72 * columns + wx.SystemSettings.GetMetric(wx.SYS_VSCROLL_X), 72 * rows)
+        )
+        sizer.Add(self.popup.grid, proportion=1, flag=wx.EXPAND)
+        self.popup.Fit()
+        # show selection
+        if self.selection is not None:
+            self.popup.grid.ScrollToItem(self.selection)
+        # show beneath the strip
+        self.popup.Position(self.ClientToScreen((0, 0)), (0, self.GetSize().height))
+        self.popup.Popup()
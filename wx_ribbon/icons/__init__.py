@@ -1,12 +1,24 @@
 import logging
 from pathlib import Path
-from .base import RibbonIcon, RB_ICONSTYLE_LIGHT, RB_ICONSTYLE_DARK
+from .base import (
+    RibbonIcon, 
+    RB_ICONSTYLE_LIGHT, 
+    RB_ICONSTYLE_DARK, 
+    RB_ICONSTATE_NORMAL, 
+    RB_ICONSTATE_DISABLED, 
+    RB_ICONSTATE_HOVER, 
+    RB_ICONSTATE_PRESSED,
+)
 
 
 __all__ = [
     "LoadPluginIcons",
     "RB_ICONSTYLE_LIGHT",
     "RB_ICONSTYLE_DARK",
+    "RB_ICONSTATE_NORMAL",
+    "RB_ICONSTATE_DISABLED",
+    "RB_ICONSTATE_HOVER",
+    "RB_ICONSTATE_PRESSED",
 ]
 
 
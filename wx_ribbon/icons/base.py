@@ -1,17 +1,33 @@
+import math
+import collections
 import wx, wx.svg
 from pathlib import Path
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 __all__ = [
     "RibbonIcon",
     "RB_ICONSTYLE_LIGHT",
     "RB_ICONSTYLE_DARK",
+    "RB_ICONSTATE_NORMAL",
+    "RB_ICONSTATE_DISABLED",
+    "RB_ICONSTATE_HOVER",
+    "RB_ICONSTATE_PRESSED",
 ]
 
 
 # constants for light/dark style
 RB_ICONSTYLE_LIGHT = 1
 RB_ICONSTYLE_DARK = 0
+# constants for control states
+RB_ICONSTATE_NORMAL = 0
+RB_ICONSTATE_DISABLED = 1
+RB_ICONSTATE_HOVER = 2
+RB_ICONSTATE_PRESSED = 3
 
 
 class RibbonIcon:
@@ -29,6 +45,23 @@ class RibbonIcon:
     dark : str or pathlib.Path
         Path to the image to use for this icon in dark mode
     """
+    # placeholder glyphs, shared by all icons (by height & color)
+    _placeholders = {}
+    # maximum number of badged bitmap sets to keep per icon
+    badgeCacheSize = 64
+    # draw via cached vector paths rather than bitmaps where possible (see Draw)
+    vector = False
+    # SVG line caps and joins as wx constants
+    _strokeCaps = {
+        wx.svg.SVG_CAP_BUTT: wx.CAP_BUTT,
+        wx.svg.SVG_CAP_ROUND: wx.CAP_ROUND,
+        wx.svg.SVG_CAP_SQUARE: wx.CAP_PROJECTING,
+    }
+    _strokeJoins = {
+        wx.svg.SVG_JOIN_MITER: wx.JOIN_MITER,
+        wx.svg.SVG_JOIN_ROUND: wx.JOIN_ROUND,
+        wx.svg.SVG_JOIN_BEVEL: wx.JOIN_BEVEL,
+    }
 
     def __init__(self, name, light, dark):
         # store name
@@ -42,44 +75,672 @@ class RibbonIcon:
             RB_ICONSTYLE_LIGHT: {},
             RB_ICONSTYLE_DARK: {},
         }
+        # dicts to cache alpha masks (by height) and tinted bitmaps (by height & color) in
+        self._masks = {}
+        self._tints = {}
+        # dict to cache bitmaps for each control state in (by height, style, theme & tint)
+        self._states = {}
+        # same for badged bitmaps (by badge too), least recently used first
+        self._badges = collections.OrderedDict()
+        # dict to cache animation frames in (by height, style & frame count)
+        self._frames = {}
+        # dict to cache vector paths in (by style & graphics renderer)
+        self._paths = {}
     
-    def GetBitmap(self, height=32, style=RB_ICONSTYLE_LIGHT):
+    def GetSVG(self, style=RB_ICONSTYLE_LIGHT):
         """
-        Get a bitmap of this icon.
+        Get the (parsed) SVG image for this icon in the given style, loading it if needed.
 
         Parameters
         ----------
-        height : int
-            Number of pixels tall to render the icon as (all ribbon icons are square)
         style : int
             Either wx.icons.RB_ICONSTYLE_LIGHT (default) or wx.icons.RB_ICONSTYLE_DARK
         """
-        # return light icon if requested
+        # return light image if requested
         if style == RB_ICONSTYLE_LIGHT:
             # if not loaded yet, load now
             if isinstance(self.light, (str, Path)):
                 self.light = wx.svg.SVGimage.CreateFromFile(str(self.light))
-            # convert to bitmap and cache (if not already cached)
-            if height not in self._cache[RB_ICONSTYLE_LIGHT]:
-                self._cache[RB_ICONSTYLE_LIGHT][height] = self.light.ConvertToScaledBitmap(
-                    size=wx.Size(int(height), int(height))
-                )
-
-            return self._cache[RB_ICONSTYLE_LIGHT][height]
-        # return dark icon if requested
+
+            return self.light
+        # return dark image if requested
         if style == RB_ICONSTYLE_DARK:
             # if not loaded yet, load now
             if isinstance(self.dark, (str, Path)):
                 self.dark = wx.svg.SVGimage.CreateFromFile(str(self.dark))
-            # convert to bitmap and cache (if not already cached)
-            if height not in self._cache[RB_ICONSTYLE_DARK]:
-                self._cache[RB_ICONSTYLE_DARK][height] = self.dark.ConvertToScaledBitmap(
-                    size=wx.Size(height, height)
-                )
 
-            return self._cache[RB_ICONSTYLE_DARK][height]
+            return self.dark
         # error otherwise
         raise ValueError(
             f"Unrecognised icon style `{style}`, must be one of RB_ICONSTYLE_LIGHT or "
             f"RB_ICONSTYLE_DARK."
         )
+
+    def Rasterize(self, height=32, style=RB_ICONSTYLE_LIGHT):
+        """
+        Render a new bitmap of this icon, without caching it. Use GetBitmap unless you're 
+        managing the lifetime of the bitmap yourself.
+
+        Parameters
+        ----------
+        height : int
+            Number of pixels tall to render the icon as (all ribbon icons are square)
+        style : int
+            Either wx.icons.RB_ICONSTYLE_LIGHT (default) or wx.icons.RB_ICONSTYLE_DARK
+        """
+        return self.GetSVG(style).ConvertToScaledBitmap(
+            size=wx.Size(int(height), int(height))
+        )
+
+    def IsCached(self, height=32, style=RB_ICONSTYLE_LIGHT):
+        """
+        Has a bitmap of this icon at the given height and style already been rendered?
+
+        Parameters
+        ----------
+        height : int
+            Number of pixels tall the icon would be
+        style : int
+            Either wx.icons.RB_ICONSTYLE_LIGHT (default) or wx.icons.RB_ICONSTYLE_DARK
+        """
+        return height in self._cache.get(style, {})
+
+    def GetBitmap(self, height=32, style=RB_ICONSTYLE_LIGHT):
+        """
+        Get a bitmap of this icon.
+
+        Parameters
+        ----------
+        height : int
+            Number of pixels tall to render the icon as (all ribbon icons are square)
+        style : int
+            Either wx.icons.RB_ICONSTYLE_LIGHT (default) or wx.icons.RB_ICONSTYLE_DARK
+        """
+        # convert to bitmap and cache (if not already cached)
+        if not self.IsCached(height, style):
+            self._cache[style][height] = self.Rasterize(height, style)
+
+        return self._cache[style][height]
+
+    def Prewarm(self, height=32, theme=None, tint=None, states=True):
+        """
+        Render and cache the bitmaps of this icon a control would need, ahead of them being 
+        needed.
+
+        Parameters
+        ----------
+        height : int
+            Number of pixels tall to render the icon as (all ribbon icons are square)
+        theme : wx_ribbon.themes.base.BaseRibbonTheme or None
+            Theme the icon will be shown in, or None to assume a light theme
+        tint : str or None
+            Tint the icon will be drawn in (see GetTintedBitmap)
+        states : bool
+            If True, make bitmaps for each control state (see GetStateBitmaps), as buttons and 
+            switches use. Otherwise just the plain bitmap, as section labels use.
+        """
+        if states:
+            self.GetStateBitmaps(height=height, theme=theme, tint=tint)
+        else:
+            style = RB_ICONSTYLE_LIGHT if theme is None else theme.icons
+            self.GetBitmap(height=height, style=style)
+
+    def GetMask(self, height=32):
+        """
+        Get the alpha mask of this icon, i.e. the opacity of each pixel, ignoring color. The 
+        icon is only rendered once per height to get its mask.
+
+        Parameters
+        ----------
+        height : int
+            Number of pixels tall to render the icon as (all ribbon icons are square)
+
+        Returns
+        -------
+        tuple
+            Width, height and alpha values (as bytes, one per pixel) of the mask
+        """
+        if height not in self._masks:
+            # render from the light image
+            img = self.Rasterize(height, RB_ICONSTYLE_LIGHT).ConvertToImage()
+            if not img.HasAlpha():
+                img.InitAlpha()
+            # store just the alpha channel
+            self._masks[height] = (img.GetWidth(), img.GetHeight(), bytes(img.GetAlphaData()))
+
+        return self._masks[height]
+
+    def GetTintedBitmap(self, height=32, color="#000000", theme=None):
+        """
+        Get a bitmap of this icon in a single color. Made by filling the icon's alpha mask with 
+        the color, so any color is cheap to make without needing extra SVG files.
+
+        Parameters
+        ----------
+        height : int
+            Number of pixels tall to render the icon as (all ribbon icons are square)
+        color : str or wx.Colour
+            Color to use. Can be supplied either as a hex code or, if `theme` is given, the 
+            name of a palette entry (e.g. "text" or "hlprimary").
+        theme : wx_ribbon.themes.base.BaseRibbonTheme or None
+            Theme to resolve palette entries from
+
+        Returns
+        -------
+        wx.Bitmap
+            The tinted icon
+        """
+        r, g, b, a = self._resolveColor(color, theme)
+        # use cached bitmap if we have one
+        key = (height, (r, g, b, a))
+        if key in self._tints:
+            return self._tints[key]
+        # get mask
+        w, h, alpha = self.GetMask(height)
+        # fill color and scale opacity by the color's alpha
+        if numpy is not None:
+            rgb = numpy.empty((w * h, 3), dtype=numpy.uint8)
+            rgb[:] = (r, g, b)
+            rgb = rgb.tobytes()
+            if a < 255:
+                alpha = numpy.frombuffer(alpha, dtype=numpy.uint8).astype(numpy.uint16)
+                alpha = (alpha * a // 255).astype(numpy.uint8).tobytes()
+        else:
+            rgb = bytes((r, g, b)) * (w * h)
+            if a < 255:
+                alpha = alpha.translate(bytes(i * a // 255 for i in range(256)))
+        # make bitmap
+        self._tints[key] = wx.Bitmap(wx.Image(w, h, rgb, alpha))
+
+        return self._tints[key]
+
+    def GetStateBitmaps(self, height=32, theme=None, tint=None, badge=None):
+        """
+        Get bitmaps of this icon for each state a control can be in (normal, disabled, hover 
+        and pressed). All states are made at once from the normal bitmap, using transforms 
+        suited to the theme's background, and cached together, so a control changing state 
+        only needs to swap bitmaps.
+
+        Parameters
+        ----------
+        height : int
+            Number of pixels tall to render the icon as (all ribbon icons are square)
+        theme : wx_ribbon.themes.base.BaseRibbonTheme or None
+            Theme the icon will be shown in, or None to assume a light theme
+        tint : str or None
+            If given, start from the icon tinted this color (see GetTintedBitmap)
+        badge : int, str, RibbonIcon or None
+            If given, overlay a badge on the icon (see GetBadgedBitmap)
+
+        Returns
+        -------
+        dict
+            Bitmaps keyed by RB_ICONSTATE_... constants
+        """
+        # use cached bitmaps if we have them
+        key = self._stateKey(height, theme, tint, badge)
+        if badge is not None and key in self._badges:
+            self._badges.move_to_end(key)
+            return self._badges[key]
+        if key in self._states:
+            return self._states[key]
+        # get style and background luminance from key
+        _, style, lum, _ = key[:4]
+        # get normal bitmap
+        if badge is not None:
+            normal = self.GetBadgedBitmap(
+                self.GetStateBitmaps(height, theme, tint)[RB_ICONSTATE_NORMAL],
+                badge=badge,
+                style=style,
+                theme=theme
+            )
+        elif tint is None:
+            normal = self.GetBitmap(height=height, style=style)
+        else:
+            normal = self.GetTintedBitmap(height=height, color=tint, theme=theme)
+        img = normal.ConvertToImage()
+        # on dark backgrounds, hover/pressed brighten the icon, on light backgrounds they darken
+        if lum < 128:
+            hover, pressed = 1.25, 1.5
+        else:
+            hover, pressed = 0.8, 0.6
+        # make all states at once
+        states = {
+            RB_ICONSTATE_NORMAL: normal,
+            RB_ICONSTATE_DISABLED: normal.ConvertToDisabled(lum),
+            RB_ICONSTATE_HOVER: wx.Bitmap(img.AdjustChannels(hover, hover, hover)),
+            RB_ICONSTATE_PRESSED: wx.Bitmap(img.AdjustChannels(pressed, pressed, pressed)),
+        }
+        # cache (badged bitmaps in a limited cache, as e.g. counts could take any value)
+        if badge is None:
+            self._states[key] = states
+        else:
+            self._badges[key] = states
+            while len(self._badges) > self.badgeCacheSize:
+                self._badges.popitem(last=False)
+
+        return states
+
+    def GetBadgedBitmap(self, bmp, badge, style=RB_ICONSTYLE_LIGHT, theme=None):
+        """
+        Make a copy of a bitmap of this icon with a badge drawn over it. Not cached, use 
+        GetStateBitmaps with `badge` to get cached badged bitmaps.
+
+        Parameters
+        ----------
+        bmp : wx.Bitmap
+            Bitmap of this icon to draw the badge on
+        badge : int, str or RibbonIcon
+            Badge to draw, one of:
+            - int or str: Draw as text (e.g. a notification count) in a bubble, top right
+            - "": Draw a status dot, top right
+            - RibbonIcon: Draw the icon (e.g. RB_ICON_ALERT) at half size, bottom right
+        style : int
+            Style of icon to use for RibbonIcon badges
+        theme : wx_ribbon.themes.base.BaseRibbonTheme or None
+            Theme to get the badge's colors from (`hltertiary` for the bubble/dot and `hltext` 
+            for text), or None to use red & white
+
+        Returns
+        -------
+        wx.Bitmap
+            The badged bitmap
+        """
+        height = bmp.GetHeight()
+        # get colors
+        fill, text = wx.Colour("#f35220"), wx.Colour("#ffffff")
+        if theme is not None:
+            fill, text = wx.Colour(theme.hltertiary), wx.Colour(theme.hltext)
+        # draw onto a copy of the bitmap
+        out = wx.Bitmap(bmp.ConvertToImage())
+        dc = wx.MemoryDC(out)
+        gc = wx.GraphicsContext.Create(dc)
+        gc.SetPen(wx.TRANSPARENT_PEN)
+        gc.SetBrush(wx.Brush(fill))
+        if isinstance(badge, RibbonIcon):
+            # icon in the bottom right
+            size = height // 2
+            gc.DrawBitmap(
+                badge.GetBitmap(height=size, style=style), height - size, height - size, size, size
+            )
+        elif badge == "":
+            # dot in the top right
+            size = max(height // 4, 4)
+            gc.DrawEllipse(height - size, 0, size, size)
+        else:
+            # text in a bubble in the top right, widening to fit the text
+            size = max(height * 9 // 20, 8)
+            font = wx.SystemSettings.GetFont(wx.SYS_DEFAULT_GUI_FONT).Bold()
+            font.SetPixelSize(wx.Size(0, size * 3 // 4))
+            gc.SetFont(font, text)
+            tw, th = gc.GetTextExtent(str(badge))
+            w = min(max(size, tw + size // 2), height)
+            gc.DrawRoundedRectangle(height - w, 0, w, size, size / 2)
+            gc.DrawText(str(badge), height - w + (w - tw) / 2, (size - th) / 2)
+        # finish drawing
+        del gc
+        dc.SelectObject(wx.NullBitmap)
+
+        return out
+
+    def GetAnimationFrames(self, height=32, style=RB_ICONSTYLE_LIGHT, count=12):
+        """
+        Get frames of this icon spinning one full turn clockwise (e.g. for a busy indicator). 
+        Frames are made once per height, style and count by rotating the icon's bitmap, and 
+        cached.
+
+        Parameters
+        ----------
+        height : int
+            Number of pixels tall to render the icon as (all ribbon icons are square)
+        style : int
+            Either wx.icons.RB_ICONSTYLE_LIGHT (default) or wx.icons.RB_ICONSTYLE_DARK
+        count : int
+            Number of frames in one turn
+
+        Returns
+        -------
+        list[wx.Bitmap]
+            Each frame, in order
+        """
+        key = (height, style, count)
+        if key in self._frames:
+            return self._frames[key]
+        bmp = self.GetBitmap(height=height, style=style)
+        frames = []
+        for i in range(count):
+            # draw rotated about the centre onto a transparent bitmap
+            frame = wx.Bitmap.FromRGBA(height, height, 0, 0, 0, 0)
+            dc = wx.MemoryDC(frame)
+            gc = wx.GraphicsContext.Create(dc)
+            gc.Translate(height / 2, height / 2)
+            gc.Rotate(2 * math.pi * i / count)
+            gc.DrawBitmap(bmp, -height / 2, -height / 2, height, height)
+            del gc
+            dc.SelectObject(wx.NullBitmap)
+            frames.append(frame)
+        self._frames[key] = frames
+
+        return frames
+
+    def GetPaths(self, style=RB_ICONSTYLE_LIGHT, renderer=None):
+        """
+        Get this icon as graphics paths, parsed from its SVG once per style and cached. Paths 
+        are in the SVG's own units, so can be drawn at any size, scale or DPI without 
+        rasterizing anything (see Draw).
+
+        Parameters
+        ----------
+        style : int
+            Either wx.icons.RB_ICONSTYLE_LIGHT (default) or wx.icons.RB_ICONSTYLE_DARK
+        renderer : wx.GraphicsRenderer or None
+            Renderer to make paths with (paths can only be drawn by the renderer which made 
+            them), or None to use the default renderer
+
+        Returns
+        -------
+        tuple or None
+            Width and height of the SVG, and a dict for each visible shape with its `path`, 
+            `fill` and `stroke` colors (None if not filled/stroked), `rule` (fill rule), 
+            `brush` and `pen`. None if the SVG has shapes which can't be drawn from flat 
+            colors (e.g. gradients).
+        """
+        if renderer is None:
+            renderer = wx.GraphicsRenderer.GetDefaultRenderer()
+        # use cached paths if we have them
+        key = (style, renderer.GetName())
+        if key in self._paths:
+            return self._paths[key]
+        svg = self.GetSVG(style)
+        shapes = []
+        for shape in svg.shapes:
+            # skip hidden shapes
+            if not shape.flags & wx.svg.SVG_FLAGS_VISIBLE:
+                continue
+            # get colors, giving up on gradients
+            fill = self._paintColor(shape.fill, shape.opacity)
+            stroke = self._paintColor(shape.stroke, shape.opacity)
+            if fill is False or stroke is False:
+                shapes = None
+                break
+            # make path from each subpath's start point and cubic bezier segments
+            path = renderer.CreatePath()
+            for sub in shape.paths:
+                points = sub.points
+                path.MoveToPoint(*points[0])
+                for i in range(1, len(points) - 2, 3):
+                    path.AddCurveToPoint(*points[i], *points[i + 1], *points[i + 2])
+                if sub.closed:
+                    path.CloseSubpath()
+            # make brush and pen for the shape's own colors
+            entry = {
+                'path': path,
+                'fill': fill,
+                'stroke': stroke,
+                'rule': wx.ODDEVEN_RULE
+                if shape.fillRule == wx.svg.SVG_FILLRULE_EVENODD else wx.WINDING_RULE,
+                'brush': None,
+                'pen': None,
+                'width': shape.strokeWidth,
+                'cap': self._strokeCaps.get(shape.strokeLineCap, wx.CAP_BUTT),
+                'join': self._strokeJoins.get(shape.strokeLineJoin, wx.JOIN_MITER),
+            }
+            if fill is not None:
+                entry['brush'] = renderer.CreateBrush(wx.Brush(fill))
+            if stroke is not None:
+                entry['pen'] = renderer.CreatePen(self._penInfo(entry, stroke))
+            shapes.append(entry)
+        # cache
+        self._paths[key] = None if shapes is None else (svg.width, svg.height, shapes)
+
+        return self._paths[key]
+
+    def CanDrawVector(self, style=RB_ICONSTYLE_LIGHT, renderer=None):
+        """
+        Would Draw draw this icon from vector paths (i.e. is `vector` set, and can the icon be 
+        drawn as paths), rather than from a bitmap?
+
+        Parameters
+        ----------
+        style : int
+            Either wx.icons.RB_ICONSTYLE_LIGHT (default) or wx.icons.RB_ICONSTYLE_DARK
+        renderer : wx.GraphicsRenderer or None
+            Renderer it would be drawn with, or None for the default renderer
+        """
+        return self.vector and self.GetPaths(style, renderer=renderer) is not None
+
+    def Draw(self, gc, x, y, height=32, style=RB_ICONSTYLE_LIGHT, color=None, theme=None):
+        """
+        Draw this icon onto a graphics context. If `vector` is True (on this icon, or on 
+        RibbonIcon to apply to all icons), it's drawn from cached paths (see GetPaths) so no 
+        bitmap is made or kept, otherwise (or if the icon can't be drawn as paths) from the 
+        cached bitmap.
+
+        Parameters
+        ----------
+        gc : wx.GraphicsContext
+            Graphics context to draw onto
+        x : float
+            Position of the icon's left edge
+        y : float
+            Position of the icon's top edge
+        height : float
+            Number of pixels tall to draw the icon (all ribbon icons are square)
+        style : int
+            Either wx.icons.RB_ICONSTYLE_LIGHT (default) or wx.icons.RB_ICONSTYLE_DARK
+        color : str or wx.Colour or None
+            If given, draw the icon in a single color (see GetTintedBitmap)
+        theme : wx_ribbon.themes.base.BaseRibbonTheme or None
+            Theme to resolve palette entries in `color` from
+        """
+        paths = None
+        if self.vector:
+            paths = self.GetPaths(style, renderer=gc.GetRenderer())
+        # draw from bitmap if not drawing vectors
+        if paths is None:
+            if color is None:
+                bmp = self.GetBitmap(height=int(height), style=style)
+            else:
+                bmp = self.GetTintedBitmap(height=int(height), color=color, theme=theme)
+            gc.DrawBitmap(bmp, x, y, height, height)
+            return
+        w, h, shapes = paths
+        if color is not None:
+            color = wx.Colour(*self._resolveColor(color, theme))
+        # scale SVG units to fit the height, centred
+        size = max(w, h)
+        gc.PushState()
+        gc.Translate(x, y)
+        gc.Scale(height / size, height / size)
+        gc.Translate((size - w) / 2, (size - h) / 2)
+        for shape in shapes:
+            if shape['fill'] is not None:
+                brush = shape['brush']
+                if color is not None:
+                    brush = wx.Brush(self._tintColor(color, shape['fill']))
+                gc.SetBrush(brush)
+                gc.FillPath(shape['path'], shape['rule'])
+            if shape['stroke'] is not None:
+                pen = shape['pen']
+                if color is not None:
+                    pen = gc.CreatePen(
+                        self._penInfo(shape, self._tintColor(color, shape['stroke']))
+                    )
+                gc.SetPen(pen)
+                gc.StrokePath(shape['path'])
+        gc.PopState()
+
+    @staticmethod
+    def _paintColor(paint, opacity=1):
+        """
+        Get the color of an SVG fill or stroke as a wx.Colour, None if it's not painted, or 
+        False if it's not a flat color.
+        """
+        if paint.type == wx.svg.SVG_PAINT_NONE:
+            return None
+        if paint.type != wx.svg.SVG_PAINT_COLOR:
+            return False
+        # nanosvg colors are packed as ABGR
+        c = paint.color
+
+        return wx.Colour(
+            c & 0xFF, (c >> 8) & 0xFF, (c >> 16) & 0xFF, int(((c >> 24) & 0xFF) * opacity)
+        )
+
+    @staticmethod
+    def _tintColor(color, original):
+        """
+        Get a tint color with the opacity of the color it's replacing.
+        """
+        return wx.Colour(
+            color.Red(), color.Green(), color.Blue(), color.Alpha() * original.Alpha() // 255
+        )
+
+    @staticmethod
+    def _penInfo(shape, color):
+        """
+        Describe the pen to stroke a shape from GetPaths with, in the given color.
+        """
+        return wx.GraphicsPenInfo(color, shape['width']).Cap(shape['cap']).Join(shape['join'])
+
+    def ClearCache(self):
+        """
+        Discard every bitmap and mask this icon has cached, so they can be freed (they'll be 
+        rendered again when next needed).
+
+        Returns
+        -------
+        int
+            Approximate number of bytes of pixel data discarded
+        """
+        nbytes = 0
+        # rendered and tinted bitmaps
+        for cache in list(self._cache.values()) + [self._tints]:
+            for bmp in cache.values():
+                nbytes += self.GetBitmapBytes(bmp)
+            cache.clear()
+        # state bitmaps (normal bitmaps are shared with the caches above, unless badged)
+        for bitmaps in self._states.values():
+            for state, bmp in bitmaps.items():
+                if state != RB_ICONSTATE_NORMAL:
+                    nbytes += self.GetBitmapBytes(bmp)
+        self._states.clear()
+        for bitmaps in self._badges.values():
+            for bmp in bitmaps.values():
+                nbytes += self.GetBitmapBytes(bmp)
+        self._badges.clear()
+        # animation frames
+        for frames in self._frames.values():
+            for bmp in frames:
+                nbytes += self.GetBitmapBytes(bmp)
+        self._frames.clear()
+        # alpha masks
+        for w, h, alpha in self._masks.values():
+            nbytes += len(alpha)
+        self._masks.clear()
+        # vector paths (not pixel data, but no use to a trimmed icon)
+        self._paths.clear()
+
+        return nbytes
+
+    @staticmethod
+    def GetBitmapBytes(bmp):
+        """
+        Get the approximate number of bytes of pixel data in a bitmap (assuming 32 bits per 
+        pixel).
+        """
+        if not bmp or not bmp.IsOk():
+            return 0
+
+        return bmp.GetWidth() * bmp.GetHeight() * 4
+
+    def HasStateBitmaps(self, height=32, theme=None, tint=None, badge=None):
+        """
+        Have bitmaps of this icon for each control state already been made for the given 
+        height, theme and tint (i.e. would GetStateBitmaps return straight away)?
+
+        Parameters
+        ----------
+        height : int
+            Number of pixels tall the icon would be
+        theme : wx_ribbon.themes.base.BaseRibbonTheme or None
+            Theme the icon would be shown in
+        tint : str or None
+            Tint the icon would be drawn in
+        badge : int, str, RibbonIcon or None
+            Badge the icon would have
+        """
+        key = self._stateKey(height, theme, tint, badge)
+
+        return key in self._states or key in self._badges
+
+    def _stateKey(self, height, theme=None, tint=None, badge=None):
+        """
+        Get the key under which bitmaps for each control state are cached, i.e. the height, 
+        icon style, background luminance and tint (as RGBA) they're made for (and, if badged, 
+        the badge and its colors).
+        """
+        # get style and background luminance from theme
+        style = RB_ICONSTYLE_LIGHT
+        lum = 255
+        if theme is not None:
+            style = theme.icons
+            lum = int(wx.Colour(theme.base).GetLuminance() * 255)
+
+        key = (height, style, lum, None if tint is None else self._resolveColor(tint, theme))
+        # badged bitmaps also depend on the badge and the theme's colors for it
+        if badge is not None:
+            key += (badge, None if theme is None else (theme.hltertiary, theme.hltext))
+
+        return key
+
+    @classmethod
+    def GetPlaceholder(cls, height=32, color="#80808040"):
+        """
+        Get a placeholder glyph (a faint rounded square) the same size as an icon, to show 
+        while the real icon is still being rendered. Made without rendering any SVG, and cached 
+        by height and color.
+
+        Parameters
+        ----------
+        height : int
+            Number of pixels tall to make the placeholder (all ribbon icons are square)
+        color : str or wx.Colour
+            Color of the placeholder, its alpha is used as the placeholder's opacity
+
+        Returns
+        -------
+        wx.Bitmap
+            The placeholder
+        """
+        r, g, b, a = cls._resolveColor(color)
+        # use cached bitmap if we have one
+        key = (height, (r, g, b, a))
+        if key in cls._placeholders:
+            return cls._placeholders[key]
+        # fill a square inset by 1/8 of the height, with its corners cut off
+        inset = height // 8
+        corner = max(height // 8, 1)
+        alpha = bytearray(height * height)
+        for y in range(inset, height - inset):
+            # how far the row is from the nearest edge of the square
+            edge = min(y - inset, height - inset - 1 - y)
+            cut = max(corner - edge, 0)
+            start, stop = inset + cut, height - inset - cut
+            alpha[y * height + start:y * height + stop] = bytes((a,)) * (stop - start)
+        # make bitmap
+        cls._placeholders[key] = wx.Bitmap(
+            wx.Image(height, height, bytes((r, g, b)) * (height * height), bytes(alpha))
+        )
+
+        return cls._placeholders[key]
+
+    @staticmethod
+    def _resolveColor(color, theme=None):
+        """
+        Get a color (which may be the name of a palette entry in the given theme) as RGBA.
+        """
+        if theme is not None and isinstance(color, str) and hasattr(theme, color):
+            color = getattr(theme, color)
+
+        return wx.Colour(color).Get(includeAlpha=True)
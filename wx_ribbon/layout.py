@@ -0,0 +1,216 @@
+import wx
+
+
+__all__ = [
+    "RibbonFlatLayout",
+    "RB_LAYOUT_SIZERS",
+    "RB_LAYOUT_FLAT",
+]
+
+
+# constants for which layout engine a FrameRibbon uses
+RB_LAYOUT_SIZERS = 0
+RB_LAYOUT_FLAT = 1
+
+
+class RibbonFlatLayout:
+    """
+    Lays out a FrameRibbon, its sections and every item within them in one linear pass, using
+    cached item sizes, rather than recursing through each section's nested sizers. Sizers are
+    still used to store the order of items (so `section.sizer` etc. work as normal), they're
+    just not asked to lay anything out.
+
+    The pass is skipped entirely if the ribbon's size hasn't changed and nothing has been
+    invalidated since the last pass. Adding, removing or switching controls via the ribbon
+    invalidates the layout automatically; if you show, hide or resize a control yourself, call
+    `FrameRibbon.InvalidateLayout` with it.
+
+    Parameters
+    ----------
+    ribbon : wx_ribbon.FrameRibbon
+        Ribbon to lay out
+    """
+    def __init__(self, ribbon):
+        self.ribbon = ribbon
+        # cached best size of each window
+        self.metrics = {}
+        # last rect given to each window (so unchanged windows can be skipped)
+        self.rects = {}
+        # does the layout need recalculating?
+        self.dirty = True
+        # ribbon size as of the last pass
+        self.size = None
+
+    def Invalidate(self, window=None):
+        """
+        Mark the layout as needing recalculating.
+
+        Parameters
+        ----------
+        window : wx.Window or None
+            Window whose size may have changed, or None to discard all cached sizes
+        """
+        if window is None:
+            self.metrics.clear()
+        else:
+            self.metrics.pop(window, None)
+        self.dirty = True
+
+    def GetMetrics(self, window):
+        """
+        Get the (cached) best size of a window.
+        """
+        if window not in self.metrics:
+            self.metrics[window] = window.GetEffectiveMinSize()
+
+        return self.metrics[window]
+
+    def MeasureItem(self, item):
+        """
+        Get the size of a sizer item including its border.
+        """
+        # get size without border
+        if item.IsWindow():
+            w, h = self.GetMetrics(item.GetWindow())
+        else:
+            w, h = item.GetMinSize()
+        # add border
+        flag = item.GetFlag()
+        border = item.GetBorder()
+        w += border * (bool(flag & wx.LEFT) + bool(flag & wx.RIGHT))
+        h += border * (bool(flag & wx.TOP) + bool(flag & wx.BOTTOM))
+
+        return w, h
+
+    def PlaceItem(self, item, x, y, w, h):
+        """
+        Give a sizer item the rect (x, y, w, h), minus its border.
+        """
+        if not item.IsWindow():
+            return
+        flag = item.GetFlag()
+        border = item.GetBorder()
+        # remove border
+        if flag & wx.LEFT:
+            x += border
+            w -= border
+        if flag & wx.RIGHT:
+            w -= border
+        if flag & wx.TOP:
+            y += border
+            h -= border
+        if flag & wx.BOTTOM:
+            h -= border
+        # set rect only if changed
+        window = item.GetWindow()
+        rect = wx.Rect(x, y, max(w, 0), max(h, 0))
+        if self.rects.get(window) != rect:
+            self.rects[window] = rect
+            window.SetSize(rect)
+
+    def MeasureSection(self, section):
+        """
+        Get the width of a section's items, the height of its item row, and the size of its
+        label row.
+        """
+        # measure items
+        itemsWidth = rowHeight = 0
+        for item in section.sizer.GetChildren():
+            if not item.IsShown():
+                continue
+            w, h = self.MeasureItem(item)
+            itemsWidth += w
+            rowHeight = max(rowHeight, h)
+        # measure label
+        labelWidth = labelHeight = 0
+        for item in section.labelSizer.GetChildren():
+            if not item.IsShown():
+                continue
+            w, h = self.MeasureItem(item)
+            labelWidth += w
+            labelHeight = max(labelHeight, h)
+
+        return itemsWidth, rowHeight, labelWidth, labelHeight
+
+    def Layout(self, force=False):
+        """
+        Position every section and item in the ribbon.
+
+        Parameters
+        ----------
+        force : bool
+            If True, recalculate even if nothing has changed
+
+        Returns
+        -------
+        bool
+            True if a layout pass was done, False if it was skipped
+        """
+        size = self.ribbon.GetClientSize()
+        # skip if nothing has changed
+        if not force and not self.dirty and size == self.size:
+            return False
+        # measure each top level item
+        entries = []
+        naturalWidth = naturalHeight = 0
+        stretch = 0
+        for item in self.ribbon.sizer.GetChildren():
+            if not item.IsShown():
+                continue
+            section = None
+            if item.IsWindow() and hasattr(item.GetWindow(), "labelSizer"):
+                # sections are as wide as their items or their label, whichever is wider
+                section = item.GetWindow()
+                itemsWidth, rowHeight, labelWidth, labelHeight = self.MeasureSection(section)
+                w = max(itemsWidth, labelWidth)
+                h = rowHeight + labelHeight + 12
+            else:
+                w, h = self.MeasureItem(item)
+                rowHeight = labelHeight = 0
+            entries.append((item, section, w, rowHeight, labelHeight))
+            naturalWidth += w
+            naturalHeight = max(naturalHeight, h)
+            stretch += item.GetProportion()
+        # share out any spare width between stretching items
+        spare = max(size.width - naturalWidth, 0)
+        height = max(size.height, naturalHeight)
+        # position everything in one pass
+        x = 0
+        for item, section, w, rowHeight, labelHeight in entries:
+            if stretch and item.GetProportion():
+                w += int(spare * item.GetProportion() / stretch)
+            self.PlaceItem(item, x, 0, w, height)
+            if section is not None:
+                self.LayoutSection(section, w, rowHeight, labelHeight)
+            x += w
+        # store size needed, so the frame doesn't have to ask the sizers
+        self.ribbon.SetMinSize((naturalWidth, naturalHeight))
+        # mark as done
+        self.dirty = False
+        self.size = size
+
+        return True
+
+    def LayoutSection(self, section, width, rowHeight, labelHeight):
+        """
+        Position the items and label within a section.
+        """
+        # place items along the top row, with spare width shared between stretch spacers
+        items = [item for item in section.sizer.GetChildren() if item.IsShown()]
+        widths = [self.MeasureItem(item)[0] for item in items]
+        stretch = sum(item.GetProportion() for item in items)
+        spare = max(width - sum(widths), 0)
+        x = 0
+        for item, w in zip(items, widths):
+            if stretch and item.GetProportion():
+                w += int(spare * item.GetProportion() / stretch)
+            self.PlaceItem(item, x, 0, w, rowHeight)
+            x += w
+        # centre label beneath items
+        labels = [item for item in section.labelSizer.GetChildren() if item.IsShown()]
+        sizes = [self.MeasureItem(item) for item in labels]
+        x = (width - sum(w for w, h in sizes)) // 2
+        y = rowHeight + 6
+        for item, (w, h) in zip(labels, sizes):
+            self.PlaceItem(item, x, y, w, labelHeight)
+            x += w
@@ -0,0 +1,337 @@
+import json
+import time
+import wx
+from pathlib import Path
+from wx_ribbon import ribbon
+
+
+__all__ = [
+    "RibbonMacroRecorder",
+    "RibbonMacroPlayer",
+    "LoadMacro",
+    "SaveMacro",
+]
+
+
+def LoadMacro(file):
+    """
+    Load the steps of a macro from a file, as saved by `SaveMacro` or `RibbonMacroRecorder`.
+
+    Parameters
+    ----------
+    file : str or pathlib.Path
+        File to load from (JSON lines, one step per line)
+
+    Returns
+    -------
+    list[dict]
+        Steps of the macro
+    """
+    steps = []
+    with Path(file).open("r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                steps.append(json.loads(line))
+
+    return steps
+
+
+def SaveMacro(steps, file):
+    """
+    Save the steps of a macro to a file.
+
+    Parameters
+    ----------
+    steps : list[dict]
+        Steps of the macro
+    file : str or pathlib.Path
+        File to save to (JSON lines, one step per line)
+    """
+    with Path(file).open("w", encoding="utf-8") as f:
+        for step in steps:
+            f.write(json.dumps(step) + "\n")
+
+
+class RibbonMacroRecorder:
+    """
+    Records what the user does with a ribbon (clicks, mode switches, gallery selections and
+    menu selections) as a sequence of steps, which can be saved and replayed by
+    `RibbonMacroPlayer`. Each step is a dict with the time it happened (`t`, in seconds since
+    recording started) and either the `name` (and `mode`, for switches & galleries) of the
+    control to invoke, or the label of the menu `item` to pick and the `menu` it's in (the name
+    of the control whose menu it is, or None for the frame's menu bar). Menu commands which
+    don't come from a menu item are recorded by `id`, which is only stable across sessions if
+    the ID was given explicitly.
+
+    Parameters
+    ----------
+    ribbon : wx_ribbon.FrameRibbon
+        Ribbon to record
+    """
+    # events to record
+    binders = (wx.EVT_BUTTON, wx.EVT_MENU, ribbon.EVT_RIBBON_SWITCH, ribbon.EVT_RIBBON_GALLERY)
+
+    def __init__(self, ribbon):
+        self.ribbon = ribbon
+        self.steps = []
+        # time recording started (None if not recording)
+        self.start = None
+        # frame whose menu bar is being recorded (None if not recording)
+        self.frame = None
+
+    def Start(self):
+        """
+        Start recording (clearing any previous recording).
+        """
+        if self.start is not None:
+            return
+        self.steps = []
+        self.start = time.perf_counter()
+        for binder in self.binders:
+            self.ribbon.Bind(binder, self.onEvent)
+        # also record the frame's menu bar, which the player can replay via InvokeMenu
+        self.frame = self.ribbon.GetTopLevelParent()
+        self.frame.Bind(wx.EVT_MENU, self.onFrameMenu)
+
+    def Stop(self):
+        """
+        Stop recording.
+        """
+        if self.start is None:
+            return
+        self.start = None
+        for binder in self.binders:
+            self.ribbon.Unbind(binder, handler=self.onEvent)
+        if self.frame:
+            self.frame.Unbind(wx.EVT_MENU, handler=self.onFrameMenu)
+        self.frame = None
+
+    def IsRecording(self):
+        """
+        Is this recorder currently recording?
+        """
+        return self.start is not None
+
+    def Save(self, file):
+        """
+        Save the recorded steps to a file (see `SaveMacro`).
+        """
+        SaveMacro(self.steps, file)
+
+    def IsInRibbon(self, window):
+        """
+        Is the given window the ribbon being recorded, or within it?
+        """
+        while isinstance(window, wx.Window):
+            if window is self.ribbon:
+                return True
+            window = window.GetParent()
+
+        return False
+
+    def GetStep(self, evt):
+        """
+        Get the step to record for an event, or None if it shouldn't be recorded (e.g. it's a
+        click which just opens a menu, or changes a switch's mode - the mode change itself is
+        recorded instead).
+        """
+        step = {'t': round(time.perf_counter() - self.start, 4)}
+        # menu commands are recorded by item label and owning control, as IDs change between 
+        # sessions
+        if evt.GetEventType() == wx.EVT_MENU.typeId:
+            menu = evt.GetEventObject()
+            item = None
+            if isinstance(menu, wx.Menu):
+                item = menu.FindItemById(evt.GetId())
+            if item is None:
+                step['id'] = evt.GetId()
+            else:
+                step['item'] = item.GetItemLabelText()
+                step['menu'] = self.ribbon.GetControlName(menu.GetInvokingWindow())
+            return step
+        # everything else by control name
+        name = self.ribbon.GetControlName(evt.GetEventObject())
+        if name is None:
+            return None
+        step['name'] = name
+        # mode switches & gallery selections record the mode/item
+        if evt.GetEventType() != wx.EVT_BUTTON.typeId:
+            step['mode'] = evt.GetInt()
+            return step
+        # clicks are only recorded if they're on the control itself (or a dropdown's button)
+        ctrl = self.ribbon.buttons[name]
+        if evt.GetEventObject() in (ctrl, getattr(ctrl, "button", None)):
+            return step
+
+    def onEvent(self, evt):
+        # let the event carry on to the ribbon's dispatcher
+        evt.Skip()
+        # record step
+        step = self.GetStep(evt)
+        if step is not None:
+            self.steps.append(step)
+
+    def onFrameMenu(self, evt):
+        # let the event carry on to the frame's own handlers
+        evt.Skip()
+        # commands from the ribbon (or menus popped up from it) reach the ribbon first, so are 
+        # already recorded
+        window = evt.GetEventObject()
+        if isinstance(window, wx.Menu):
+            window = window.GetInvokingWindow()
+            # menus popped up from elsewhere in the frame can't be replayed, so aren't recorded
+            if window is not None and not self.IsInRibbon(window):
+                return
+        if self.IsInRibbon(window):
+            return
+        # record step
+        step = self.GetStep(evt)
+        if step is not None:
+            self.steps.append(step)
+
+
+class RibbonMacroPlayer:
+    """
+    Replays the steps of a macro on a ribbon (via `FrameRibbon.Invoke`), timing each one from
+    invoking it until all the events it caused have been handled.
+
+    Parameters
+    ----------
+    ribbon : wx_ribbon.FrameRibbon
+        Ribbon to play the macro on
+    steps : list[dict] or str or pathlib.Path
+        Steps of the macro (see `RibbonMacroRecorder`), or a file to load them from
+    rate : float or None
+        Number of steps to play per second, or None to keep the timing they were recorded with
+    done : function or None
+        Function to call once every step has been played, receives the timings (see
+        `GetTimings`)
+    """
+    def __init__(self, ribbon, steps, rate=None, done=None):
+        self.ribbon = ribbon
+        if isinstance(steps, (str, Path)):
+            steps = LoadMacro(steps)
+        self.steps = steps
+        self.rate = rate
+        self.done = done
+        # index of the next step to play
+        self.index = 0
+        self.timings = []
+        # timer for the next step
+        self.timer = None
+
+    def Start(self):
+        """
+        Start playing the macro from the beginning. Steps are played from timers, so the UI
+        carries on running in between.
+        """
+        self.Stop()
+        self.index = 0
+        self.timings = []
+        self.ScheduleNext()
+
+    def Stop(self):
+        """
+        Stop playing.
+        """
+        if self.timer is not None:
+            self.timer.Stop()
+            self.timer = None
+
+    def Run(self):
+        """
+        Play every step straight away, without waiting in between. Useful to benchmark
+        command latency without a running main loop.
+
+        Returns
+        -------
+        list[dict]
+            Timings for each step (see `GetTimings`)
+        """
+        self.Stop()
+        self.timings = []
+        for step in self.steps:
+            self.timings.append(self.PlayStep(step))
+
+        return self.timings
+
+    def ScheduleNext(self):
+        """
+        Schedule the next step to play, or finish if there are none left.
+        """
+        # if done, call done function
+        if self.index >= len(self.steps):
+            self.timer = None
+            if self.done is not None:
+                self.done(self.timings)
+            return
+        # get delay before next step
+        if self.rate:
+            delay = 1 / self.rate
+        elif self.index == 0:
+            delay = 0
+        else:
+            delay = self.steps[self.index]['t'] - self.steps[self.index - 1]['t']
+        self.timer = wx.CallLater(max(int(delay * 1000), 1), self.onTimer)
+
+    def PlayStep(self, step):
+        """
+        Play one step, timing it.
+
+        Parameters
+        ----------
+        step : dict
+            Step to play
+
+        Returns
+        -------
+        dict
+            The step's `name`, `mode`, `item`, `menu` and/or `id`, whether it was `invoked` (it
+            isn't if the control is disabled or the menu item can't be found) and how long it
+            took (`elapsed`, in ms)
+        """
+        start = time.perf_counter()
+        if 'item' in step:
+            # pick menu item
+            invoked = self.ribbon.InvokeMenu(step['item'], name=step.get('menu'))
+        elif 'id' in step:
+            # dispatch menu command
+            evt = wx.CommandEvent(wx.EVT_MENU.typeId, step['id'])
+            evt.SetEventObject(self.ribbon)
+            invoked = self.ribbon.GetEventHandler().ProcessEvent(evt)
+        else:
+            # invoke control
+            invoked = self.ribbon.Invoke(step['name'], mode=step.get('mode'))
+        # handle any events the step posted (e.g. switch events)
+        wx.GetApp().ProcessPendingEvents()
+        # make timing
+        timing = {
+            key: step[key] for key in ('name', 'mode', 'item', 'menu', 'id') if key in step
+        }
+        timing['invoked'] = invoked
+        timing['elapsed'] = (time.perf_counter() - start) * 1000
+
+        return timing
+
+    def GetTimings(self):
+        """
+        Get timings for each step played so far.
+
+        Returns
+        -------
+        list[dict]
+            For each step, its `name`, `mode`, `item`, `menu` and/or `id`, whether it was
+            `invoked` and how long it took (`elapsed`, in ms)
+        """
+        return self.timings
+
+    def onTimer(self):
+        # stop if the ribbon has been destroyed
+        if not self.ribbon:
+            self.timer = None
+            return
+        # play step
+        self.timings.append(self.PlayStep(self.steps[self.index]))
+        self.index += 1
+        # schedule next step
+        self.ScheduleNext()
@@ -0,0 +1,199 @@
+import time
+import logging
+import weakref
+import wx
+from wx_ribbon import themes
+from wx_ribbon.icons.base import RibbonIcon
+
+
+__all__ = [
+    "RibbonMemoryTrimmer",
+]
+
+
+class RibbonMemoryTrimmer:
+    """
+    Frees the icon bitmaps of ribbons which have been hidden (or in a minimized frame) for
+    longer than `timeout`, and restores them when the ribbon is shown again. Useful for apps
+    which keep many frames open in the background.
+
+    Trimming a ribbon makes its controls let go of their bitmaps, and clears the caches of any
+    icon no other (untrimmed) ribbon is using, so the memory can actually be freed. Bitmaps are
+    rendered again when the ribbon is next shown (in idle time, if it's progressive).
+
+    Parameters
+    ----------
+    ribbons : list[wx_ribbon.FrameRibbon] or None
+        Ribbons to trim (more can be added via `AddRibbon`). Leave as None to trim every ribbon
+        in the app.
+    timeout : float
+        Number of seconds a ribbon must be hidden for before it's trimmed
+    interval : int
+        How often (in ms) to check whether ribbons are hidden
+    """
+    def __init__(self, ribbons=None, timeout=60, interval=1000):
+        self.timeout = timeout
+        # store ribbons weakly so trimming doesn't keep them alive
+        self.ribbons = None
+        if ribbons is not None:
+            self.ribbons = weakref.WeakSet(ribbons)
+        # when each hidden ribbon was first seen hidden
+        self.hiddenSince = weakref.WeakKeyDictionary()
+        # ribbons currently trimmed, and frames watched for them being shown
+        self.trimmed = weakref.WeakSet()
+        self.frames = weakref.WeakSet()
+        # total number of bytes reclaimed so far
+        self.reclaimed = 0
+        # start checking
+        self.timer = wx.Timer()
+        self.timer.Bind(wx.EVT_TIMER, self.onTimer)
+        self.timer.Start(interval)
+
+    def AddRibbon(self, ribbon):
+        """
+        Trim the given ribbon when it's hidden.
+
+        Parameters
+        ----------
+        ribbon : wx_ribbon.FrameRibbon
+            Ribbon to trim
+        """
+        if self.ribbons is None:
+            self.ribbons = weakref.WeakSet()
+        self.ribbons.add(ribbon)
+
+    def GetRibbons(self):
+        """
+        Get all live ribbons this trimmer is responsible for.
+        """
+        if self.ribbons is None:
+            return themes.RibbonThemeManager.GetRibbons()
+
+        return [ribbon for ribbon in list(self.ribbons) if ribbon]
+
+    def GetReclaimed(self):
+        """
+        Get the approximate number of bytes of bitmap data reclaimed so far.
+        """
+        return self.reclaimed
+
+    def Stop(self):
+        """
+        Stop trimming ribbons, restoring any which are currently trimmed.
+        """
+        self.timer.Stop()
+        for ribbon in list(self.trimmed):
+            if ribbon:
+                self.Restore(ribbon)
+
+    def Trim(self, ribbon):
+        """
+        Free the icon bitmaps of a ribbon.
+
+        Parameters
+        ----------
+        ribbon : wx_ribbon.FrameRibbon
+            Ribbon to trim
+
+        Returns
+        -------
+        int
+            Approximate number of bytes reclaimed
+        """
+        # get icons in use elsewhere, which it's not worth clearing
+        inUse = set()
+        for other in themes.RibbonThemeManager.GetRibbons():
+            if other is not ribbon and other not in self.trimmed:
+                inUse |= self.GetIcons(other)
+        # release bitmaps held by controls
+        icons = self.GetIcons(ribbon)
+        nbytes = ribbon.ReleaseBitmaps()
+        self.trimmed.add(ribbon)
+        # clear caches of icons nothing else is using
+        for icon in icons - inUse:
+            nbytes += icon.ClearCache()
+        # restore as soon as its frame is shown
+        self.WatchFrame(ribbon.GetTopLevelParent())
+        # report
+        self.reclaimed += nbytes
+        logging.debug(f"Trimmed hidden ribbon {ribbon}, reclaimed ~{nbytes / 1024:.0f}KB")
+
+        return nbytes
+
+    def Restore(self, ribbon):
+        """
+        Give a trimmed ribbon its icon bitmaps back.
+
+        Parameters
+        ----------
+        ribbon : wx_ribbon.FrameRibbon
+            Ribbon to restore
+        """
+        self.trimmed.discard(ribbon)
+        self.hiddenSince.pop(ribbon, None)
+        ribbon.RestoreBitmaps()
+
+    @staticmethod
+    def GetIcons(ribbon):
+        """
+        Get every icon shown by a ribbon's controls.
+
+        Parameters
+        ----------
+        ribbon : wx_ribbon.FrameRibbon
+            Ribbon to get icons from
+
+        Returns
+        -------
+        set[wx_ribbon.icons.RibbonIcon]
+            Icons in use
+        """
+        icons = set()
+        for window in ribbon.GetReleasableWindows():
+            # single icon (buttons, sections)
+            icon = getattr(window, "icon", None)
+            if isinstance(icon, RibbonIcon):
+                icons.add(icon)
+            # icon per mode (switches)
+            for icon in getattr(window, "icons", None) or ():
+                if isinstance(icon, RibbonIcon):
+                    icons.add(icon)
+
+        return icons
+
+    def WatchFrame(self, frame):
+        """
+        Restore trimmed ribbons in the given frame as soon as it's shown or restored.
+        """
+        if frame is None or frame in self.frames:
+            return
+        self.frames.add(frame)
+        frame.Bind(wx.EVT_SHOW, self.onFrameShown)
+        frame.Bind(wx.EVT_ICONIZE, self.onFrameShown)
+
+    def onFrameShown(self, evt):
+        evt.Skip()
+        # do nothing if the frame is being hidden or minimized
+        if evt.GetEventType() == wx.EVT_SHOW.typeId and not evt.IsShown():
+            return
+        if evt.GetEventType() == wx.EVT_ICONIZE.typeId and evt.IsIconized():
+            return
+        # restore any trimmed ribbons in this frame, before they're painted
+        frame = evt.GetEventObject()
+        for ribbon in list(self.trimmed):
+            if ribbon and ribbon.GetTopLevelParent() is frame:
+                self.Restore(ribbon)
+
+    def onTimer(self, evt=None):
+        now = time.monotonic()
+        for ribbon in self.GetRibbons():
+            # visible ribbons are restored (if trimmed) and no longer counted as hidden
+            if themes.RibbonThemeManager.IsVisible(ribbon):
+                self.hiddenSince.pop(ribbon, None)
+                if ribbon in self.trimmed:
+                    self.Restore(ribbon)
+                continue
+            # trim ribbons hidden for long enough
+            since = self.hiddenSince.setdefault(ribbon, now)
+            if ribbon not in self.trimmed and now - since >= self.timeout:
+                self.Trim(ribbon)
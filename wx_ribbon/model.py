@@ -0,0 +1,426 @@
+"""
+A lightweight description of a ribbon's contents - its sections, the controls in them, their
+state and their dependants - which can be built, queried, copied and diffed without creating
+any windows (or even a wx.App). Apply one to a live ribbon with `FrameRibbon.ApplyModel`, which
+only changes what differs from the last model applied.
+
+```python
+model = RibbonModel()
+model.AddSection("file", label="File")
+model.AddItem("file", "button", "new", label="New", icon=icons.RB_ICON_FILE_NEW)
+model.AddItem("file", "switch", "mode", labels=("Run", "Debug"), mode=0)
+model.AddDependant("mode", "new", mode=0)
+ribbon.ApplyModel(model)
+# later...
+model = model.Copy()
+model.GetItem("new").enabled = False
+ribbon.ApplyModel(model)  # just disables the button
+```
+"""
+
+
+__all__ = [
+    "RibbonModel",
+    "RibbonSectionModel",
+    "RibbonItemModel",
+]
+
+
+class RibbonItemModel:
+    """
+    Description of one control in a ribbon.
+
+    Parameters
+    ----------
+    kind : str
+        Kind of control, one of "button", "dropdown", "switch" or "gallery"
+    name : str
+        Name of the control (unique within the ribbon)
+    label : str
+        Label of a button or dropdown
+    icon : wx_ribbon.icons.RibbonIcon or None
+        Icon of a button or dropdown
+    tooltip : str
+        Tooltip of a button
+    enabled : bool
+        Whether the control is enabled
+    shown : bool
+        Whether the control is shown
+    mode : int or None
+        Current mode of a switch
+    selection : int or None
+        Selected item of a gallery
+    **options
+        Any other arguments to create the control with (e.g. `style`, `callback`, `labels`,
+        `items`). Changing these means the control has to be remade, rather than updated.
+    """
+    __slots__ = (
+        "kind", "name", "label", "icon", "tooltip", "enabled", "shown", "mode", "selection",
+        "options",
+    )
+    # properties which can be changed on a live control, by kind
+    stateProps = {
+        'button': ("label", "icon", "tooltip", "enabled", "shown"),
+        'dropdown': ("label", "icon", "enabled", "shown"),
+        'switch': ("mode", "enabled", "shown"),
+        'gallery': ("selection", "enabled", "shown"),
+    }
+
+    def __init__(
+            self,
+            kind,
+            name,
+            label="",
+            icon=None,
+            tooltip="",
+            enabled=True,
+            shown=True,
+            mode=None,
+            selection=None,
+            **options
+    ):
+        # check kind
+        if kind not in self.stateProps:
+            raise ValueError(
+                f"Unrecognised ribbon item kind `{kind}`, must be one of "
+                f"{', '.join(self.stateProps)}."
+            )
+        self.kind = kind
+        self.name = name
+        self.label = label
+        self.icon = icon
+        self.tooltip = tooltip
+        self.enabled = enabled
+        self.shown = shown
+        self.mode = mode
+        self.selection = selection
+        self.options = options
+
+    def __repr__(self):
+        return f"<RibbonItemModel {self.kind} '{self.name}'>"
+
+    def Copy(self):
+        """
+        Get a copy of this item, which can be changed without affecting this one.
+        """
+        item = RibbonItemModel.__new__(RibbonItemModel)
+        for attr in self.__slots__:
+            setattr(item, attr, getattr(self, attr))
+        item.options = dict(self.options)
+
+        return item
+
+    def GetState(self):
+        """
+        Get the properties of this item which can be changed on a live control.
+
+        Returns
+        -------
+        dict
+            Values of this item's state properties, by name
+        """
+        return {prop: getattr(self, prop) for prop in self.stateProps[self.kind]}
+
+    def IsCompatible(self, other):
+        """
+        Could a control made from this item be updated to match another item (i.e. is it the
+        same kind of control, made with the same options)?
+        """
+        return (
+            self.name == other.name
+            and self.kind == other.kind
+            and self.options == other.options
+        )
+
+    def Diff(self, other):
+        """
+        Get the state properties which differ between this item and another, compatible one.
+
+        Returns
+        -------
+        list[tuple]
+            (property, new value) for each property which has changed
+        """
+        return [
+            (prop, value) for prop, value in other.GetState().items()
+            if getattr(self, prop) != value
+        ]
+
+    def GetArgs(self):
+        """
+        Get the keyword arguments to create a control from this item with (via
+        `FrameRibbonSection.Add...`).
+        """
+        kwargs = {key: value for key, value in self.options.items() if key != "depends"}
+        if self.kind in ("button", "dropdown"):
+            kwargs.update(label=self.label, icon=self.icon)
+        if self.kind == "button":
+            kwargs['tooltip'] = self.tooltip
+        if self.kind == "switch" and self.mode is not None:
+            kwargs['startMode'] = self.mode
+        if self.kind == "gallery":
+            kwargs['selection'] = self.selection
+
+        return kwargs
+
+    def GetSpec(self):
+        """
+        Describe this item as it would appear in a spec for `render.RenderRibbon`.
+        """
+        spec = {'type': self.kind, 'enabled': self.enabled}
+        if self.kind in ("button", "dropdown"):
+            spec.update(label=self.label, icon=self.icon)
+            if "style" in self.options:
+                spec['style'] = self.options['style']
+        if self.kind == "switch":
+            spec.update(labels=list(self.options.get("labels", ("", ""))), mode=self.mode)
+        if self.kind == "gallery":
+            # galleries are drawn as a blank box
+            spec = {'type': "window", 'size': (40 * self.options.get("columns", 6) + 24, 44)}
+
+        return spec
+
+
+class RibbonSectionModel:
+    """
+    Description of one section in a ribbon.
+
+    Parameters
+    ----------
+    name : str
+        Name of the section
+    label : str or None
+        Label to display on the section
+    icon : wx_ribbon.icons.RibbonIcon or None
+        Icon for the section's label
+    """
+    __slots__ = ("name", "label", "icon", "items")
+    # properties which can be changed on a live section
+    stateProps = ("label", "icon")
+
+    def __init__(self, name, label=None, icon=None):
+        self.name = name
+        self.label = label
+        self.icon = icon
+        # items in this section, in order
+        self.items = []
+
+    def __repr__(self):
+        return f"<RibbonSectionModel '{self.name}' ({len(self.items)} items)>"
+
+    def Copy(self):
+        """
+        Get a copy of this section (and its items), which can be changed without affecting
+        this one.
+        """
+        section = RibbonSectionModel(self.name, label=self.label, icon=self.icon)
+        section.items = [item.Copy() for item in self.items]
+
+        return section
+
+    def Diff(self, other):
+        """
+        Get the state properties which differ between this section and another.
+
+        Returns
+        -------
+        list[tuple]
+            (property, new value) for each property which has changed
+        """
+        return [
+            (prop, getattr(other, prop)) for prop in self.stateProps
+            if getattr(self, prop) != getattr(other, prop)
+        ]
+
+    def GetSpec(self):
+        """
+        Describe this section as it would appear in a spec for `render.RenderRibbon`.
+        """
+        return {
+            'type': "section",
+            'label': self.label or "",
+            'icon': self.icon,
+            'items': [item.GetSpec() for item in self.items if item.shown],
+        }
+
+
+class RibbonModel:
+    """
+    Description of a whole ribbon: its sections, in order, and the controls in each.
+    """
+    __slots__ = ("sections",)
+
+    def __init__(self):
+        self.sections = []
+
+    def __repr__(self):
+        return f"<RibbonModel ({len(self.sections)} sections)>"
+
+    def Copy(self):
+        """
+        Get a copy of this model, which can be changed without affecting this one.
+        """
+        model = RibbonModel()
+        model.sections = [section.Copy() for section in self.sections]
+
+        return model
+
+    def AddSection(self, name, label=None, icon=None):
+        """
+        Add a section to the end of the ribbon.
+
+        Returns
+        -------
+        RibbonSectionModel
+            The created section
+        """
+        section = RibbonSectionModel(name, label=label, icon=icon)
+        self.sections.append(section)
+
+        return section
+
+    def AddItem(self, section, kind, name, **kwargs):
+        """
+        Add a control to the end of a section, creating the section if it doesn't exist. See
+        `RibbonItemModel` for arguments.
+
+        Returns
+        -------
+        RibbonItemModel
+            The created item
+        """
+        if self.GetSection(section) is None:
+            self.AddSection(section, label=section)
+        item = RibbonItemModel(kind, name, **kwargs)
+        self.GetSection(section).items.append(item)
+
+        return item
+
+    def AddDependant(self, switch, ctrl, mode, action="show"):
+        """
+        Make a control shown/enabled only when a switch is in a given mode (see
+        `FrameRibbonSwitchCtrl.AddDependant`).
+
+        Parameters
+        ----------
+        switch : str
+            Name of the switch
+        ctrl : str
+            Name of the control to act upon
+        mode : int
+            The mode in which to show/enable the control
+        action : str
+            Either "show" or "enable"
+        """
+        item = self.GetItem(switch)
+        item.options['depends'] = item.options.get("depends", ()) + ((ctrl, mode, action),)
+
+    def GetSection(self, name):
+        """
+        Get a section by name, or None if there isn't one.
+        """
+        for section in self.sections:
+            if section.name == name:
+                return section
+
+    def GetItem(self, name):
+        """
+        Get an item by name, or None if there isn't one.
+        """
+        for section in self.sections:
+            for item in section.items:
+                if item.name == name:
+                    return item
+
+    def GetItems(self):
+        """
+        Get every item in the ribbon, in order.
+        """
+        return [item for section in self.sections for item in section.items]
+
+    def GetSpec(self):
+        """
+        Describe this model as a spec for `render.RenderRibbon`.
+        """
+        return [section.GetSpec() for section in self.sections]
+
+    def Diff(self, other):
+        """
+        Get the changes needed to turn a ribbon matching this model into one matching another.
+        Sections and controls are only removed and remade if they've been removed, moved or
+        need creating with different options, otherwise just their changed properties are
+        updated.
+
+        Parameters
+        ----------
+        other : RibbonModel
+            Model to change to
+
+        Returns
+        -------
+        list[tuple]
+            Changes, in the order they should be applied, each one of:
+            - ("removeItem", name)
+            - ("removeSection", name)
+            - ("setSection", name, property, value)
+            - ("setItem", name, property, value)
+            - ("addSection", RibbonSectionModel) - added without its items
+            - ("addItem", section name, RibbonItemModel)
+        """
+        removes, sets, adds = [], [], []
+        # keep sections which are in the same position relative to one another
+        oldSections = {section.name: section for section in self.sections}
+        kept = self._keptPrefix(
+            [section for section in self.sections if other.GetSection(section.name)],
+            other.sections,
+            lambda old, new: old.name == new.name,
+        )
+        for section in self.sections:
+            if section.name not in kept:
+                removes.append(("removeSection", section.name))
+        for section in other.sections:
+            # new or moved sections are made from scratch
+            if section.name not in kept:
+                adds.append(("addSection", section))
+                for item in section.items:
+                    adds.append(("addItem", section.name, item))
+                continue
+            old = oldSections[section.name]
+            # update section properties
+            for prop, value in old.Diff(section):
+                sets.append(("setSection", section.name, prop, value))
+            # keep items which are in the same position and compatible
+            keptItems = self._keptPrefix(
+                [item for item in old.items if item.name in {i.name for i in section.items}],
+                section.items,
+                lambda old, new: old.IsCompatible(new),
+            )
+            for item in old.items:
+                if item.name not in keptItems:
+                    removes.append(("removeItem", item.name))
+            for item in section.items:
+                if item.name in keptItems:
+                    # update item properties
+                    for prop, value in keptItems[item.name].Diff(item):
+                        sets.append(("setItem", item.name, prop, value))
+                else:
+                    adds.append(("addItem", section.name, item))
+        # controls removed first (their names may be reused), sections last
+        removes.sort(key=lambda change: change[0] == "removeSection")
+
+        return removes + sets + adds
+
+    @staticmethod
+    def _keptPrefix(old, new, match):
+        """
+        Get the entries (by name) of `old` which form the start of `new` and match their
+        counterparts, i.e. those which can stay where they are while everything after them is
+        added on the end.
+        """
+        kept = {}
+        for oldEntry, newEntry in zip(old, new):
+            if not match(oldEntry, newEntry):
+                break
+            kept[oldEntry.name] = oldEntry
+
+        return kept
@@ -0,0 +1,285 @@
+import json
+import logging
+import wx
+from pathlib import Path
+from wx_ribbon import ribbon, icons, themes
+from wx_ribbon.icons.base import RibbonIcon
+
+
+__all__ = [
+    "RibbonUsageProfile",
+]
+
+
+class RibbonUsageProfile:
+    """
+    Records which controls, sections and icons (as shown by those controls: height, theme and
+    tint) a user actually uses, across sessions, so that a ribbon can prepare exactly those at
+    startup - most used first - and leave everything else to be rendered lazily. Give one to a
+    ribbon with `FrameRibbon.SetUsageProfile`.
+
+    ```python
+    profile = RibbonUsageProfile.Load(configDir / "ribbon_usage.json")
+    ribbon.SetUsageProfile(profile)  # saved when the ribbon is destroyed
+    ```
+
+    Parameters
+    ----------
+    file : str or pathlib.Path or None
+        File to save the profile to when a tracked ribbon is destroyed, or None to only save
+        when `Save` is called
+    """
+    # version of the file format
+    version = 2
+    # maximum number of icons to prepare at startup (see GetIcons)
+    maxIcons = 64
+    # maximum number of icons to keep in the profile, least used are dropped on save
+    maxEntries = 256
+    # events which count as using a control
+    binders = (wx.EVT_BUTTON, ribbon.EVT_RIBBON_SWITCH, ribbon.EVT_RIBBON_GALLERY)
+
+    def __init__(self, file=None):
+        self.file = file
+        # number of uses of each control and section, by name
+        self.controls = {}
+        self.sections = {}
+        # number of uses of each icon, by (icon name, height, theme name, tint, states)
+        self.icons = {}
+
+    def __repr__(self):
+        return (
+            f"<RibbonUsageProfile ({len(self.controls)} controls, {len(self.icons)} icons)>"
+        )
+
+    @classmethod
+    def Load(cls, file):
+        """
+        Load a profile saved by a previous session. If the file doesn't exist (e.g. on first
+        launch) or can't be read, an empty profile is returned which will save to it. Profiles
+        saved in version 1 of the format keep their control and section counts, but not their
+        icons (which were recorded without the theme and tint they were shown in).
+
+        Parameters
+        ----------
+        file : str or pathlib.Path
+            File to load from
+
+        Returns
+        -------
+        RibbonUsageProfile
+            The loaded profile
+        """
+        profile = cls(file=file)
+        if not Path(file).is_file():
+            return profile
+        try:
+            with Path(file).open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            # start afresh from profiles in an unknown format
+            if data.get("version") not in (1, cls.version):
+                return profile
+            profile.controls = dict(data.get("controls", {}))
+            profile.sections = dict(data.get("sections", {}))
+            # version 1 icons can't be shown as they were, so are recorded again as they're used
+            if data.get("version") == 1:
+                return profile
+            for entry in data.get("icons", []):
+                key = (
+                    entry['name'], entry['height'], entry['theme'], entry['tint'], entry['states']
+                )
+                profile.icons[key] = entry['count']
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as err:
+            logging.warning(f"Could not load ribbon usage profile from {file}: {err}")
+
+        return profile
+
+    def Save(self, file=None):
+        """
+        Save this profile, to be loaded by the next session.
+
+        Parameters
+        ----------
+        file : str or pathlib.Path or None
+            File to save to, or None to use the file given on creation
+        """
+        if file is None:
+            file = self.file
+        data = {
+            'version': self.version,
+            'controls': self.controls,
+            'sections': self.sections,
+            'icons': [
+                {
+                    'name': name,
+                    'height': height,
+                    'theme': theme,
+                    'tint': tint,
+                    'states': states,
+                    'count': count,
+                }
+                for (name, height, theme, tint, states), count in self.GetMostUsedIcons(
+                    self.maxEntries
+                )
+            ],
+        }
+        with Path(file).open("w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+
+    def Track(self, ribbon):
+        """
+        Start recording what's used in a ribbon. Called by `FrameRibbon.SetUsageProfile`.
+
+        Parameters
+        ----------
+        ribbon : wx_ribbon.FrameRibbon
+            Ribbon to record
+        """
+        for binder in self.binders:
+            ribbon.Bind(binder, self.onEvent)
+        ribbon.Bind(wx.EVT_WINDOW_DESTROY, self.onDestroy)
+
+    def Untrack(self, ribbon):
+        """
+        Stop recording what's used in a ribbon.
+
+        Parameters
+        ----------
+        ribbon : wx_ribbon.FrameRibbon
+            Ribbon to stop recording
+        """
+        for binder in self.binders:
+            ribbon.Unbind(binder, handler=self.onEvent)
+        ribbon.Unbind(wx.EVT_WINDOW_DESTROY, handler=self.onDestroy)
+
+    def Record(self, ribbon, name):
+        """
+        Record one use of a control: the control itself, the section it's in, and every icon
+        it (and its section) shows, as it shows them in the ribbon's current theme.
+
+        Parameters
+        ----------
+        ribbon : wx_ribbon.FrameRibbon
+            Ribbon the control is in
+        name : str
+            Name of the control (as given to `Add...`)
+        """
+        ctrl = ribbon.buttons.get(name)
+        if ctrl is None:
+            return
+        self.controls[name] = self.controls.get(name, 0) + 1
+        windows = [ctrl, getattr(ctrl, "button", None)]
+        # record section
+        for sectionName, sct in ribbon.sections.items():
+            if name in sct.buttons:
+                self.sections[sectionName] = self.sections.get(sectionName, 0) + 1
+                windows.append(sct)
+        # record icons (only named ones in named themes, which can be found next session)
+        theme = ribbon.theme
+        if getattr(theme, "name", None) is None:
+            return
+        for window in windows:
+            if not hasattr(window, "GetShownIcons"):
+                continue
+            for icon, height, tint, states in window.GetShownIcons():
+                if not isinstance(icon, RibbonIcon) or icon.name is None:
+                    continue
+                # tints are saved as text, so skip any given as e.g. a wx.Colour
+                if tint is not None and not isinstance(tint, str):
+                    continue
+                key = (icon.name, height, theme.name, tint, states)
+                self.icons[key] = self.icons.get(key, 0) + 1
+
+    def GetMostUsedIcons(self, n=None):
+        """
+        Get the recorded icon entries, most used first.
+
+        Parameters
+        ----------
+        n : int or None
+            Maximum number of entries to get, or None for all of them
+
+        Returns
+        -------
+        list[tuple]
+            (key, count) for each entry, where key is (icon name, height, theme name, tint, 
+            states)
+        """
+        return sorted(self.icons.items(), key=lambda item: item[1], reverse=True)[:n]
+
+    def GetIcons(self, n=None):
+        """
+        Get the icons this profile has recorded being used, most used first, as they were 
+        shown.
+
+        Parameters
+        ----------
+        n : int or None
+            Maximum number of icons to get, or None to use `maxIcons`
+
+        Returns
+        -------
+        list[tuple]
+            (icon, height, theme, tint, states) for each icon, as taken by 
+            `FrameRibbon.PrewarmIcons`
+        """
+        if n is None:
+            n = self.maxIcons
+        entries = []
+        for (name, height, themeName, tint, states), count in self.GetMostUsedIcons():
+            # get icon and theme from their constants, skipping any which no longer exist
+            icon = getattr(icons, self._constant(icons.IconConstantHandler.prefix, name), None)
+            theme = getattr(
+                themes, self._constant(themes.ThemeConstantHandler.prefix, themeName), None
+            )
+            if isinstance(icon, RibbonIcon) and theme is not None:
+                entries.append((icon, height, theme, tint, states))
+            if len(entries) >= n:
+                break
+
+        return entries
+
+    @staticmethod
+    def _constant(prefix, name):
+        """
+        Get the name of the constant an icon or theme is registered as.
+        """
+        return prefix + name.upper().replace(" ", "_")
+
+    def onEvent(self, evt):
+        # let the event carry on to the ribbon's dispatcher
+        evt.Skip()
+        # get the ribbon the event came from
+        owner = self._getRibbon(evt.GetEventObject())
+        if owner is None:
+            return
+        # get the control which emitted it
+        name = owner.GetControlName(evt.GetEventObject())
+        if name is None:
+            return
+        # clicks within a switch or gallery are counted by their mode/selection event instead
+        if evt.GetEventType() == wx.EVT_BUTTON.typeId:
+            ctrl = owner.buttons[name]
+            if evt.GetEventObject() not in (ctrl, getattr(ctrl, "button", None)):
+                return
+        self.Record(owner, name)
+
+    def onDestroy(self, evt):
+        evt.Skip()
+        # only save when the ribbon itself is destroyed, not its children
+        if not isinstance(evt.GetEventObject(), ribbon.FrameRibbon):
+            return
+        if self.file is not None:
+            try:
+                self.Save()
+            except OSError as err:
+                logging.warning(f"Could not save ribbon usage profile to {self.file}: {err}")
+
+    @staticmethod
+    def _getRibbon(window):
+        """
+        Get the FrameRibbon a window is in, or None if it isn't in one.
+        """
+        while isinstance(window, wx.Window):
+            if isinstance(window, ribbon.FrameRibbon):
+                return window
+            window = window.GetParent()
@@ -0,0 +1,539 @@
+"""
+Render ribbons to images without creating or showing any windows, e.g. for documentation or
+visual regression checks.
+
+A ribbon can be given either as a `FrameRibbon` or as a "spec" - a list of dicts describing
+each entry in the ribbon, in order:
+
+```python
+spec = [
+    {'type': "section", 'label': "File", 'icon': icons.RB_ICON_FILE_OPEN, 'items': [
+        {'type': "button", 'label': "New", 'icon': icons.RB_ICON_FILE_NEW},
+        {'type': "button", 'label': "Info", 'icon': icons.RB_ICON_INFO, 'style': wx.BU_LEFT},
+        {'type': "dropdown", 'label': "User", 'icon': icons.RB_ICON_USER},
+        {'type': "switch", 'labels': ["Run", "Debug"], 'mode': 0, 'style': wx.VERTICAL},
+    ]},
+    {'type': "separator"},
+    {'type': "stretch", 'prop': 1},
+]
+```
+
+Spec entries for windows can also give a `size` (in px at 100% scale) to use instead of the
+size worked out from their contents. Specs taken from a live ribbon (see `GetRibbonSpec`) give
+each window's actual size, so they render with the same widths as the real controls.
+
+All icons are drawn from the same `RibbonIcon` caches, so rendering many variants in one
+process only rasterizes each icon once per size & style.
+"""
+
+import sys
+import wx
+from pathlib import Path
+from wx_ribbon import themes, icons
+
+
+__all__ = [
+    "GetRibbonSpec",
+    "RenderRibbon",
+    "RenderRibbonMatrix",
+]
+
+
+# sizes (at 100% scale) matching those used by the live controls
+_buttonHeight = 44
+_iconHeight = 28
+_iconMargin = 8
+_labelIconHeight = 12
+_labelGap = 6
+_separatorWidth = 36
+_switchIconMargin = 6
+
+
+def GetRibbonSpec(ribbon):
+    """
+    Describe a live FrameRibbon as a spec which can be rendered by `RenderRibbon`. The ribbon
+    doesn't need to be shown.
+
+    Parameters
+    ----------
+    ribbon : wx_ribbon.FrameRibbon
+        Ribbon to describe
+
+    Returns
+    -------
+    list[dict]
+        Spec describing the ribbon
+    """
+    spec = []
+    # iterate through items in the ribbon's sizer
+    for item in ribbon.sizer.GetChildren():
+        # skip hidden items
+        if not item.IsShown():
+            continue
+        if item.IsSpacer():
+            spec.append(_getSpacerSpec(item))
+        elif item.IsWindow():
+            spec.append(_getWindowSpec(item.GetWindow()))
+
+    return spec
+
+
+def _getSpacerSpec(item):
+    """
+    Describe a sizer item which is a spacer.
+    """
+    if item.GetProportion():
+        return {'type': "stretch", 'prop': item.GetProportion()}
+    else:
+        return {'type': "spacer", 'size': item.GetSize()[0]}
+
+
+def _getWindowSpec(window):
+    """
+    Describe a window within a ribbon or ribbon section.
+    """
+    from wx_ribbon.ribbon import FrameRibbonSection
+    from wx_ribbon.buttons import (
+        FrameRibbonButton, FrameRibbonDropdownButton, FrameRibbonSwitchCtrl
+    )
+    # size the window actually takes up in the ribbon, at 100% scale
+    size = tuple(window.ToDIP(window.GetEffectiveMinSize()))
+    # sections
+    if isinstance(window, FrameRibbonSection):
+        items = []
+        for item in window.sizer.GetChildren():
+            if not item.IsShown():
+                continue
+            if item.IsSpacer():
+                items.append(_getSpacerSpec(item))
+            elif item.IsWindow():
+                items.append(_getWindowSpec(item.GetWindow()))
+        return {
+            'type': "section",
+            'label': window.label.GetLabel(),
+            'icon': window.icon,
+            'items': items,
+            'size': size,
+        }
+    # buttons
+    if isinstance(window, FrameRibbonButton):
+        return {
+            'type': "button",
+            'label': window.GetLabelText(),
+            'icon': window.icon,
+            'style': window.GetWindowStyleFlag(),
+            'enabled': window.IsEnabled(),
+            'size': size,
+        }
+    # dropdown buttons
+    if isinstance(window, FrameRibbonDropdownButton):
+        return {
+            'type': "dropdown",
+            'label': window.button.GetLabelText(),
+            'icon': window.button.icon,
+            'style': window.button.GetWindowStyleFlag(),
+            'enabled': window.IsEnabled(),
+            'size': size,
+        }
+    # switch ctrls
+    if isinstance(window, FrameRibbonSwitchCtrl):
+        return {
+            'type': "switch",
+            'labels': [btn.GetLabel() for btn in window.btns],
+            'mode': window.mode,
+            'style': window.style,
+            'icons': window.icons,
+            'enabled': window.IsEnabled(),
+            'size': size,
+        }
+    # separators
+    if isinstance(window, wx.StaticLine):
+        return {'type': "separator"}
+    # anything else is drawn as a blank box the same size as the window
+    return {'type': "window", 'size': size}
+
+
+class _RibbonPainter:
+    """
+    Measures and draws a ribbon spec onto a DC in a given theme at a given scale.
+    """
+    def __init__(self, dc, theme, scale):
+        self.dc = dc
+        self.theme = theme
+        self.scale = scale
+        # setup font
+        font = wx.SystemSettings.GetFont(wx.SYS_DEFAULT_GUI_FONT)
+        if scale != 1:
+            font = font.Scaled(scale)
+        self.dc.SetFont(font)
+        self.textHeight = self.dc.GetTextExtent("Ag")[1]
+
+    def px(self, value):
+        """
+        Scale a size from 100% to the current scale.
+        """
+        return int(round(value * self.scale))
+
+    def GetRibbonHeight(self):
+        """
+        Get the height of a ribbon: buttons, then section labels.
+        """
+        return (
+            self.px(_buttonHeight)
+            + self.px(_labelGap)
+            + max(self.textHeight, self.px(_labelIconHeight))
+            + self.px(_labelGap)
+        )
+
+    def GetItemWidth(self, item):
+        """
+        Get the natural width of an item within a ribbon or section.
+        """
+        kind = item.get("type")
+        if kind == "spacer":
+            return self.px(item.get("size", 6))
+        if kind == "stretch":
+            return 0
+        if kind == "separator":
+            return self.px(_separatorWidth)
+        # use the window's own size if the spec gives it (e.g. taken from a live ribbon)
+        if item.get("size") is not None:
+            return self.px(item['size'][0])
+        if kind == "window":
+            return 0
+        if kind == "section":
+            # width is whichever is wider out of the items and the label
+            itemsWidth = sum(self.GetItemWidth(child) for child in item.get("items", []))
+            labelWidth = self.dc.GetTextExtent(item.get("label") or "")[0]
+            if item.get("icon") is not None:
+                labelWidth += self.px(_labelIconHeight) + self.px(_labelGap)
+            return max(itemsWidth, labelWidth)
+        if kind in ("button", "dropdown"):
+            # icon-only buttons are a fixed width
+            if item.get("style", wx.BU_NOTEXT) & wx.BU_NOTEXT:
+                w = self.px(40)
+            else:
+                w = (
+                    self.px(_iconMargin) * 3 + self.px(_iconHeight)
+                    + self.dc.GetTextExtent(item.get("label", ""))[0]
+                )
+            # dropdowns have an extra arrow button
+            if kind == "dropdown":
+                w += self.dc.GetTextExtent("▾")[0] + self.px(_iconMargin)
+            return w
+        if kind == "switch":
+            return self.LayoutSwitch(item)[1]
+        return 0
+
+    def LayoutSwitch(self, item):
+        """
+        Arrange a switch's labels and icon as the live control does for its style: two modes
+        side by side have the icon between them, otherwise labels are in a row (or a column,
+        if vertical) with the icon to their right (or left, with wx.BU_LEFT).
+
+        Returns
+        -------
+        list[tuple]
+            ("text", label, x, y, active) for each label and ("icon", icon, x, y) for the icon,
+            relative to the top left of the switch
+        int
+            Width of the switch
+        """
+        labels = list(item.get("labels", ("", "")))
+        mode = item.get("mode", 0)
+        style = item.get("style", wx.HORIZONTAL)
+        vertical = bool(style & wx.VERTICAL)
+        iconHeight = self.px(_iconHeight)
+        margin = self.px(_switchIconMargin)
+        buttonHeight = self.px(_buttonHeight)
+        # get the icon for the current mode, defaulting to the built-in icons for two modes
+        modeIcons = item.get("icons")
+        if modeIcons is None and len(labels) == 2:
+            if vertical:
+                modeIcons = [icons.RB_ICON_SWITCH_TOP, icons.RB_ICON_SWITCH_BOTTOM]
+            else:
+                modeIcons = [icons.RB_ICON_SWITCH_LEFT, icons.RB_ICON_SWITCH_RIGHT]
+        icon = None
+        if modeIcons is not None and mode is not None:
+            icon = modeIcons[mode]
+        # labels aren't shown with wx.BU_NOTEXT
+        if style & wx.BU_NOTEXT:
+            labels = []
+        widths = [self.dc.GetTextExtent(label)[0] for label in labels]
+        iy = (buttonHeight - iconHeight) // 2
+        ty = (buttonHeight - self.textHeight) // 2
+        # two modes side by side, with the icon in the middle
+        if not vertical and len(labels) == 2 and icon is not None:
+            pieces = [
+                ("text", labels[0], 0, ty, mode == 0),
+                ("icon", icon, widths[0] + margin, iy),
+                ("text", labels[1], widths[0] + iconHeight + margin * 2, ty, mode == 1),
+            ]
+            return pieces, sum(widths) + iconHeight + margin * 2
+        # otherwise, lay out labels in a column or a row
+        pieces = []
+        if vertical:
+            rowHeight = buttonHeight // max(len(labels), 1)
+            for i, label in enumerate(labels):
+                y = rowHeight * i + (rowHeight - self.textHeight) // 2
+                pieces.append(("text", label, 0, y, i == mode))
+            labelsWidth = max(widths, default=0)
+        else:
+            x = 0
+            for i, (label, w) in enumerate(zip(labels, widths)):
+                pieces.append(("text", label, x, ty, i == mode))
+                x += w
+            labelsWidth = x
+        # no icon means just the labels
+        if icon is None:
+            return pieces, labelsWidth
+        # put icon on the left, moving labels after it...
+        if style & wx.BU_LEFT:
+            offset = iconHeight + margin * 2
+            pieces = [
+                ("text", label, x + offset, y, active) for _, label, x, y, active in pieces
+            ]
+            pieces.insert(0, ("icon", icon, margin, iy))
+        # ...or on the right
+        else:
+            pieces.append(("icon", icon, labelsWidth + margin, iy))
+
+        return pieces, labelsWidth + iconHeight + margin * 2
+
+    def Measure(self, spec, width=None):
+        """
+        Get the x position and width of each top level entry in a spec, distributing any space
+        left over from `width` between stretch spacers.
+        """
+        widths = [self.GetItemWidth(item) for item in spec]
+        # distribute leftover space
+        total = sum(widths)
+        props = sum(item.get("prop", 1) for item in spec if item.get("type") == "stretch")
+        if width is not None and props and width > total:
+            extra = width - total
+            for i, item in enumerate(spec):
+                if item.get("type") == "stretch":
+                    widths[i] = int(extra * item.get("prop", 1) / props)
+        # get positions
+        positions = []
+        x = 0
+        for w in widths:
+            positions.append((x, w))
+            x += w
+
+        return positions
+
+    def DrawBitmap(self, icon, x, y, height, enabled=True):
+        """
+        Draw a RibbonIcon at the given position.
+        """
+        if icon is None:
+            return
+        bmp = icon.GetBitmap(height=height, style=self.theme.icons)
+        if not enabled:
+            bmp = bmp.ConvertToDisabled(
+                int(wx.Colour(self.theme.base).GetLuminance() * 255)
+            )
+        self.dc.DrawBitmap(bmp, x, y, useMask=True)
+
+    def DrawText(self, text, x, y, enabled=True):
+        """
+        Draw text in the theme's text color at the given position.
+        """
+        color = self.theme.text
+        if not enabled:
+            color = self.theme.MakeDisabled(color)
+        self.dc.SetTextForeground(wx.Colour(color))
+        self.dc.DrawText(text, x, y)
+
+    def DrawItem(self, item, x, w):
+        """
+        Draw a single item at the given horizontal position.
+        """
+        kind = item.get("type")
+        enabled = item.get("enabled", True)
+        if kind == "section":
+            self.DrawSection(item, x, w)
+        elif kind == "separator" and sys.platform == "win32":
+            # separators are only drawn as a line on Windows
+            self.dc.SetPen(wx.Pen(wx.Colour(self.theme.overlay)))
+            mid = x + w // 2
+            self.dc.DrawLine(mid, self.px(6), mid, self.GetRibbonHeight() - self.px(6))
+        elif kind == "window":
+            self.dc.SetPen(wx.TRANSPARENT_PEN)
+            self.dc.SetBrush(wx.Brush(wx.Colour(self.theme.mantle)))
+            h = min(self.px(item.get("size", (0, 0))[1]), self.px(_buttonHeight))
+            self.dc.DrawRectangle(x, 0, w, h)
+        elif kind in ("button", "dropdown"):
+            iconHeight = self.px(_iconHeight)
+            iy = (self.px(_buttonHeight) - iconHeight) // 2
+            if item.get("style", wx.BU_NOTEXT) & wx.BU_NOTEXT:
+                # icon only, centred
+                self.DrawBitmap(
+                    item.get("icon"), x + (self.px(40) - iconHeight) // 2, iy, iconHeight, enabled
+                )
+                tx = x + self.px(40)
+            else:
+                # icon followed by label
+                self.DrawBitmap(
+                    item.get("icon"), x + self.px(_iconMargin), iy, iconHeight, enabled
+                )
+                tx = x + self.px(_iconMargin) * 2 + iconHeight
+                ty = (self.px(_buttonHeight) - self.textHeight) // 2
+                self.DrawText(item.get("label", ""), tx, ty, enabled)
+                tx += self.dc.GetTextExtent(item.get("label", ""))[0] + self.px(_iconMargin)
+            # dropdown arrow
+            if kind == "dropdown":
+                ty = (self.px(_buttonHeight) - self.textHeight) // 2
+                self.DrawText("▾", tx, ty, enabled)
+        elif kind == "switch":
+            for piece in self.LayoutSwitch(item)[0]:
+                if piece[0] == "text":
+                    # active label in text color, others dimmed
+                    _, label, dx, dy, active = piece
+                    self.DrawText(label, x + dx, dy, enabled and active)
+                else:
+                    _, icon, dx, dy = piece
+                    self.DrawBitmap(icon, x + dx, dy, self.px(_iconHeight), enabled)
+
+    def DrawSection(self, section, x, w):
+        """
+        Draw a section, its items and its label.
+        """
+        # draw items
+        items = section.get("items", [])
+        for (ix, iw), item in zip(self.Measure(items), items):
+            self.DrawItem(item, x + ix, iw)
+        # measure label
+        label = section.get("label") or ""
+        labelWidth = self.dc.GetTextExtent(label)[0]
+        iconHeight = self.px(_labelIconHeight)
+        if section.get("icon") is not None:
+            labelWidth += iconHeight + self.px(_labelGap)
+        # draw label, centred under items
+        lx = x + (w - labelWidth) // 2
+        ly = self.px(_buttonHeight) + self.px(_labelGap)
+        if section.get("icon") is not None:
+            self.DrawBitmap(
+                section['icon'], lx, ly + (self.textHeight - iconHeight) // 2, iconHeight
+            )
+            lx += iconHeight + self.px(_labelGap)
+        self.DrawText(label, lx, ly)
+
+    def Draw(self, spec, width=None):
+        """
+        Draw a whole ribbon spec.
+        """
+        for (x, w), item in zip(self.Measure(spec, width=width), spec):
+            self.DrawItem(item, x, w)
+
+
+def RenderRibbon(ribbon, theme=None, width=None, scale=1):
+    """
+    Draw a ribbon to an image, without creating or showing any windows. A wx.App must exist,
+    but doesn't need to be running.
+
+    Parameters
+    ----------
+    ribbon : wx_ribbon.FrameRibbon, wx_ribbon.model.RibbonModel or list[dict]
+        Ribbon to draw, either as a FrameRibbon, a model or a spec (see the docstring for this 
+        module)
+    theme : wx_ribbon.themes.base.BaseRibbonTheme or None
+        Theme to draw the ribbon in, leave as None to use the ribbon's theme (or
+        RB_THEME_LIGHT for a spec)
+    width : int or None
+        Width (in px at 100% scale) to draw the ribbon at, leave as None to use its natural
+        width. Any extra space is shared between stretch spacers.
+    scale : float
+        Scale to draw at, e.g. 2 for a high DPI rendering
+
+    Returns
+    -------
+    wx.Image
+        The rendered ribbon
+    """
+    # get spec from a model
+    if hasattr(ribbon, "GetSpec"):
+        ribbon = ribbon.GetSpec()
+    # get spec and theme from a live ribbon
+    if not isinstance(ribbon, (list, tuple)):
+        if theme is None:
+            theme = ribbon.theme
+        ribbon = GetRibbonSpec(ribbon)
+    if theme is None:
+        theme = themes.RB_THEME_LIGHT
+    # measure on a placeholder bitmap, as text can't be measured until one is selected
+    dc = wx.MemoryDC(wx.Bitmap(1, 1))
+    painter = _RibbonPainter(dc, theme, scale)
+    natural = sum(w for x, w in painter.Measure(ribbon))
+    if width is None:
+        w = natural
+    else:
+        w = max(painter.px(width), natural)
+    h = painter.GetRibbonHeight()
+    # make bitmap and select it
+    bmp = wx.Bitmap(max(w, 1), max(h, 1))
+    dc.SelectObject(bmp)
+    # fill background
+    dc.SetBackground(wx.Brush(wx.Colour(theme.crust)))
+    dc.Clear()
+    # draw ribbon
+    painter.Draw(ribbon, width=w)
+    # deselect bitmap so it can be converted
+    dc.SelectObject(wx.NullBitmap)
+
+    return bmp.ConvertToImage()
+
+
+def RenderRibbonMatrix(ribbon, themeList=None, scales=(1,), widths=(None,), folder=None):
+    """
+    Render every combination of the given themes, scales and widths for one ribbon.
+
+    Parameters
+    ----------
+    ribbon : wx_ribbon.FrameRibbon, wx_ribbon.model.RibbonModel or list[dict]
+        Ribbon to draw, either as a FrameRibbon, a model or a spec (see the docstring for this 
+        module)
+    themeList : list[wx_ribbon.themes.base.BaseRibbonTheme] or None
+        Themes to draw the ribbon in, leave as None to use RB_THEME_LIGHT and RB_THEME_DARK
+    scales : list[float]
+        Scales to draw at
+    widths : list[int or None]
+        Widths to draw at (None for the ribbon's natural width)
+    folder : str or pathlib.Path or None
+        If given, each image is also saved here as a PNG named `{theme}_{scale}x_{width}.png`
+
+    Returns
+    -------
+    dict
+        Rendered images (wx.Image), keyed by (theme, scale, width)
+    """
+    # default to built-in themes
+    if themeList is None:
+        themeList = [themes.RB_THEME_LIGHT, themes.RB_THEME_DARK]
+    # describe a model or live ribbon only once
+    if hasattr(ribbon, "GetSpec"):
+        ribbon = ribbon.GetSpec()
+    if not isinstance(ribbon, (list, tuple)):
+        ribbon = GetRibbonSpec(ribbon)
+    # make folder if needed
+    if folder is not None:
+        folder = Path(folder)
+        folder.mkdir(parents=True, exist_ok=True)
+    # render each combination
+    images = {}
+    for theme in themeList:
+        for scale in scales:
+            for width in widths:
+                img = images[(theme, scale, width)] = RenderRibbon(
+                    ribbon, theme=theme, width=width, scale=scale
+                )
+                # save if requested
+                if folder is not None:
+                    name = (
+                        f"{(theme.name or theme.__name__).lower()}_{scale}x_"
+                        f"{width or 'natural'}.png"
+                    )
+                    img.SaveFile(str(folder / name), wx.BITMAP_TYPE_PNG)
+
+    return images
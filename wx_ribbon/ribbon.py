@@ -1,7 +1,19 @@
 import sys
+import time
+import inspect
+import logging
+import threading
+import contextlib
 import wx
-from wx_ribbon import themes, icons
+from wx_ribbon import themes, icons, tasks
 from wx_ribbon.themes.base import RibbonThemeMixin
+from wx_ribbon.layout import RibbonFlatLayout, RB_LAYOUT_SIZERS, RB_LAYOUT_FLAT
+from wx_ribbon.model import RibbonModel
+
+
+# events emitted by ribbon controls when their state changes
+EVT_RIBBON_SWITCH = wx.PyEventBinder(wx.IdManager.ReserveId())
+EVT_RIBBON_GALLERY = wx.PyEventBinder(wx.IdManager.ReserveId())
 
 
 class FrameRibbon(wx.Panel, RibbonThemeMixin):
@@ -12,23 +24,984 @@ class FrameRibbon(wx.Panel, RibbonThemeMixin):
     ----------
     parent : wx.Frame or wx.Window
         Frame or Window to which this ribbon belongs
+    theme : wx_ribbon.themes.base.BaseRibbonTheme or None
+        Theme to use for this ribbon, leave as None to use the app-wide theme (see 
+        `themes.RibbonThemeManager`), or RB_THEME_LIGHT if there isn't one
+    layout : int
+        Layout engine to use, one of:
+        - RB_LAYOUT_SIZERS: Lay out each section via its own sizers (default)
+        - RB_LAYOUT_FLAT: Lay out all sections and items in one pass (see 
+          `layout.RibbonFlatLayout`), faster for ribbons with many controls
+    progressive : bool
+        If True, icons which haven't been rendered yet are shown as placeholders and rendered 
+        in idle time (visible sections first), so the ribbon appears straight away no matter 
+        how many icons it has. See `RequestBitmap`.
+    followAppTheme : bool or None
+        Should this ribbon switch theme whenever the app-wide theme is set (see 
+        `themes.RibbonThemeManager.SetTheme`)? Leave as None to follow it only if no theme is 
+        given.
     """
+    # ms of each idle event to spend rendering icons (when progressive or prewarming)
+    progressiveBudget = 8
+
     def __init__(
             self, 
             parent,
-            theme=themes.RB_THEME_LIGHT
+            theme=None,
+            layout=RB_LAYOUT_SIZERS,
+            progressive=False,
+            followAppTheme=None
         ):
         # initialize panel
         wx.Panel.__init__(self, parent)
         # setup sizer
         self.sizer = wx.BoxSizer(wx.HORIZONTAL)
         self.SetSizer(self.sizer)
+        # setup layout engine
+        self.flatLayout = None
+        if layout == RB_LAYOUT_FLAT:
+            self.flatLayout = RibbonFlatLayout(self)
         # dicts in which to store sections and buttons
         self.sections = {}
         self.buttons = {}
+        # names of controls, keyed by control (see GetControlName)
+        self.controlNames = {}
+        # dict mapping command IDs to callbacks
+        self.commands = {}
+        # how many Batch contexts are open, and what they've deferred
+        self._batchDepth = 0
+        self._themeBatch = None
+        # updates posted from other threads, keyed by (control, property)
+        self._updates = {}
+        self._updatesLock = threading.Lock()
+        self._updatesScheduled = False
+        # ms to wait before applying posted updates (0 to apply at the next idle)
+        self.updateInterval = 0
+        # model last applied (if any, see ApplyModel)
+        self.model = None
+        # watchdog timing callbacks (if any, see SetWatchdog)
+        self.watchdog = None
+        # bitmaps still to render, as (make, apply) pairs keyed by window
+        self.progressive = progressive
+        self._bitmapQueue = {}
+        # things to prepare in idle time, in order, as (target, args) pairs whose 
+        # `target.Prewarm(*args)` is called (see Prewarm and PrewarmIcons)
+        self._warmQueue = {}
+        # profile of which controls & icons get used (see SetUsageProfile)
+        self.usageProfile = None
+        self.Bind(wx.EVT_IDLE, self.onIdle)
+        # light & dark themes to follow the system appearance with (see SetAutoTheme)
+        self.autoThemes = None
+        # have icon bitmaps been released while hidden (see ReleaseBitmaps)?
+        self.bitmapsReleased = False
+        # route all clicks, menu selections and switches through one handler
+        self.Bind(wx.EVT_BUTTON, self.onCommand)
+        self.Bind(wx.EVT_MENU, self.onCommand)
+        self.Bind(EVT_RIBBON_SWITCH, self.onCommand)
+        self.Bind(EVT_RIBBON_GALLERY, self.onCommand)
+        # track this ribbon for app-wide theme changes (only following them if no theme given)
+        if followAppTheme is None:
+            followAppTheme = theme is None
+        self.followAppTheme = followAppTheme
+        themes.RibbonThemeManager.Register(self)
         # set theme
+        if theme is None:
+            theme = themes.RibbonThemeManager.GetTheme() or themes.RB_THEME_LIGHT
         self.SetTheme(theme)
 
+    def RegisterCommand(self, id, callback):
+        """
+        Set the function to call when a command with the given ID is dispatched. Commands are 
+        dispatched for clicks on any control in this ribbon, for menus popped up from it and, 
+        if the window is bound via `BindCommands`, for menu items and accelerators on other 
+        windows - so the same ID can be shared between a ribbon button, a menu item and an 
+        accelerator.
+
+        Parameters
+        ----------
+        id : int
+            ID of the command (usually the ID of the window or menu item which emits it)
+        callback : function
+            Function to call, will receive the event as its only argument. Can be a 
+            `tasks.RibbonTask` (or an `async def` function) to run it off the UI thread.
+        
+        Returns
+        -------
+        int
+            The ID the callback was registered to
+        """
+        # run coroutine functions in the background
+        if inspect.iscoroutinefunction(callback):
+            callback = tasks.RibbonTask(callback)
+        self.commands[id] = callback
+
+        return id
+
+    def RegisterWindowCommand(self, window, callback):
+        """
+        Set the function to call when the given window emits a command (see 
+        `RegisterCommand`), for as long as the window exists. wx reuses auto-generated IDs, so 
+        the command is dropped when the window is destroyed, rather than firing for whichever 
+        window gets its ID next.
+
+        Parameters
+        ----------
+        window : wx.Window
+            Window emitting the command
+        callback : function
+            Function to call, will receive the event as its only argument
+
+        Returns
+        -------
+        int
+            The ID the callback was registered to
+        """
+        id = self.RegisterCommand(window.GetId(), callback)
+        # get callback as stored (e.g. wrapped in a task)
+        callback = self.commands[id]
+
+        def onDestroy(evt):
+            evt.Skip()
+            # ignore children of the window being destroyed
+            if evt.GetId() != id:
+                return
+            # only auto-generated IDs, as others may be shared with menus, and only if the 
+            # command hasn't since been registered to something else
+            if id < 0 and self.commands.get(id) is callback:
+                del self.commands[id]
+
+        window.Bind(wx.EVT_WINDOW_DESTROY, onDestroy)
+
+        return id
+
+    def UnregisterCommand(self, id):
+        """
+        Stop dispatching the command with the given ID.
+
+        Parameters
+        ----------
+        id : int
+            ID of the command to remove
+        """
+        self.commands.pop(id, None)
+
+    def GetCommand(self, id):
+        """
+        Get the function called when a command with the given ID is dispatched.
+
+        Parameters
+        ----------
+        id : int
+            ID of the command
+
+        Returns
+        -------
+        function or None
+            Callback for the command, or None if there isn't one
+        """
+        return self.commands.get(id)
+
+    def SetCommands(self, commands, clear=False):
+        """
+        Swap the callbacks for many commands at once. Nothing is rebound, so this is cheap 
+        regardless of how many controls the ribbon has.
+
+        Parameters
+        ----------
+        commands : dict
+            Callbacks to use, keyed by command ID
+        clear : bool
+            If True, remove all existing commands first
+        """
+        if clear:
+            self.commands.clear()
+        self.commands.update(commands)
+
+    def BindCommands(self, window):
+        """
+        Dispatch menu and accelerator commands from another window (e.g. the frame this ribbon 
+        is in) through this ribbon, so they can share command IDs with ribbon controls.
+
+        Parameters
+        ----------
+        window : wx.Window
+            Window whose menu commands to dispatch
+        """
+        window.Bind(wx.EVT_MENU, self.onCommand)
+
+    def onCommand(self, evt):
+        # get callback for this command
+        callback = self.commands.get(evt.GetId())
+        # if there isn't one, let the event carry on as normal
+        if callback is None:
+            evt.Skip()
+            return
+        # call callback (timing it, if there's a watchdog)
+        if self.watchdog is not None:
+            with self.watchdog.Time(self.GetCommandName(evt)):
+                callback(evt)
+        else:
+            callback(evt)
+
+    def Invoke(self, name, mode=None):
+        """
+        Run a control's command as if the user had clicked it, with the same events (so any 
+        callback, watchdog or recorder sees exactly what a click would produce). Useful for 
+        scripting and load testing without synthesizing mouse events.
+
+        Parameters
+        ----------
+        name : str
+            Name of the control (as given to `Add...`)
+        mode : int or None
+            For switches, the mode to switch to (or None to go to the next mode). For 
+            galleries, the index of the item to select (required). Ignored for other controls.
+
+        Returns
+        -------
+        bool
+            True if the command was run, False if the control is disabled (so couldn't have 
+            been clicked)
+        """
+        ctrl = self.buttons[name]
+        # disabled controls can't be clicked
+        if not ctrl.IsEnabled():
+            return False
+        # switches change mode (which emits EVT_RIBBON_SWITCH)
+        if hasattr(ctrl, "GetModeCount"):
+            if mode is None:
+                ctrl.onModeToggle()
+            else:
+                ctrl.SetMode(mode)
+            return True
+        # galleries change selection (which emits EVT_RIBBON_GALLERY)
+        if hasattr(ctrl, "GetSelection"):
+            if mode is None:
+                raise ValueError(f"Invoking gallery '{name}' needs the index of an item (mode).")
+            ctrl.SetSelection(mode)
+            return True
+        # dropdowns click their main button
+        if hasattr(ctrl, "button"):
+            ctrl = ctrl.button
+        # emit a click
+        evt = wx.CommandEvent(wx.EVT_BUTTON.typeId, ctrl.GetId())
+        evt.SetEventObject(ctrl)
+        ctrl.GetEventHandler().ProcessEvent(evt)
+
+        return True
+
+    def InvokeMenu(self, item, name=None):
+        """
+        Run a menu command as if the user had picked it. The item is found by its label, so 
+        this works across sessions even though menu IDs are usually auto-generated.
+
+        Parameters
+        ----------
+        item : str
+            Label of the menu item (without mnemonics or accelerators)
+        name : str or None
+            Name of the control (as given to `Add...`) whose menu the item is in, or None for 
+            the menu bar of the frame this ribbon is in
+
+        Returns
+        -------
+        bool
+            True if the item was found and its command run
+        """
+        id, menu = self.FindMenuItem(item, name=name)
+        if menu is None:
+            return False
+        # dispatch from the control (or frame) the menu belongs to, as picking it would
+        if name is None:
+            handler = self.GetTopLevelParent().GetEventHandler()
+        else:
+            handler = self.buttons[name].GetEventHandler()
+        evt = wx.CommandEvent(wx.EVT_MENU.typeId, id)
+        evt.SetEventObject(menu)
+        handler.ProcessEvent(evt)
+
+        return True
+
+    def FindMenuItem(self, item, name=None):
+        """
+        Find a menu item by its label (see `InvokeMenu`). Menus which are made when opened are 
+        made in order to search them.
+
+        Parameters
+        ----------
+        item : str
+            Label of the menu item (without mnemonics or accelerators)
+        name : str or None
+            Name of the control whose menu to search, or None for the menu bar of the frame 
+            this ribbon is in
+
+        Returns
+        -------
+        tuple
+            ID of the item and the menu it was found in, or (wx.NOT_FOUND, None)
+        """
+        menus = []
+        if name is None:
+            # search the frame's menu bar
+            frame = self.GetTopLevelParent()
+            menubar = frame.GetMenuBar() if hasattr(frame, "GetMenuBar") else None
+            if menubar is not None:
+                menus = [menu for menu, title in menubar.GetMenus()]
+        else:
+            # search the control's menu, making it if it's made when opened
+            ctrl = self.buttons[name]
+            menu = getattr(ctrl, "menu", None)
+            if callable(menu):
+                evt = wx.CommandEvent(wx.EVT_BUTTON.typeId, ctrl.drop.GetId())
+                evt.SetEventObject(ctrl.drop)
+                menu = menu(ctrl, evt)
+            if menu is not None:
+                menus = [menu]
+        # search menus (and their submenus)
+        for menu in menus:
+            id = menu.FindItem(item)
+            if id != wx.NOT_FOUND:
+                return id, menu
+
+        return wx.NOT_FOUND, None
+
+    def SetWatchdog(self, watchdog):
+        """
+        Time every callback dispatched by this ribbon with the given watchdog, to find ones 
+        which block the UI thread.
+
+        Parameters
+        ----------
+        watchdog : wx_ribbon.watchdog.RibbonWatchdog or None
+            Watchdog to use, or None to stop timing callbacks
+        """
+        self.watchdog = watchdog
+        if watchdog is not None:
+            watchdog.Start()
+
+    def GetWatchdog(self):
+        """
+        Get the watchdog timing this ribbon's callbacks, or None if there isn't one.
+        """
+        return self.watchdog
+
+    def Timed(self, key):
+        """
+        Context manager which times the code within it as a run of the given command, if this 
+        ribbon has a watchdog (otherwise does nothing).
+
+        Parameters
+        ----------
+        key : str
+            Name of the command
+        """
+        if self.watchdog is None:
+            return contextlib.nullcontext()
+
+        return self.watchdog.Time(key)
+
+    def Untimed(self):
+        """
+        Context manager within which time doesn't count towards the command currently being 
+        timed (e.g. while waiting for the user to pick from a popup menu).
+        """
+        if self.watchdog is None:
+            return contextlib.nullcontext()
+
+        return self.watchdog.Exclude()
+
+    def GetControlName(self, window):
+        """
+        Get the name (as given to `Add...`) of the control which the given window is, or is 
+        part of.
+
+        Parameters
+        ----------
+        window : wx.Window
+            Control, or a window within a control
+
+        Returns
+        -------
+        str or None
+            Name of the control, or None if the window isn't part of a control in this ribbon
+        """
+        while isinstance(window, wx.Window) and window is not self:
+            if window in self.controlNames:
+                return self.controlNames[window]
+            window = window.GetParent()
+
+    # suffixes for command names, by event type (see GetCommandName)
+    commandSuffixes = {
+        EVT_RIBBON_SWITCH.typeId: ":switch",
+        EVT_RIBBON_GALLERY.typeId: ":gallery",
+    }
+
+    def GetCommandName(self, evt):
+        """
+        Get a readable name for the command an event dispatches, used to report timings. This 
+        is the name of the control which emitted it (with ":switch" or ":gallery" appended for 
+        mode changes and gallery selections), the label of the menu item it came from, or 
+        failing that its ID.
+
+        Parameters
+        ----------
+        evt : wx.CommandEvent
+            Event being dispatched
+        """
+        obj = evt.GetEventObject()
+        # menu commands are named by their item
+        if isinstance(obj, wx.Menu):
+            item = obj.FindItemById(evt.GetId())
+            if item is not None:
+                return f"menu:{item.GetItemLabelText()}"
+        # control commands are named by their control
+        name = self.GetControlName(obj)
+        if name is not None:
+            return name + self.commandSuffixes.get(evt.GetEventType(), "")
+
+        return f"id:{evt.GetId()}"
+
+    @contextlib.contextmanager
+    def Batch(self):
+        """
+        Context manager in which changes to the ribbon (adding, removing, showing, hiding or 
+        relabelling controls) don't lay out, repaint or apply themes until the end, when 
+        everything is done once. Batches can be nested, changes are applied when the 
+        outermost one ends.
+
+        Example
+        -------
+        ```
+        with ribbon.Batch():
+            for name in oldButtons:
+                ribbon.RemoveButton(name)
+            for name in newButtons:
+                ribbon.AddButton(section="tools", name=name, ...)
+        ```
+        """
+        # start batch
+        self._batchDepth += 1
+        if self._batchDepth == 1:
+            self._themeBatch = {}
+            self.Freeze()
+        try:
+            yield self
+        finally:
+            # end batch
+            self._batchDepth -= 1
+            if self._batchDepth == 0:
+                self._flushBatch()
+
+    def IsBatching(self):
+        """
+        Is this ribbon currently batching changes (see `Batch`)?
+        """
+        return self._batchDepth > 0
+
+    def _flushBatch(self):
+        """
+        Apply everything deferred by a `Batch`, once the outermost batch has ended.
+        """
+        # stop deferring themes
+        pending, self._themeBatch = self._themeBatch or {}, None
+        # apply each deferred theme once, skipping any elements destroyed since
+        for element in pending:
+            if element:
+                element.ApplyTheme()
+        # lay out once
+        self.InvalidateLayout()
+        self.Layout()
+        self.GetTopLevelParent().Layout()
+        # repaint once
+        self.Thaw()
+        self.Refresh()
+
+    # methods used to apply each property in PostUpdate
+    updateSetters = {
+        'label': "SetLabelText",
+        'enabled': "Enable",
+        'shown': "Show",
+        'mode': "SetMode",
+        'tooltip': "SetToolTip",
+        'busy': "SetBusy",
+        'selection': "SetSelection",
+        'value': "SetValue",
+    }
+    # properties whose setters can be silent, so setting them doesn't run callbacks
+    silentProps = {"mode", "selection"}
+
+    def PostUpdate(self, ctrl, prop, value):
+        """
+        Update a property of a control in this ribbon. Safe to call from any thread: updates 
+        are queued and applied on the UI thread, all in one batch. If the same property of the 
+        same control is updated several times before the batch is applied, only the latest 
+        value is used.
+
+        Parameters
+        ----------
+        ctrl : str or wx.Window
+            Name of the control (as given to `Add...`), or the control itself
+        prop : str
+            Property to update, one of the keys of `FrameRibbon.updateSetters` (e.g. "label", 
+            "enabled", "shown", "mode", "value"). Any other name calls `Set` + the name, e.g. 
+            "range" calls `ctrl.SetRange(value)`.
+        value : object
+            Value to set the property to
+        """
+        with self._updatesLock:
+            self._updates[(ctrl, prop)] = value
+            # if a batch is already scheduled, this update will be part of it
+            if self._updatesScheduled:
+                return
+            self._updatesScheduled = True
+        # schedule batch
+        if self.updateInterval:
+            wx.CallAfter(wx.CallLater, self.updateInterval, self.FlushUpdates)
+        else:
+            wx.CallAfter(self.FlushUpdates)
+
+    def FlushUpdates(self):
+        """
+        Apply all updates posted via `PostUpdate`, in one batch. Called automatically.
+        """
+        # take queued updates
+        with self._updatesLock:
+            updates, self._updates = self._updates, {}
+            self._updatesScheduled = False
+        # do nothing if the ribbon has been destroyed since they were posted
+        if not self or not updates:
+            return
+        # apply updates
+        with self.Batch():
+            for (ctrl, prop), value in updates.items():
+                # get control from name
+                if isinstance(ctrl, str):
+                    ctrl = self.buttons.get(ctrl)
+                # skip controls which don't exist (any more)
+                if not ctrl:
+                    continue
+                # set property, carrying on with the rest of the batch if it fails
+                try:
+                    self.SetControlProperty(ctrl, prop, value)
+                except Exception:
+                    logging.exception(f"Could not set '{prop}' of {ctrl} to {value!r}")
+
+    def RequestBitmap(self, window, make, apply, placeholder, ready=False):
+        """
+        Give a window the bitmap(s) for its icon. If this ribbon is progressive and they're 
+        not ready yet, the window is given a placeholder straight away and the real bitmaps 
+        are made in idle time, windows visible on screen first. Otherwise they're made and 
+        given now.
+
+        Parameters
+        ----------
+        window : wx.Window
+            Window the bitmap is for. Requesting again for the same window replaces any 
+            request still queued (e.g. if the theme changes before it's done).
+        make : function
+            Function which makes the bitmap(s), called with no arguments
+        apply : function
+            Function which gives the bitmap(s) to the window, receives the output of `make` 
+            (or `placeholder`) as its only argument
+        placeholder : object
+            What to give `apply` until the bitmap(s) are ready, should be the same size so that 
+            the layout doesn't shift when the real bitmap(s) arrive
+        ready : bool
+            True if `make` would be instant (i.e. its bitmaps are cached), so shouldn't wait
+        """
+        # if not progressive (or nothing to wait for), apply now
+        if not self.progressive or ready:
+            self._bitmapQueue.pop(window, None)
+            apply(make())
+            return
+        # otherwise, apply placeholder and queue the real thing
+        apply(placeholder)
+        self._bitmapQueue[window] = (make, apply)
+
+    def HasPendingBitmaps(self):
+        """
+        Are there icons in this ribbon still waiting to be rendered (see `RequestBitmap`)?
+        """
+        return bool(self._bitmapQueue)
+
+    def FlushBitmaps(self):
+        """
+        Render and apply every queued bitmap now, rather than waiting for idle time.
+        """
+        with self.Batch():
+            while self._bitmapQueue:
+                window, (make, apply) = self._bitmapQueue.popitem()
+                if window:
+                    apply(make())
+
+    def Prewarm(self, themeList):
+        """
+        Prepare the icons every control in this ribbon would need in the given themes, in idle 
+        time, so that switching to any of them later doesn't have to render anything.
+
+        Parameters
+        ----------
+        themeList : list[wx_ribbon.themes.base.BaseRibbonTheme]
+            Themes to prepare for
+        """
+        # get every window in the ribbon which knows how to prepare itself (sections first)
+        windows = []
+        queue = list(self.GetChildren())
+        while queue:
+            window = queue.pop(0)
+            if hasattr(window, "Prewarm"):
+                windows.append(window)
+            queue.extend(window.GetChildren())
+        # queue each window for each theme (only once, however often this is called)
+        for theme in themeList:
+            for window in windows:
+                self._warmQueue[(window, (theme,))] = None
+
+    def PrewarmIcons(self, entries):
+        """
+        Render the given icon bitmaps in idle time, in order, so they're ready before they're 
+        needed.
+
+        Parameters
+        ----------
+        entries : list[tuple]
+            (icon, height, theme, tint, states) for each icon to render, see 
+            `RibbonIcon.Prewarm`
+        """
+        for icon, *args in entries:
+            self._warmQueue[(icon, tuple(args))] = None
+
+    def SetUsageProfile(self, profile):
+        """
+        Record which controls, sections and icons get used in a usage profile, and use what 
+        it recorded in past sessions to prepare this ribbon: the icons used before are 
+        rendered in idle time (most used first) and, if progressive, the most used controls 
+        get their icons before the others. Anything the profile doesn't mention stays lazy.
+
+        Parameters
+        ----------
+        profile : wx_ribbon.profile.RibbonUsageProfile or None
+            Profile to use, or None to stop recording
+        """
+        if self.usageProfile is not None:
+            self.usageProfile.Untrack(self)
+        self.usageProfile = profile
+        if profile is not None:
+            profile.Track(self)
+            self.PrewarmIcons(profile.GetIcons())
+
+    def GetUsageProfile(self):
+        """
+        Get the usage profile this ribbon is recording to, or None if there isn't one.
+        """
+        return self.usageProfile
+
+    def GetWindowUsage(self):
+        """
+        Get how many times each section and control in this ribbon has been used, according 
+        to its usage profile (see SetUsageProfile).
+
+        Returns
+        -------
+        dict
+            Number of uses, keyed by window (empty if there's no profile)
+        """
+        if self.usageProfile is None:
+            return {}
+        usage = {}
+        for name, sct in self.sections.items():
+            usage[sct] = self.usageProfile.sections.get(name, 0)
+        for name, ctrl in self.buttons.items():
+            usage[ctrl] = self.usageProfile.controls.get(name, 0)
+
+        return usage
+
+    def onIdle(self, evt):
+        evt.Skip()
+        # do nothing if there's nothing queued
+        if not self._bitmapQueue and not self._warmQueue:
+            return
+        deadline = time.perf_counter() + self.progressiveBudget / 1000
+        # windows visible on screen go first, then the most used (sort is stable, so 
+        # otherwise keep queue order)
+        usage = self.GetWindowUsage()
+
+        def priority(window):
+            if not window:
+                return (True, 0)
+            # windows within a control/section (e.g. a section's icon) count as their parent
+            uses = usage.get(window, usage.get(window.GetParent(), 0))
+
+            return (not window.IsShownOnScreen(), -uses)
+
+        windows = sorted(self._bitmapQueue, key=priority)
+        # render until out of time
+        for window in windows:
+            make, apply = self._bitmapQueue.pop(window)
+            # skip windows destroyed since they were queued
+            if window:
+                apply(make())
+            if time.perf_counter() > deadline:
+                break
+        # with any time left, prepare icons for other themes and from the usage profile
+        while self._warmQueue and time.perf_counter() < deadline:
+            target, args = next(iter(self._warmQueue))
+            del self._warmQueue[(target, args)]
+            # skip windows destroyed since they were queued
+            if target:
+                target.Prewarm(*args)
+        # if there's more to do, come back next idle
+        if self._bitmapQueue or self._warmQueue:
+            evt.RequestMore()
+
+    def GetReleasableWindows(self):
+        """
+        Get every window in this ribbon which holds icon bitmaps (i.e. has a `ReleaseBitmaps` 
+        method).
+        """
+        windows = []
+        queue = list(self.GetChildren())
+        while queue:
+            window = queue.pop(0)
+            if hasattr(window, "ReleaseBitmaps"):
+                windows.append(window)
+            queue.extend(window.GetChildren())
+
+        return windows
+
+    def ReleaseBitmaps(self):
+        """
+        Stop every control in this ribbon holding icon bitmaps, so they can be freed while the 
+        ribbon is hidden (see `memory.RibbonMemoryTrimmer`). Call `RestoreBitmaps` before 
+        showing it again.
+
+        Returns
+        -------
+        int
+            Approximate number of bytes freed by bitmaps which belong to controls alone (e.g. 
+            a gallery's rendered items). Icon bitmaps are shared with the icons' caches, so 
+            are only freed once those are cleared too (see `RibbonIcon.ClearCache`).
+        """
+        nbytes = 0
+        with self.Batch():
+            # anything queued would only bring bitmaps back
+            self._bitmapQueue.clear()
+            self._warmQueue.clear()
+            for window in self.GetReleasableWindows():
+                nbytes += window.ReleaseBitmaps() or 0
+        self.bitmapsReleased = True
+
+        return nbytes
+
+    def RestoreBitmaps(self):
+        """
+        Give every control back the icon bitmaps removed by `ReleaseBitmaps`, rendering any 
+        which aren't cached (in idle time, if this ribbon is progressive).
+        """
+        if not self.bitmapsReleased:
+            return
+        self.bitmapsReleased = False
+        with self.Batch():
+            for window in self.GetReleasableWindows():
+                window.ApplyTheme()
+
+    def SetAutoTheme(self, auto=True, light=None, dark=None):
+        """
+        Follow the system's light/dark appearance, switching theme whenever it changes. Icons 
+        for both themes are prepared in idle time, so switching doesn't have to render 
+        anything.
+
+        Parameters
+        ----------
+        auto : bool
+            True to follow the system appearance, False to stop
+        light : wx_ribbon.themes.base.BaseRibbonTheme or None
+            Theme to use in light mode, leave as None to use RB_THEME_LIGHT
+        dark : wx_ribbon.themes.base.BaseRibbonTheme or None
+            Theme to use in dark mode, leave as None to use RB_THEME_DARK
+        """
+        if not auto:
+            self.autoThemes = None
+            self.Unbind(wx.EVT_SYS_COLOUR_CHANGED, handler=self.onSysColourChanged)
+            return
+        # bind only if not already following
+        if self.autoThemes is None:
+            self.Bind(wx.EVT_SYS_COLOUR_CHANGED, self.onSysColourChanged)
+        self.autoThemes = (light or themes.RB_THEME_LIGHT, dark or themes.RB_THEME_DARK)
+        # switch to the current appearance now, and prepare for the other one
+        self.ApplyAutoTheme()
+
+    def ApplyAutoTheme(self):
+        """
+        Switch to the light or dark theme given to SetAutoTheme, according to the current 
+        system appearance.
+        """
+        # do nothing if not following the system, or destroyed
+        if self.autoThemes is None or not self:
+            return
+        light, dark = self.autoThemes
+        theme = dark if self.IsSystemDark() else light
+        # switch theme
+        if theme is not self.theme:
+            with self.Batch():
+                self.SetTheme(theme)
+        # make sure both themes are ready (controls added since are prepared too)
+        self.Prewarm((light, dark))
+
+    @staticmethod
+    def IsSystemDark():
+        """
+        Is the system currently using a dark appearance?
+        """
+        # use appearance if available (wxPython 4.1+)
+        if hasattr(wx.SystemSettings, "GetAppearance"):
+            return wx.SystemSettings.GetAppearance().IsDark()
+        # otherwise, guess from the window background
+        return wx.SystemSettings.GetColour(wx.SYS_COLOUR_WINDOW).GetLuminance() < 0.5
+
+    def onSysColourChanged(self, evt):
+        evt.Skip()
+        # switch once the system has finished changing colours
+        wx.CallAfter(self.ApplyAutoTheme)
+
+    # methods used to create each kind of item in ApplyModel
+    modelCreators = {
+        'button': "AddButton",
+        'dropdown': "AddDropdownButton",
+        'switch': "AddSwitchCtrl",
+        'gallery': "AddGallery",
+    }
+
+    def ApplyModel(self, model):
+        """
+        Make this ribbon match a model (see `wx_ribbon.model`). Only the differences from the 
+        last model applied are changed, all in one batch, so applying a model which differs by 
+        one property just updates that property. A ribbon managed this way should only be 
+        changed by applying models.
+
+        Parameters
+        ----------
+        model : wx_ribbon.model.RibbonModel
+            Model to apply. It's copied, so can be changed afterwards and applied again.
+
+        Returns
+        -------
+        list[tuple]
+            The changes which were made (see `RibbonModel.Diff`)
+        """
+        # get changes since last model
+        changes = (self.model or RibbonModel()).Diff(model)
+        added = set()
+        with self.Batch():
+            for kind, *args in changes:
+                if kind == "removeItem":
+                    self.RemoveButton(*args)
+                elif kind == "removeSection":
+                    self.RemoveSection(*args)
+                elif kind == "setSection":
+                    name, prop, value = args
+                    sct = self.sections[name]
+                    if prop == "label":
+                        sct.label.SetLabel(value or "")
+                    elif prop == "icon":
+                        sct.SetIcon(value)
+                        sct.iconCtrl.Show(value is not None)
+                        self.GetThemeBatch()[sct] = None
+                elif kind == "setItem":
+                    name, prop, value = args
+                    self.ApplyModelProperty(self.buttons[name], prop, value)
+                elif kind == "addSection":
+                    section, = args
+                    self.AddSection(section.name, label=section.label, icon=section.icon)
+                elif kind == "addItem":
+                    name, item = args
+                    ctrl = getattr(self.sections[name], self.modelCreators[item.kind])(
+                        item.name, **item.GetArgs()
+                    )
+                    if not item.enabled:
+                        ctrl.Enable(False)
+                    if not item.shown:
+                        ctrl.Show(False)
+                    added.add(item.name)
+            # link dependants of any switch which (or whose dependants) were just made
+            for item in model.GetItems():
+                depends = item.options.get("depends", ())
+                if not depends:
+                    continue
+                if item.name in added or any(ctrl in added for ctrl, mode, action in depends):
+                    switch = self.buttons[item.name]
+                    switch.ClearDependants()
+                    for ctrl, mode, action in depends:
+                        switch.AddDependant(self.buttons[ctrl], mode, action=action)
+        # remember model, to diff against next time
+        self.model = model.Copy()
+
+        return changes
+
+    def ApplyModelProperty(self, ctrl, prop, value):
+        """
+        Set one property of a control from a model (see `ApplyModel`).
+        """
+        # a mode of None means the model doesn't set one, so leave the switch as it is
+        if prop == "mode" and value is None:
+            return
+        # icons are drawn when the theme is applied
+        if prop == "icon":
+            ctrl.SetIcon(value)
+            batch = self.GetThemeBatch()
+            if batch is None:
+                ctrl.ApplyTheme()
+            else:
+                batch[ctrl] = None
+            return
+        # everything else has a setter
+        self.SetControlProperty(ctrl, prop, value)
+
+    def SetControlProperty(self, ctrl, prop, value):
+        """
+        Set one property of a control via its setter (see `updateSetters`). Modes and 
+        selections are set silently, so syncing them doesn't run callbacks as if the user had 
+        clicked.
+
+        Parameters
+        ----------
+        ctrl : wx.Window
+            Control to update
+        prop : str
+            Property to set
+        value : object
+            Value to set the property to
+        """
+        setter = getattr(ctrl, self.updateSetters.get(prop, "Set" + prop[:1].upper() + prop[1:]))
+        if prop in self.silentProps:
+            setter(value, silent=True)
+        else:
+            setter(value)
+
+    def Layout(self):
+        # if batching changes, lay out once the batch is done
+        if self._batchDepth:
+            return True
+        # use flat layout engine if there is one
+        if self.flatLayout is not None:
+            self.flatLayout.Layout()
+            return True
+
+        return wx.Panel.Layout(self)
+
+    def InvalidateLayout(self, window=None):
+        """
+        Mark this ribbon's layout as needing recalculating, e.g. after showing, hiding or 
+        relabelling a control. Only needed with RB_LAYOUT_FLAT, as sizers always recalculate.
+
+        Parameters
+        ----------
+        window : wx.Window or None
+            Window whose size may have changed, or None if unknown
+        """
+        if self.flatLayout is not None:
+            self.flatLayout.Invalidate(window)
+
     def AddSection(self, name, label=None, icon=None):
         """
         Add a section to the ribbon.
@@ -53,9 +1026,53 @@ class FrameRibbon(wx.Panel, RibbonThemeMixin):
         )
         # add section to sizer
         self.sizer.Add(sct, border=0, flag=wx.EXPAND | wx.ALL)
+        # if using flat layout, section's sizers are only used to store item order
+        if self.flatLayout is not None:
+            sct.SetAutoLayout(False)
+        self.InvalidateLayout()
 
         return sct
 
+    def RemoveSection(self, name):
+        """
+        Remove a section, and all the controls within it, from the ribbon.
+
+        Parameters
+        ----------
+        name : str
+            Name of the section to remove
+        """
+        sct = self.sections.pop(name)
+        # remove buttons
+        for btnName in list(sct.buttons):
+            self.RemoveButton(btnName)
+        # destroy section (this also removes it from the sizer)
+        sct.Destroy()
+        # relayout
+        self.InvalidateLayout()
+        self.Layout()
+
+    def RemoveButton(self, name):
+        """
+        Remove a control from the ribbon.
+
+        Parameters
+        ----------
+        name : str
+            Name of the control to remove
+        """
+        btn = self.buttons.pop(name)
+        self.controlNames.pop(btn, None)
+        # remove from section
+        for sct in self.sections.values():
+            sct.buttons.pop(name, None)
+        # destroy control (this also removes it from the sizer, and stops dispatching its 
+        # commands - see RegisterWindowCommand)
+        btn.Destroy()
+        # relayout
+        self.InvalidateLayout()
+        self.Layout()
+
     def AddSeparator(self):
         """
         Add a vertical line.
@@ -68,6 +1085,7 @@ class FrameRibbon(wx.Panel, RibbonThemeMixin):
         else:
             # on non-Windows, just use a big space
             self.sizer.AddSpacer(36)
+        self.InvalidateLayout()
 
     def AddSpacer(self, size=6, section=None):
         """
@@ -80,6 +1098,7 @@ class FrameRibbon(wx.Panel, RibbonThemeMixin):
             sizer = self.sections[section].sizer
         # add space
         sizer.AddSpacer(size=size)
+        self.InvalidateLayout()
 
     def AddStretchSpacer(self, prop=1, section=None):
         """
@@ -92,6 +1111,7 @@ class FrameRibbon(wx.Panel, RibbonThemeMixin):
             sizer = self.sections[section].sizer
         # add space
         sizer.AddStretchSpacer(prop=prop)
+        self.InvalidateLayout()
 
 
 class FrameRibbonSection(wx.Panel, RibbonThemeMixin):
@@ -107,6 +1127,9 @@ class FrameRibbonSection(wx.Panel, RibbonThemeMixin):
     icon : str or None
         File stem of the icon for the section's label
     """
+    # palette entries used by ApplyTheme
+    themeKeys = {"text", "crust", "icons"}
+
     def __init__(self, parent, label=None, icon=None):
         wx.Panel.__init__(self, parent)
         self.ribbon = parent
@@ -159,14 +1182,51 @@ class FrameRibbonSection(wx.Panel, RibbonThemeMixin):
         """
         self.icon = icon
     
+    def ReleaseBitmaps(self):
+        """
+        Drop this section's label icon until its theme is next applied.
+        """
+        self.iconCtrl.SetBitmap(wx.NullBitmap)
+
+    def Prewarm(self, theme):
+        """
+        Prepare this section's icon for the given theme, so applying it later is instant.
+
+        Parameters
+        ----------
+        theme : wx_ribbon.themes.base.BaseRibbonTheme
+            Theme to prepare for
+        """
+        if self.icon is not None:
+            self.icon.GetBitmap(height=12, style=theme.icons)
+
+    def GetShownIcons(self):
+        """
+        Get the icons this section shows, as they're shown (used by usage profiles).
+
+        Returns
+        -------
+        list[tuple]
+            (icon, height, tint, states) for the label's icon
+        """
+        if self.icon is None:
+            return []
+
+        return [(self.icon, 12, None, False)]
+
     def ApplyTheme(self):
         RibbonThemeMixin.ApplyTheme(self)
         # update label
         self.label.SetForegroundColour(self.theme.text)
         # also update icon
         if self.icon is not None:
-            self.iconCtrl.SetBitmap(
-                self.icon.GetBitmap(height=12, style=self.theme.icons)
+            icon, style = self.icon, self.theme.icons
+            self.ribbon.RequestBitmap(
+                self.iconCtrl,
+                make=lambda: icon.GetBitmap(height=12, style=style),
+                apply=self.iconCtrl.SetBitmap,
+                placeholder=icons.RibbonIcon.GetPlaceholder(height=12, color=self.theme.overlay),
+                ready=icon.IsCached(height=12, style=style),
             )
 
         self.Update()
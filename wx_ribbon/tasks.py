@@ -0,0 +1,204 @@
+import asyncio
+import inspect
+import logging
+import threading
+import wx
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+
+__all__ = [
+    "RibbonTask",
+    "RB_TASK_THREAD",
+    "RB_TASK_PROCESS",
+    "RB_TASK_ASYNC",
+    "RB_RECLICK_DROP",
+    "RB_RECLICK_QUEUE",
+]
+
+
+# constants for where to run a task
+RB_TASK_THREAD = 0
+RB_TASK_PROCESS = 1
+RB_TASK_ASYNC = 2
+# constants for what to do when a busy task's control is clicked again
+RB_RECLICK_DROP = 0
+RB_RECLICK_QUEUE = 1
+
+
+class _TaskRunners:
+    """
+    Pools and event loop shared by all RibbonTasks, created the first time they're needed.
+    Should not need to be used outside of `tasks.py`
+    """
+    threads = None
+    processes = None
+    loop = None
+
+    @classmethod
+    def Submit(cls, executor, function, *args):
+        """
+        Start running a function, returning a concurrent.futures.Future for its result.
+        """
+        if executor == RB_TASK_THREAD:
+            if cls.threads is None:
+                cls.threads = ThreadPoolExecutor(thread_name_prefix="wx_ribbon")
+            return cls.threads.submit(function, *args)
+        if executor == RB_TASK_PROCESS:
+            if cls.processes is None:
+                cls.processes = ProcessPoolExecutor()
+            return cls.processes.submit(function, *args)
+        if executor == RB_TASK_ASYNC:
+            if cls.loop is None:
+                # run one event loop in the background for all async callbacks
+                cls.loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=cls.loop.run_forever, name="wx_ribbon-async", daemon=True
+                ).start()
+            return asyncio.run_coroutine_threadsafe(function(*args), cls.loop)
+        # error otherwise
+        raise ValueError(
+            f"Unrecognised task executor `{executor}`, must be one of RB_TASK_THREAD, "
+            f"RB_TASK_PROCESS or RB_TASK_ASYNC."
+        )
+
+
+class RibbonTask:
+    """
+    Wraps a ribbon callback so that it runs off the UI thread. While it's running, the control
+    which started it is shown as busy, and the result is passed back to `done` on the UI thread.
+
+    Pass a RibbonTask as the `callback` for any ribbon control, e.g.
+    `ribbon.AddButton(..., callback=RibbonTask(slowFunction, done=onFinished))`. Callbacks
+    which are `async def` functions are wrapped in a RibbonTask automatically.
+
+    Parameters
+    ----------
+    function : function
+        Function to run. For RB_TASK_THREAD and RB_TASK_ASYNC it receives a copy of the event,
+        for RB_TASK_PROCESS it receives no arguments (as events can't be sent to another
+        process) and must be picklable, i.e. defined at the top level of a module.
+    executor : int
+        Where to run the function, one of:
+        - RB_TASK_THREAD: In a shared thread pool
+        - RB_TASK_PROCESS: In a shared process pool
+        - RB_TASK_ASYNC: As a coroutine in a shared background event loop (used automatically
+          for `async def` functions)
+    reclick : int
+        What to do if the control is clicked while the task is still running, one of:
+        - RB_RECLICK_DROP: Ignore the click (the control is disabled while busy)
+        - RB_RECLICK_QUEUE: Run the task again once the current run finishes
+    done : function or None
+        Function to call on the UI thread with the task's return value once it finishes
+    """
+    def __init__(
+            self,
+            function,
+            executor=RB_TASK_THREAD,
+            reclick=RB_RECLICK_DROP,
+            done=None
+    ):
+        # coroutine functions always run in the event loop
+        if inspect.iscoroutinefunction(function):
+            executor = RB_TASK_ASYNC
+        self.function = function
+        self.executor = executor
+        self.reclick = reclick
+        self.done = done
+        # future for the current run (if running)
+        self.future = None
+        # control showing the current run as busy
+        self.ctrl = None
+        # queued runs, as (args, ctrl) pairs
+        self.queue = []
+
+    def __call__(self, evt):
+        # get args and control from event
+        args = self.GetArgs(evt)
+        ctrl = evt.GetEventObject()
+        # if already running, queue or drop according to reclick policy
+        if self.IsBusy():
+            if self.reclick == RB_RECLICK_QUEUE:
+                self.queue.append((args, ctrl))
+            return
+        # start running
+        self.Start(args, ctrl)
+
+    def IsBusy(self):
+        """
+        Is this task currently running?
+        """
+        return self.future is not None
+
+    def GetArgs(self, evt):
+        """
+        Get the arguments to run the function with for a given event.
+        """
+        # events can't be sent to another process
+        if self.executor == RB_TASK_PROCESS:
+            return ()
+        # the event is deleted once handled, so send a copy
+        return (evt.Clone(),)
+
+    def Start(self, args, ctrl=None):
+        """
+        Start running the function.
+
+        Parameters
+        ----------
+        args : tuple
+            Arguments to run the function with
+        ctrl : wx.Window or None
+            Control to show as busy while the function is running
+        """
+        # show control as busy
+        self.SetBusy(ctrl)
+        # start running
+        self.future = _TaskRunners.Submit(self.executor, self.function, *args)
+        # once done, handle on the UI thread
+        self.future.add_done_callback(
+            lambda future: wx.CallAfter(self.onDone, future)
+        )
+
+    def SetBusy(self, ctrl):
+        """
+        Show the given control as busy, and the previous busy control as no longer busy.
+
+        Parameters
+        ----------
+        ctrl : wx.Window or None
+            Control to show as busy, or None to just clear the previous one
+        """
+        # clear previous control
+        if self.ctrl is not None and self.ctrl is not ctrl:
+            if self.ctrl and hasattr(self.ctrl, "SetBusy"):
+                self.ctrl.SetBusy(False)
+        # set new control
+        if isinstance(ctrl, wx.Window) and hasattr(ctrl, "SetBusy"):
+            ctrl.SetBusy(True, disable=self.reclick == RB_RECLICK_DROP)
+            self.ctrl = ctrl
+        else:
+            self.ctrl = None
+
+    def onDone(self, future):
+        self.future = None
+        # get result
+        try:
+            result = future.result()
+        except Exception as err:
+            logging.error(f"Ribbon task {self.function} failed. Reason: {err}")
+        else:
+            # pass result to done function (an error there shouldn't leave the control busy)
+            if self.done is not None:
+                try:
+                    self.done(result)
+                except Exception as err:
+                    logging.error(
+                        f"Done function {self.done} of ribbon task {self.function} failed. "
+                        f"Reason: {err}"
+                    )
+        # run next queued run, or mark as no longer busy
+        if self.queue:
+            args, ctrl = self.queue.pop(0)
+            self.Start(args, ctrl)
+        else:
+            self.SetBusy(None)
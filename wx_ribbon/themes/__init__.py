@@ -4,6 +4,10 @@ import importlib.metadata
 
 __all__ = [
     "LoadPluginThemes",
+    "LoadThemeFile",
+    "ReloadThemeFile",
+    "RibbonThemeWatcher",
+    "RibbonThemeManager",
     "RB_THEME_LIGHT",
     "RB_THEME_DARK",
 ]
@@ -67,4 +71,8 @@ def LoadPluginThemes():
 
 # load the built-in themes
 from .light import LightRibbonTheme
-from .dark import DarkRibbonTheme
\ No newline at end of file
+from .dark import DarkRibbonTheme
+# load functions for file-based themes
+from .files import LoadThemeFile, ReloadThemeFile, RibbonThemeWatcher
+# app-wide theme management
+from .manager import RibbonThemeManager
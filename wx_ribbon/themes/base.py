@@ -13,6 +13,15 @@ __all__ = [
 class BaseRibbonTheme:
     # name to refer to the theme by (theme will be accessible as `wx_ribbon.themes.RB_THEME_...`)
     name = None
+    # names of all the palette entries a theme can define
+    palette = (
+        "icons",
+        "overlay", "crust", "mantle", "base",
+        "text", "hltext",
+        "hlprimary", "hlsecondary", "hltertiary", "hlquaternary",
+    )
+    # file this theme was loaded from, if it was loaded from a file (see `themes.LoadThemeFile`)
+    file = None
     # should we use light-mode or dark-mode icons for this theme?
     icons = RB_ICONSTYLE_LIGHT
     # four background shades
@@ -65,6 +74,8 @@ class BaseRibbonTheme:
 
 class RibbonThemeMixin:
     theme = None
+    # palette entries which this element uses in ApplyTheme
+    themeKeys = {"text", "overlay", "crust"}
 
     def SetTheme(self, theme):
         """
@@ -85,14 +96,62 @@ class RibbonThemeMixin:
             return
         # update theme reference
         self.theme = toTheme
-        # apply new theme
-        self.ApplyTheme()
+        # apply new theme (or, if batching changes, once the batch is done)
+        batch = self.GetThemeBatch()
+        if batch is None:
+            self.ApplyTheme()
+        else:
+            batch[self] = None
         # cascade down to children
         if hasattr(self, "GetChildren"):
             for child in self.GetChildren():
                 if isinstance(child, RibbonThemeMixin):
                     child.SetTheme(theme)    
+
+    def ApplyThemeChanges(self, keys):
+        """
+        Re-apply the current theme only if it has changed in a way which affects this element, 
+        then do the same for any children sharing this element's theme. Use this rather than 
+        SetTheme when the current theme has been modified in place (e.g. reloaded from a file).
+
+        Parameters
+        ----------
+        keys : set[str]
+            Names of the palette entries which have changed (see `BaseRibbonTheme.palette`)
+        """
+        # if this element uses any of the changed entries, re-apply theme
+        if self.themeKeys & set(keys):
+            batch = self.GetThemeBatch()
+            if batch is None:
+                self.ApplyTheme()
+            else:
+                batch[self] = None
+        # cascade down to children with the same theme
+        if hasattr(self, "GetChildren"):
+            for child in self.GetChildren():
+                if isinstance(child, RibbonThemeMixin) and child.theme is self.theme:
+                    child.ApplyThemeChanges(keys)
     
+    def GetThemeBatch(self):
+        """
+        If this element or one of its parents is batching changes (see `FrameRibbon.Batch`), 
+        get the dict in which to store elements whose theme should be applied once the batch 
+        is done.
+
+        Returns
+        -------
+        dict or None
+            Elements awaiting their theme (as keys), or None if not batching
+        """
+        window = self
+        while window is not None:
+            batch = getattr(window, "_themeBatch", None)
+            if batch is not None:
+                return batch
+            window = window.GetParent() if hasattr(window, "GetParent") else None
+
+        return None
+
     def ApplyTheme(self):
         """
         Use this element's current theme to style itself.
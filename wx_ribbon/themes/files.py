@@ -0,0 +1,325 @@
+import json
+import logging
+import weakref
+import wx
+from pathlib import Path
+from .base import BaseRibbonTheme, RB_ICONSTYLE_LIGHT, RB_ICONSTYLE_DARK
+
+try:
+    import tomllib
+except ImportError:
+    # tomllib is only in the standard library from Python 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+
+__all__ = [
+    "ReadThemeFile",
+    "LoadThemeFile",
+    "ReloadThemeFile",
+    "RibbonThemeWatcher",
+]
+
+
+# values which can be used for the `icons` entry of a theme file
+_iconStyles = {
+    "light": RB_ICONSTYLE_LIGHT,
+    "dark": RB_ICONSTYLE_DARK,
+}
+
+
+def ReadThemeFile(file):
+    """
+    Read the values from a theme file, without creating a theme from them.
+
+    A theme file is a TOML or JSON file containing any of the palette entries from
+    `BaseRibbonTheme.palette`, e.g.
+
+    ```toml
+    name = "Solarized"
+    inherits = "DARK"
+    icons = "dark"
+    crust = "#002b36"
+    text = "#eee8d5"
+    ```
+
+    Parameters
+    ----------
+    file : str or pathlib.Path
+        Path to a .toml or .json file
+
+    Returns
+    -------
+    dict
+        Values from the file, with `icons` converted to an RB_ICONSTYLE_... constant
+    """
+    file = Path(file)
+    # parse according to file extension
+    if file.suffix.lower() == ".toml":
+        if tomllib is None:
+            raise ImportError(
+                f"Could not read theme file {file} as reading TOML files requires Python 3.11+ "
+                f"or the `tomli` package."
+            )
+        with file.open("rb") as f:
+            values = tomllib.load(f)
+    elif file.suffix.lower() == ".json":
+        with file.open("r", encoding="utf-8") as f:
+            values = json.load(f)
+    else:
+        raise ValueError(
+            f"Unrecognised theme file type `{file.suffix}`, must be one of .toml or .json"
+        )
+    # make sure we got a table
+    if not isinstance(values, dict):
+        raise ValueError(f"Theme file {file} should contain a table of palette entries.")
+    # convert icon style from string if needed
+    if isinstance(values.get("icons"), str):
+        if values['icons'].lower() not in _iconStyles:
+            raise ValueError(
+                f"Unrecognised icon style `{values['icons']}` in theme file {file}, must be "
+                f"one of 'light' or 'dark'."
+            )
+        values['icons'] = _iconStyles[values['icons'].lower()]
+    # warn about any unused values
+    for key in values:
+        if key not in BaseRibbonTheme.palette and key not in ("name", "inherits"):
+            logging.warning(f"Unrecognised entry `{key}` in theme file {file} will be ignored.")
+
+    return values
+
+
+def LoadThemeFile(file):
+    """
+    Create a theme from a TOML or JSON file (see `ReadThemeFile` for the format). If the file
+    gives a name, the theme will be available as a `themes.RB_THEME_...` constant like any
+    other theme. The name can't be that of a theme which wasn't loaded from a file (e.g. a
+    built-in theme), as that would replace its constant.
+
+    Parameters
+    ----------
+    file : str or pathlib.Path
+        Path to a .toml or .json file
+
+    Returns
+    -------
+    type[BaseRibbonTheme]
+        The created theme
+    """
+    # read values
+    values = ReadThemeFile(file)
+    # get the theme to inherit from
+    parent = _getParentTheme(values, file)
+    # refuse to replace the constant of a theme which didn't come from a file
+    existing = _getNamedTheme(values.get("name"))
+    if existing is not None and existing.__dict__.get("file") is None:
+        raise ValueError(
+            f"Theme file {file} can't be named `{values['name']}` as that would replace the "
+            f"existing theme of the same name."
+        )
+    # get attributes for the new class
+    attrs = {
+        key: values[key] for key in BaseRibbonTheme.palette if key in values
+    }
+    attrs['name'] = values.get("name")
+    attrs['file'] = Path(file)
+    # create theme class (this registers it as a constant)
+    clsName = "FileRibbonTheme"
+    if attrs['name']:
+        clsName = attrs['name'].title().replace(" ", "") + "RibbonTheme"
+    theme = type(clsName, (parent,), attrs)
+
+    return theme
+
+
+def _getNamedTheme(name):
+    """
+    Get the theme registered as a constant under the given name, or None if there isn't one.
+    """
+    from wx_ribbon import themes
+    from wx_ribbon.themes import ThemeConstantHandler
+    if not name:
+        return None
+
+    return getattr(themes, ThemeConstantHandler.prefix + name.upper().replace(" ", "_"), None)
+
+
+def _getParentTheme(values, file):
+    """
+    Get the theme which a theme file's values inherit from.
+    """
+    # inherit from the base theme if not specified
+    if not values.get("inherits"):
+        return BaseRibbonTheme
+    # get theme from its constant
+    parent = _getNamedTheme(values['inherits'])
+    if parent is None:
+        raise ValueError(
+            f"Theme file {file} inherits from unknown theme `{values['inherits']}`."
+        )
+
+    return parent
+
+
+def _getThemeFiles(theme):
+    """
+    Get the files a theme's values come from: its own file followed by those of any themes it
+    inherits from which were also loaded from files.
+    """
+    return [
+        Path(cls.__dict__['file']) for cls in theme.__mro__
+        if cls.__dict__.get("file") is not None
+    ]
+
+
+def ReloadThemeFile(theme, file=None, reloaded=None):
+    """
+    Update a theme in place from its file, returning the names of any palette entries which
+    changed. The inheritance chain is re-resolved too: if the file now inherits from a
+    different theme the theme is re-parented, and any themes it inherits from which were
+    loaded from files are reloaded first, so edits to them also come through.
+
+    Parameters
+    ----------
+    theme : type[BaseRibbonTheme]
+        Theme to update, usually created by `LoadThemeFile`
+    file : str or pathlib.Path or None
+        File to reload from, leave as None to use the file the theme was loaded from
+    reloaded : dict or None
+        If given, the names of the changed palette entries of every theme reloaded (this one
+        and any it inherits from) are added to this dict, keyed by theme
+
+    Returns
+    -------
+    set[str]
+        Names of the palette entries whose values changed
+    """
+    # get file
+    if file is None:
+        file = theme.file
+    # read values
+    values = ReadThemeFile(file)
+    # get the theme to inherit from, refusing to inherit from itself
+    parent = _getParentTheme(values, file)
+    if issubclass(parent, theme):
+        raise ValueError(
+            f"Theme file {file} can't inherit from `{values['inherits']}` as it inherits from "
+            f"this theme."
+        )
+    # note current values, to compare once everything is reloaded
+    before = {key: getattr(theme, key) for key in BaseRibbonTheme.palette}
+    # reload the parent (and so on up the chain) if it was also loaded from a file
+    if parent.__dict__.get("file") is not None:
+        ReloadThemeFile(parent, reloaded=reloaded)
+    # re-parent if the theme to inherit from has changed
+    if theme.__bases__ != (parent,):
+        theme.__bases__ = (parent,)
+    # update own values, with entries removed from the file going back to the inherited value
+    for key in BaseRibbonTheme.palette:
+        if key in values:
+            setattr(theme, key, values[key])
+        elif key in theme.__dict__:
+            delattr(theme, key)
+    # get the entries whose values changed, whether set here or inherited
+    changed = {
+        key for key in BaseRibbonTheme.palette if getattr(theme, key) != before[key]
+    }
+    if reloaded is not None:
+        reloaded[theme] = changed
+
+    return changed
+
+
+class RibbonThemeWatcher:
+    """
+    Watches the file a theme was loaded from (and those of any themes it inherits from) and,
+    whenever one is saved, reloads the theme and re-applies only the palette entries which
+    changed to any ribbons using it, a theme it inherits from or a theme inheriting from it.
+
+    Parameters
+    ----------
+    theme : type[BaseRibbonTheme]
+        Theme to watch, must have been created by `LoadThemeFile`
+    ribbons : list[wx_ribbon.FrameRibbon] or None
+        Ribbons to update when the theme changes (more can be added via `AddRibbon`). Leave 
+        as None to update every ribbon in the app which uses the theme.
+    interval : int
+        How often (in ms) to check the file for changes
+    """
+    def __init__(self, theme, ribbons=None, interval=500):
+        self.theme = theme
+        # store ribbons weakly so watching doesn't keep them alive
+        self.ribbons = None
+        if ribbons is not None:
+            self.ribbons = weakref.WeakSet(ribbons)
+        # get starting modified time
+        self.mtime = self.GetModifiedTime()
+        # start checking for changes
+        self.timer = wx.Timer()
+        self.timer.Bind(wx.EVT_TIMER, self.onTimer)
+        self.timer.Start(interval)
+
+    def AddRibbon(self, ribbon):
+        """
+        Update the given ribbon when the theme changes.
+
+        Parameters
+        ----------
+        ribbon : wx_ribbon.FrameRibbon
+            Ribbon to update
+        """
+        if self.ribbons is None:
+            self.ribbons = weakref.WeakSet()
+        self.ribbons.add(ribbon)
+
+    def GetModifiedTime(self):
+        """
+        Get the last modified times of the theme file and the files of any themes it inherits 
+        from (or None if any can't be found).
+        """
+        try:
+            return tuple(file.stat().st_mtime for file in _getThemeFiles(self.theme))
+        except OSError:
+            return None
+
+    def Stop(self):
+        """
+        Stop watching the theme file.
+        """
+        self.timer.Stop()
+
+    def onTimer(self, evt=None):
+        # do nothing if the file hasn't changed
+        mtime = self.GetModifiedTime()
+        if mtime is None or mtime == self.mtime:
+            return
+        self.mtime = mtime
+        # reload theme (and any it inherits from which came from files)
+        reloaded = {}
+        try:
+            changed = ReloadThemeFile(self.theme, reloaded=reloaded)
+        except Exception as err:
+            # file may be mid-edit, so keep the current values until it's saved again
+            logging.error(f"Failed to reload theme file {self.theme.file}. Reason: {err}")
+            return
+        # do nothing if no values changed
+        if not any(reloaded.values()):
+            return
+        logging.debug(f"Reloaded theme file {self.theme.file}, changed: {sorted(changed)}")
+        # get ribbons to update
+        ribbons = self.ribbons
+        if ribbons is None:
+            from .manager import RibbonThemeManager
+            ribbons = RibbonThemeManager.GetRibbons()
+        # apply changes to each ribbon using a reloaded theme, or one which inherits from one
+        for ribbon in list(ribbons):
+            # skip ribbons whose window has been destroyed
+            if not ribbon:
+                continue
+            keys = set()
+            for cls in getattr(ribbon.theme, "__mro__", ()):
+                keys |= reloaded.get(cls, set())
+            if keys:
+                ribbon.ApplyThemeChanges(keys)
@@ -0,0 +1,154 @@
+import weakref
+import wx
+
+
+__all__ = [
+    "RibbonThemeManager",
+]
+
+
+class RibbonThemeManager:
+    """
+    Keeps track of every FrameRibbon in the app, so they can all be switched to a new theme at
+    once (e.g. when the OS switches between light and dark mode). Ribbons register themselves
+    when created and are held weakly, so the manager never keeps a ribbon alive.
+
+    Ribbons which are hidden or in a minimized frame when the theme changes are skipped, and
+    the theme is applied to them when they (or their frame) are next shown.
+    """
+    # app-wide theme (None until SetTheme is first called)
+    theme = None
+    # all live ribbons
+    ribbons = weakref.WeakSet()
+    # ribbons which were hidden when the theme last changed
+    pending = weakref.WeakSet()
+    # frames whose show/iconize events are being watched
+    frames = weakref.WeakSet()
+
+    @classmethod
+    def Register(cls, ribbon):
+        """
+        Start tracking a ribbon. Called automatically by FrameRibbon.
+
+        Parameters
+        ----------
+        ribbon : wx_ribbon.FrameRibbon
+            Ribbon to track
+        """
+        cls.ribbons.add(ribbon)
+        # apply pending themes when the ribbon itself is shown (its frame is watched as needed)
+        ribbon.Bind(wx.EVT_SHOW, cls.onRibbonShown)
+
+    @classmethod
+    def Unregister(cls, ribbon):
+        """
+        Stop tracking a ribbon, so it's unaffected by app-wide theme changes.
+
+        Parameters
+        ----------
+        ribbon : wx_ribbon.FrameRibbon
+            Ribbon to stop tracking
+        """
+        cls.ribbons.discard(ribbon)
+        cls.pending.discard(ribbon)
+        ribbon.Unbind(wx.EVT_SHOW, handler=cls.onRibbonShown)
+
+    @classmethod
+    def GetRibbons(cls):
+        """
+        Get all tracked ribbons which still exist.
+
+        Returns
+        -------
+        list[wx_ribbon.FrameRibbon]
+            Live ribbons
+        """
+        return [ribbon for ribbon in list(cls.ribbons) if ribbon]
+
+    @classmethod
+    def GetTheme(cls):
+        """
+        Get the app-wide theme, or None if one hasn't been set.
+        """
+        return cls.theme
+
+    @classmethod
+    def SetTheme(cls, theme):
+        """
+        Switch every ribbon in the app to the given theme. Visible ribbons switch straight away
+        (each in a single batch), hidden ones switch when they're next shown. Ribbons created 
+        with their own theme keep it, unless created with `followAppTheme=True`.
+
+        Parameters
+        ----------
+        theme : wx_ribbon.themes.base.BaseRibbonTheme
+            Theme to use
+        """
+        cls.theme = theme
+        for ribbon in cls.GetRibbons():
+            # skip ribbons which keep their own theme
+            if not ribbon.followAppTheme:
+                continue
+            if cls.IsVisible(ribbon):
+                cls.ApplyTo(ribbon)
+            else:
+                # apply when next shown
+                cls.pending.add(ribbon)
+                cls.WatchFrame(ribbon.GetTopLevelParent())
+
+    @classmethod
+    def IsVisible(cls, ribbon):
+        """
+        Is the given ribbon currently visible on screen (i.e. shown, and not in a minimized
+        frame)?
+        """
+        frame = ribbon.GetTopLevelParent()
+        if isinstance(frame, wx.TopLevelWindow) and frame.IsIconized():
+            return False
+
+        return ribbon.IsShownOnScreen()
+
+    @classmethod
+    def ApplyTo(cls, ribbon):
+        """
+        Apply the app-wide theme to one ribbon.
+        """
+        cls.pending.discard(ribbon)
+        if ribbon.theme is not cls.theme:
+            with ribbon.Batch():
+                ribbon.SetTheme(cls.theme)
+
+    @classmethod
+    def ApplyPending(cls):
+        """
+        Apply the app-wide theme to any ribbons which were hidden when it was set, but are now
+        visible.
+        """
+        for ribbon in list(cls.pending):
+            if ribbon and cls.IsVisible(ribbon):
+                cls.ApplyTo(ribbon)
+
+    @classmethod
+    def WatchFrame(cls, frame):
+        """
+        Apply any pending theme changes when the given frame is shown or restored.
+        """
+        if frame is None or frame in cls.frames:
+            return
+        cls.frames.add(frame)
+        frame.Bind(wx.EVT_SHOW, cls.onFrameShown)
+        frame.Bind(wx.EVT_ICONIZE, cls.onFrameShown)
+
+    @classmethod
+    def onFrameShown(cls, evt):
+        evt.Skip()
+        # apply once the frame has finished showing/restoring
+        if cls.pending:
+            wx.CallAfter(cls.ApplyPending)
+
+    @classmethod
+    def onRibbonShown(cls, evt):
+        evt.Skip()
+        # apply once the ribbon has finished showing, if it missed a theme change
+        if evt.IsShown() and evt.GetEventObject() in cls.pending:
+            wx.CallAfter(cls.ApplyPending)
@@ -0,0 +1,217 @@
+import sys
+import time
+import logging
+import threading
+import traceback
+import contextlib
+
+
+__all__ = [
+    "RibbonWatchdog",
+]
+
+
+class RibbonWatchdog:
+    """
+    Times every callback dispatched by a FrameRibbon, to find out which ones block the UI
+    thread. Each command's latencies are kept as a histogram (with buckets doubling in width),
+    and any callback which runs for longer than `threshold` has its stack logged - captured
+    while it's still running, so the log shows where it's stuck rather than just that it was
+    slow.
+
+    Opt in by giving a ribbon a watchdog, e.g. `ribbon.SetWatchdog(RibbonWatchdog())`, and call
+    `GetReport` to list the slowest commands. One watchdog can be shared by several ribbons.
+
+    Parameters
+    ----------
+    threshold : int
+        Number of ms a callback can run for before its stack is logged
+    """
+    # number of histogram buckets: <1ms, then [1, 2), [2, 4)... up to 2^(n-2)ms and beyond
+    nBuckets = 16
+
+    def __init__(self, threshold=100):
+        self.threshold = threshold
+        # count, total time, max time and histogram of each command, keyed by command name
+        self.stats = {}
+        # callbacks currently running (nested if e.g. a menu factory runs within a click)
+        self._running = []
+        self._lock = threading.Lock()
+        # background thread which captures the stacks of slow callbacks
+        self._thread = None
+        self._stop = threading.Event()
+
+    def Start(self):
+        """
+        Start watching for slow callbacks in the background. Called automatically by
+        `FrameRibbon.SetWatchdog`.
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._watch, name="wx_ribbon-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    def Stop(self):
+        """
+        Stop watching for slow callbacks (timings are still recorded).
+        """
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def Reset(self):
+        """
+        Discard all recorded timings.
+        """
+        with self._lock:
+            self.stats.clear()
+
+    @contextlib.contextmanager
+    def Time(self, key):
+        """
+        Context manager which times the code within it as one run of the given command.
+
+        Parameters
+        ----------
+        key : str
+            Name of the command being run
+        """
+        entry = {
+            'key': key,
+            'start': time.perf_counter(),
+            'thread': threading.get_ident(),
+            # time spent in Exclude blocks, and when the current one started
+            'excluded': 0,
+            'paused': None,
+            # stack captured by the watch thread, if the callback ran long
+            'stack': None,
+        }
+        with self._lock:
+            self._running.append(entry)
+        try:
+            yield entry
+        finally:
+            with self._lock:
+                self._running.remove(entry)
+            elapsed = (time.perf_counter() - entry['start'] - entry['excluded']) * 1000
+            self.Record(key, elapsed)
+            # log slow callbacks
+            if elapsed > self.threshold:
+                msg = f"Ribbon command '{key}' blocked the UI thread for {elapsed:.0f}ms"
+                if entry['stack']:
+                    msg += f", stack after {self.threshold}ms:\n{entry['stack']}"
+                logging.warning(msg)
+
+    @contextlib.contextmanager
+    def Exclude(self):
+        """
+        Context manager within which time doesn't count towards the command currently being
+        timed, e.g. while a popup menu is open and waiting for the user.
+        """
+        # get innermost running command on this thread
+        entry = None
+        with self._lock:
+            for running in reversed(self._running):
+                if running['thread'] == threading.get_ident():
+                    entry = running
+                    break
+        # if not timing anything, nothing to exclude
+        if entry is None:
+            yield
+            return
+        entry['paused'] = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry['excluded'] += time.perf_counter() - entry['paused']
+            entry['paused'] = None
+
+    def Record(self, key, elapsed):
+        """
+        Record one run of a command.
+
+        Parameters
+        ----------
+        key : str
+            Name of the command
+        elapsed : float
+            Number of ms the command took
+        """
+        bucket = min(int(elapsed).bit_length(), self.nBuckets - 1)
+        with self._lock:
+            if key not in self.stats:
+                self.stats[key] = {
+                    'count': 0,
+                    'total': 0,
+                    'max': 0,
+                    'histogram': [0] * self.nBuckets,
+                }
+            stats = self.stats[key]
+            stats['count'] += 1
+            stats['total'] += elapsed
+            stats['max'] = max(stats['max'], elapsed)
+            stats['histogram'][bucket] += 1
+
+    def GetReport(self, n=10, sortBy="max"):
+        """
+        List the slowest commands.
+
+        Parameters
+        ----------
+        n : int or None
+            Number of commands to list, or None for all of them
+        sortBy : str
+            What to rank commands by, one of "max", "mean" or "total" (time)
+
+        Returns
+        -------
+        list[dict]
+            For each command (slowest first): its name ("key"), how many times it ran
+            ("count"), its total, mean and max time in ms, and a histogram of its times as
+            {upper bound in ms: count} (upper bound is None for the last bucket)
+        """
+        report = []
+        with self._lock:
+            for key, stats in self.stats.items():
+                # label each non-empty bucket by its upper bound
+                histogram = {}
+                for i, count in enumerate(stats['histogram']):
+                    if count:
+                        histogram[2 ** i if i < self.nBuckets - 1 else None] = count
+                report.append({
+                    'key': key,
+                    'count': stats['count'],
+                    'total': stats['total'],
+                    'mean': stats['total'] / stats['count'],
+                    'max': stats['max'],
+                    'histogram': histogram,
+                })
+        report.sort(key=lambda row: row[sortBy], reverse=True)
+
+        return report[:n]
+
+    def _watch(self):
+        """
+        Loop run by the background thread, capturing the stack of any callback which has run
+        for longer than the threshold.
+        """
+        interval = max(self.threshold / 4, 5) / 1000
+        while not self._stop.wait(interval):
+            now = time.perf_counter()
+            with self._lock:
+                running = list(self._running)
+            for entry in running:
+                # skip callbacks whose stack we have, or which are waiting on the user
+                if entry['stack'] is not None or entry['paused'] is not None:
+                    continue
+                if (now - entry['start'] - entry['excluded']) * 1000 < self.threshold:
+                    continue
+                # capture stack
+                frame = sys._current_frames().get(entry['thread'])
+                if frame is not None:
+                    entry['stack'] = "".join(traceback.format_stack(frame))